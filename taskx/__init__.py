@@ -8,14 +8,31 @@ __version__ = "0.2.1"
 __author__ = "Vipin"
 __all__ = ["__version__", "run_task", "load_config", "list_tasks"]
 
-from taskx.core.config import Config
-from taskx.core.runner import TaskRunner
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from taskx.core.config import Config
 
-def load_config(config_path: str = "pyproject.toml") -> Config:
+
+def __getattr__(name: str) -> Any:
+    """Import Config and TaskRunner on first use (keeps ``import taskx`` cheap)."""
+    if name == "Config":
+        from taskx.core.config import Config
+
+        return Config
+    if name == "TaskRunner":
+        from taskx.core.runner import TaskRunner
+
+        return TaskRunner
+    raise AttributeError(f"module 'taskx' has no attribute '{name}'")
+
+
+def load_config(config_path: str = "pyproject.toml") -> "Config":
     """Load taskx configuration from a file."""
     from pathlib import Path
 
+    from taskx.core.config import Config
+
     config = Config(Path(config_path))
     config.load()
     return config
@@ -29,6 +46,8 @@ def list_tasks(config_path: str = "pyproject.toml") -> list[str]:
 
 def run_task(task_name: str, config_path: str = "pyproject.toml") -> bool:
     """Run a specific task."""
+    from taskx.core.runner import TaskRunner
+
     config = load_config(config_path)
     runner = TaskRunner(config)
     return runner.run(task_name)
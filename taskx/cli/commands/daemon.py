@@ -0,0 +1,144 @@
+"""
+Daemon command implementation.
+
+Starts, stops and inspects the background process that serves ``taskx run``
+from a warm interpreter with the configuration already parsed.
+"""
+
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import click
+from rich.console import Console
+
+from taskx.execution import daemon as server
+from taskx.execution.supervisor import taskx_command
+
+# How long ``start`` waits for the daemon to answer
+_START_TIMEOUT = 10.0
+
+
+@click.group()
+def daemon() -> None:
+    """
+    Keep taskx warm in the background for faster runs.
+
+    While a daemon runs for the project, 'taskx run' is served by it: no
+    imports or config parsing per run, just a fork of the warm process.
+    The configuration is reloaded when pyproject.toml or .env change.
+    Set TASKX_NO_DAEMON=1 to bypass it.
+
+    Examples:
+
+        $ taskx daemon start
+        $ taskx run test      # served by the daemon
+        $ taskx daemon stop
+    """
+
+
+@daemon.command()
+@click.option("--foreground", "-f", is_flag=True, help="Serve in this terminal until Ctrl+C")
+@click.pass_context
+def start(ctx: click.Context, foreground: bool) -> None:
+    """Start the daemon for this project."""
+    console: Console = ctx.obj["console"]
+    config_path: Path = ctx.obj["config_path"]
+    _check_supported(ctx, console)
+    if not config_path.exists():
+        console.print(f"[red]✗ Configuration file not found: {config_path}[/red]")
+        ctx.exit(1)
+
+    status = _status(config_path)
+    if status is not None:
+        console.print(f"[yellow]Daemon already running (pid {status['pid']})[/yellow]")
+        return
+
+    if foreground:
+        console.print(f"[green]✓ Serving {config_path.resolve()}[/green] (Ctrl+C to stop)")
+        try:
+            server.DaemonServer(config_path, console).serve()
+        except server.DaemonError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            ctx.exit(1)
+        return
+
+    log_path = config_path.resolve().parent / ".taskx" / "daemon.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    command = taskx_command(config_path, "daemon", "start", "--foreground")
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(
+            command,
+            cwd=str(config_path.resolve().parent),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + _START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = _status(config_path)
+        if status is not None:
+            console.print(f"[green]✓ Daemon started (pid {status['pid']})[/green]")
+            return
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    console.print(f"[red]✗ Daemon did not start, see {log_path}[/red]")
+    ctx.exit(1)
+
+
+@daemon.command()
+@click.pass_context
+def stop(ctx: click.Context) -> None:
+    """Stop the daemon (runs in progress are finished first)."""
+    console: Console = ctx.obj["console"]
+    config_path: Path = ctx.obj["config_path"]
+    _check_supported(ctx, console)
+    try:
+        server.request(config_path, {"op": "stop"})
+    except server.DaemonError:
+        console.print("[yellow]No daemon running[/yellow]")
+        return
+    console.print("[green]✓ Daemon stopped[/green]")
+
+
+@daemon.command()
+@click.pass_context
+def status(ctx: click.Context) -> None:
+    """Show whether a daemon serves this project."""
+    console: Console = ctx.obj["console"]
+    config_path: Path = ctx.obj["config_path"]
+    _check_supported(ctx, console)
+    info = _status(config_path)
+    if info is None:
+        console.print("[yellow]No daemon running[/yellow]")
+        ctx.exit(1)
+
+    started = datetime.fromtimestamp(info["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+    console.print(f"[green]✓ Daemon running[/green] (pid {info['pid']}, taskx {info['taskx']})")
+    console.print(f"  Config:  {info['config']}")
+    console.print(f"  Since:   {started}")
+    console.print(f"  Runs:    {info['runs']} ({info['running']} running)")
+    console.print(f"  Reloads: {info['reloads']}")
+    if not info["config_ok"]:
+        console.print("[yellow]Warning: configuration has errors, runs will report them[/yellow]")
+
+
+def _status(config_path: Path) -> Optional[Dict[str, Any]]:
+    """Ask the daemon for its status; None when none answers."""
+    try:
+        info = server.request(config_path, {"op": "status"})
+    except server.DaemonError:
+        return None
+    return info if "pid" in info else None
+
+
+def _check_supported(ctx: click.Context, console: Console) -> None:
+    """Exit with an error on platforms without Unix sockets and fork."""
+    if not server.supported():
+        console.print("[red]✗ The daemon is not supported on this platform[/red]")
+        ctx.exit(1)
@@ -4,14 +4,17 @@ Graph command implementation.
 Visualizes task dependencies in ASCII or export formats.
 """
 
+import sqlite3
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 import click
 from rich.console import Console
 from rich.tree import Tree
 
 from taskx.core.config import Config
+from taskx.core.dependency import GraphIndex
+from taskx.core.history import TaskHistory
 from taskx.core.task import Task
 
 
@@ -28,8 +31,13 @@ from taskx.core.task import Task
     "-t",
     help="Show graph for specific task only (default: show all tasks)",
 )
+@click.option(
+    "--critical-path",
+    is_flag=True,
+    help="Show the longest dependency chain instead of the full graph",
+)
 @click.pass_context
-def graph(ctx: click.Context, format: str, task: str) -> None:
+def graph(ctx: click.Context, format: str, task: str, critical_path: bool) -> None:
     """
     Visualize task dependencies.
 
@@ -46,6 +54,9 @@ def graph(ctx: click.Context, format: str, task: str) -> None:
 
         # Export as Graphviz DOT
         $ taskx graph --format dot > tasks.dot
+
+        # Show the chain that bounds the run time of deploy
+        $ taskx graph --task deploy --critical-path
     """
     console: Console = ctx.obj["console"]
     config_path: Path = ctx.obj["config_path"]
@@ -62,13 +73,24 @@ def graph(ctx: click.Context, format: str, task: str) -> None:
         console.print("[yellow]No tasks defined[/yellow]")
         ctx.exit(0)
 
+    index = GraphIndex.from_tasks(config.tasks)
+
+    if critical_path:
+        history = TaskHistory(config_path.parent / ".taskx" / "history.db")
+        try:
+            durations = history.expected_durations(config.tasks)
+        except (sqlite3.Error, OSError):
+            durations = {}
+        _print_critical_path(console, config.tasks, index, task, durations)
+        return
+
     # Generate graph
     if format == "tree":
         _print_tree(console, config.tasks, task)
     elif format == "mermaid":
-        _print_mermaid(console, config.tasks, task)
+        _print_mermaid(console, config.tasks, index, task)
     elif format == "dot":
-        _print_dot(console, config.tasks, task)
+        _print_dot(console, config.tasks, index, task)
 
 
 def _print_tree(console: Console, tasks: Dict[str, Task], specific_task: str = None) -> None:
@@ -127,7 +149,9 @@ def _build_tree_node(node: Tree, task_name: str, tasks: Dict[str, Task], visited
             node.add(f"[red]{dep}[/red] [dim](not found)[/dim]")
 
 
-def _print_mermaid(console: Console, tasks: Dict[str, Task], specific_task: str = None) -> None:
+def _print_mermaid(
+    console: Console, tasks: Dict[str, Task], index: GraphIndex, specific_task: str = None
+) -> None:
     """Print dependency graph as Mermaid diagram."""
     lines = ["graph TD"]
 
@@ -138,7 +162,7 @@ def _print_mermaid(console: Console, tasks: Dict[str, Task], specific_task: str
             return
 
         # Get all dependencies recursively
-        relevant_tasks = _get_task_closure(specific_task, tasks)
+        relevant_tasks = index.closure(specific_task)
     else:
         relevant_tasks = set(tasks.keys())
 
@@ -167,7 +191,9 @@ def _print_mermaid(console: Console, tasks: Dict[str, Task], specific_task: str
     console.print(output)
 
 
-def _print_dot(console: Console, tasks: Dict[str, Task], specific_task: str = None) -> None:
+def _print_dot(
+    console: Console, tasks: Dict[str, Task], index: GraphIndex, specific_task: str = None
+) -> None:
     """Print dependency graph as Graphviz DOT format."""
     lines = ["digraph Tasks {"]
     lines.append("    rankdir=LR;")
@@ -179,7 +205,7 @@ def _print_dot(console: Console, tasks: Dict[str, Task], specific_task: str = No
             console.print(f"[red]✗ Task '{specific_task}' not found[/red]")
             return
 
-        relevant_tasks = _get_task_closure(specific_task, tasks)
+        relevant_tasks = index.closure(specific_task)
     else:
         relevant_tasks = set(tasks.keys())
 
@@ -205,23 +231,31 @@ def _print_dot(console: Console, tasks: Dict[str, Task], specific_task: str = No
     console.print(output)
 
 
-def _get_task_closure(task_name: str, tasks: Dict[str, Task]) -> Set[str]:
-    """Get all tasks in the dependency closure of a given task."""
-    closure = {task_name}
-    queue = [task_name]
-
-    while queue:
-        current = queue.pop(0)
-        task = tasks.get(current)
-        if not task:
-            continue
-
-        for dep in task.depends:
-            if dep not in closure and dep in tasks:
-                closure.add(dep)
-                queue.append(dep)
+def _print_critical_path(
+    console: Console,
+    tasks: Dict[str, Task],
+    index: GraphIndex,
+    specific_task: Optional[str] = None,
+    durations: Optional[Dict[str, float]] = None,
+) -> None:
+    """Print the longest dependency chain, weighted by median run durations."""
+    if specific_task and specific_task not in tasks:
+        console.print(f"[red]✗ Task '{specific_task}' not found[/red]")
+        return
 
-    return closure
+    durations = durations or {}
+    within = index.closure(specific_task) if specific_task else None
+    _, path = index.critical_path(durations, within=within)
+
+    known = [durations[name] for name in path if name in durations]
+    summary = f"{len(path)} tasks"
+    if known:
+        summary += f", ~{sum(known):.2f}s"
+    console.print(f"[bold]Critical path[/bold] ({summary})")
+    for position, name in enumerate(path):
+        desc = f" - {tasks[name].description}" if tasks[name].description else ""
+        timing = f" [dim]({durations[name]:.2f}s)[/dim]" if name in durations else ""
+        console.print(f"  {position + 1}. [cyan]{name}[/cyan]{timing}{desc}")
 
 
 def _sanitize_name(name: str) -> str:
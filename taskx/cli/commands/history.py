@@ -0,0 +1,115 @@
+"""
+History command implementation.
+
+Shows recorded task runs and per-task duration statistics.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from taskx.core.history import TaskHistory
+
+
+@click.command()
+@click.argument("task_name", required=False)
+@click.option("--limit", "-n", default=20, show_default=True, help="Number of runs to show")
+@click.pass_context
+def history(ctx: click.Context, task_name: Optional[str], limit: int) -> None:
+    """
+    Show task run history and duration statistics.
+
+    Examples:
+
+        # p50/p95/max duration of every task
+        $ taskx history
+
+        # Recent runs of a single task
+        $ taskx history test
+    """
+    console: Console = ctx.obj["console"]
+    config_path: Path = ctx.obj["config_path"]
+    store = TaskHistory(config_path.parent / ".taskx" / "history.db")
+
+    try:
+        if task_name:
+            _print_runs(console, store, task_name, limit)
+        else:
+            _print_stats(console, store)
+    except sqlite3.Error as e:
+        console.print(f"[red]✗ Cannot read history: {e}[/red]")
+        ctx.exit(1)
+
+
+def _print_stats(console: Console, store: TaskHistory) -> None:
+    """Print duration statistics of every recorded task."""
+    names = store.task_names()
+    if not names:
+        console.print("[yellow]No task runs recorded yet[/yellow]")
+        return
+
+    stats = store.stats_for(names)
+    # Tasks that never succeeded have no durations, but their failures count
+    failures = store.failures(name for name in names if name not in stats)
+    table = Table(title="Task durations", title_justify="left")
+    table.add_column("Task", style="cyan")
+    table.add_column("Runs", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Last", justify="right")
+
+    for name in names:
+        entry = stats.get(name)
+        if entry is None:
+            table.add_row(name, "0", str(failures.get(name, 0)), "-", "-", "-", "-")
+            continue
+        # Flag a last run slower than 95% of recent runs
+        last = f"{entry.last:.2f}s"
+        if entry.runs > 1 and entry.last >= entry.p95 and entry.last > entry.p50:
+            last = f"[yellow]{last}[/yellow]"
+        table.add_row(
+            name,
+            str(entry.runs),
+            str(entry.failures),
+            f"{entry.p50:.2f}s",
+            f"{entry.p95:.2f}s",
+            f"{entry.max:.2f}s",
+            last,
+        )
+
+    console.print(table)
+
+
+def _print_runs(console: Console, store: TaskHistory, task_name: str, limit: int) -> None:
+    """Print the most recent runs of one task."""
+    runs = store.runs(task_name, limit)
+    if not runs:
+        console.print(f"[yellow]No runs recorded for '{task_name}'[/yellow]")
+        return
+
+    table = Table(title=f"Recent runs of {task_name}", title_justify="left")
+    table.add_column("Started")
+    table.add_column("Duration", justify="right")
+    table.add_column("Exit", justify="right")
+    table.add_column("Fingerprint", style="dim")
+
+    for run in runs:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run.started_at))
+        exit_code = str(run.exit_code) if run.success else f"[red]{run.exit_code}[/red]"
+        table.add_row(started, f"{run.duration:.2f}s", exit_code, (run.fingerprint or "")[:12])
+
+    console.print(table)
+
+    stats = store.stats(task_name)
+    if stats:
+        console.print(
+            f"p50 {stats.p50:.2f}s · p95 {stats.p95:.2f}s · max {stats.max:.2f}s "
+            f"[dim](last {stats.runs} successful runs)[/dim]"
+        )
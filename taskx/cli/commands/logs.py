@@ -0,0 +1,108 @@
+"""
+Logs command implementation.
+
+Prints the complete output of commands run in parallel, matrix and sharded
+tasks, as written to .taskx/logs.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+import click
+from rich.console import Console
+
+from taskx.core.config import Config, ConfigError
+from taskx.execution.logs import LogStore
+
+# Block size when reading a log backwards for --tail
+_TAIL_BLOCK = 64 * 1024
+
+
+@click.command()
+@click.argument("task_name")
+@click.option("--tail", "-n", type=int, help="Only print the last N lines of each log")
+@click.option("--path", "show_path", is_flag=True, help="Print the log file paths instead")
+@click.pass_context
+def logs(ctx: click.Context, task_name: str, tail: Optional[int], show_path: bool) -> None:
+    """
+    Show the output of a task's last run.
+
+    Covers the commands of parallel, matrix and sharded tasks; a parallel
+    task shows the logs of each of its commands.
+
+    Examples:
+
+        # Complete output of every shard of 'test'
+        $ taskx logs test
+
+        # Last 100 lines of one matrix cell
+        $ taskx logs "test[python=3.11]" --tail 100
+    """
+    console: Console = ctx.obj["console"]
+    config_path: Path = ctx.obj["config_path"]
+    store = LogStore(config_path.parent / ".taskx" / "logs")
+
+    found: List[Tuple[str, Path]] = []
+    for name in _command_names(config_path, task_name):
+        found.extend(entry for entry in store.find(name) if entry not in found)
+    if not found:
+        console.print(f"[yellow]No logs recorded for '{task_name}'[/yellow]")
+        ctx.exit(1)
+
+    out = sys.stdout.buffer
+    for index, (label, path) in enumerate(found):
+        if show_path:
+            click.echo(str(path))
+            continue
+        if len(found) > 1:
+            click.echo(f"{os.linesep if index else ''}==> {label} <==")
+        sys.stdout.flush()
+        try:
+            with open(path, "rb") as log:
+                if tail is None:
+                    shutil.copyfileobj(log, out)
+                else:
+                    out.write(_tail(log, tail))
+        except OSError as e:
+            console.print(f"[red]✗ Cannot read {path}: {e}[/red]")
+            ctx.exit(1)
+        out.flush()
+
+
+def _command_names(config_path: Path, task_name: str) -> List[str]:
+    """The task itself plus, for a parallel task, the tasks it runs."""
+    names = [task_name]
+    if not config_path.exists():
+        return names
+    try:
+        config = Config(config_path)
+        config.load()
+    except ConfigError:
+        # Logs stay readable when the configuration is broken
+        return names
+    task_name = config.aliases.get(task_name, task_name)
+    if task_name not in names:
+        names.append(task_name)
+    task = config.tasks.get(task_name)
+    if task is not None and task.is_parallel:
+        names.extend(task.parallel)
+    return names
+
+
+def _tail(log: BinaryIO, lines: int) -> bytes:
+    """Read the last lines of a file without reading all of it."""
+    if lines <= 0:
+        return b""
+    end = log.seek(0, os.SEEK_END)
+    position = end
+    data = b""
+    # One more newline than lines: the file ends with one
+    while position > 0 and data.count(b"\n") <= lines:
+        step = min(_TAIL_BLOCK, position)
+        position -= step
+        log.seek(position)
+        data = log.read(step) + data
+    return b"".join(data.splitlines(keepends=True)[-lines:])
@@ -4,19 +4,29 @@ Watch command implementation.
 Provides file watching and auto-restart functionality for tasks.
 """
 
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 import click
 from rich.console import Console
 
 from taskx.core.config import Config
+from taskx.core.dependency import CircularDependencyError
 from taskx.core.runner import TaskRunner
-from taskx.execution.watcher import watch_task_sync
+from taskx.execution.daemon import DISABLE_VAR
+from taskx.execution.supervisor import DEFAULT_GRACE_PERIOD, ProcessSupervisor, taskx_command
+from taskx.execution.watcher import WatchIndex, watch_affected_sync, watch_task_sync
 
 
 @click.command()
-@click.argument("task_name")
+@click.argument("task_name", required=False)
+@click.option(
+    "--all",
+    "watch_all",
+    is_flag=True,
+    help="Watch every task with watch patterns, re-running the tasks a change affects",
+)
 @click.option("--env", "-e", multiple=True, help="Environment variable overrides (KEY=VALUE)")
 @click.option(
     "--pattern",
@@ -24,12 +34,21 @@ from taskx.execution.watcher import watch_task_sync
     multiple=True,
     help="Additional file patterns to watch (overrides task patterns)",
 )
+@click.option(
+    "--grace",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_GRACE_PERIOD,
+    show_default=True,
+    help="Seconds a running task gets to stop on a change before it is killed",
+)
 @click.pass_context
 def watch(
     ctx: click.Context,
-    task_name: str,
+    task_name: Optional[str],
+    watch_all: bool,
     env: tuple,
     pattern: tuple,
+    grace: float,
 ) -> None:
     """
     Watch files and auto-restart task on changes.
@@ -45,12 +64,19 @@ def watch(
         # Pass environment variables
         $ taskx watch dev --env PORT=8000
 
+        # One watcher for every task with watch patterns
+        $ taskx watch --all
+
     The watch command will:
-    1. Run the task once initially
-    2. Watch for file changes
-    3. Re-run the task when changes are detected
+    1. Start the task (with its dependencies) as a separate process group
+    2. Watch for file changes, also while the task runs
+    3. On a change, stop the task (Ctrl+C, then a kill after --grace
+       seconds) and start it again; servers are restarted, builds re-run
     4. Apply debouncing to avoid excessive re-runs
 
+    With --all, each change re-runs only the tasks whose patterns match it,
+    plus the watched tasks (and their dependencies) that depend on those.
+
     Press Ctrl+C to stop watching.
     """
     console: Console = ctx.obj["console"]
@@ -64,6 +90,16 @@ def watch(
         console.print(f"[red]✗ Failed to load configuration: {e}[/red]")
         ctx.exit(1)
 
+    if watch_all:
+        if task_name or pattern:
+            console.print("[red]✗ --all can't be combined with a task name or --pattern[/red]")
+            ctx.exit(1)
+        _watch_all(ctx, config, env, console)
+        return
+    if not task_name:
+        console.print("[red]✗ Missing task name (or --all)[/red]")
+        ctx.exit(1)
+
     # Check if task exists
     if task_name not in config.tasks:
         console.print(f"[red]✗ Task '{task_name}' not found[/red]")
@@ -72,13 +108,6 @@ def watch(
 
     task = config.tasks[task_name]
 
-    # Parse environment overrides
-    env_overrides: Dict[str, str] = {}
-    for e in env:
-        if "=" in e:
-            key, value = e.split("=", 1)
-            env_overrides[key] = value
-
     # Determine watch patterns
     watch_patterns = list(pattern) if pattern else task.watch
 
@@ -88,11 +117,15 @@ def watch(
         console.print(f'[dim]  {task_name} = {{ cmd = "...", watch = ["*.py", "*.toml"] }}[/dim]')
         ctx.exit(1)
 
-    # Create execution callback
-    def execute_task() -> bool:
-        """Execute the task with the runner."""
-        runner = TaskRunner(config, console)
-        return runner.run(task_name, env_overrides)
+    # Each run is a `taskx run` of its own, so the whole run can be stopped
+    argv = taskx_command(config_path, "run", task_name)
+    argv += [arg for e in env for arg in ("--env", e)]
+    supervisor = ProcessSupervisor(
+        argv,
+        # Started here, not by a daemon, so it stays in the supervised group
+        env={**os.environ, DISABLE_VAR: "1"},
+        grace_period=grace,
+    )
 
     # Start watching
     try:
@@ -102,13 +135,57 @@ def watch(
 
         watch_task_sync(
             task=task,
-            execute_callback=execute_task,
             patterns=watch_patterns,
             cwd=task.cwd,
             console=console,
+            supervisor=supervisor,
         )
     except KeyboardInterrupt:
         console.print("\n[yellow]⊘ Watch mode stopped[/yellow]")
     except Exception as e:
         console.print(f"\n[red]✗ Watch failed: {e}[/red]")
         ctx.exit(1)
+
+
+def _watch_all(ctx: click.Context, config: Config, env: Tuple[str, ...], console: Console) -> None:
+    """Watch every task with watch patterns in one watcher."""
+    index = WatchIndex.from_tasks(config.tasks.values(), Path.cwd())
+    if not index.tasks:
+        console.print("[red]✗ No task has watch patterns defined[/red]")
+        console.print("[yellow]Hint: Add watch patterns to your task definitions:[/yellow]")
+        console.print(
+            '[dim]  test = { cmd = "pytest", watch = ["src/**/*.py", "tests/**/*.py"] }[/dim]'
+        )
+        ctx.exit(1)
+
+    # Parse environment overrides
+    env_overrides: Dict[str, str] = {}
+    for e in env:
+        if "=" in e:
+            key, value = e.split("=", 1)
+            env_overrides[key] = value
+
+    runner = TaskRunner(config, console)
+    try:
+        graph = runner.dependency_resolver.index
+        # What the initial run runs; re-runs never go beyond it
+        scope = set(runner.dependency_resolver.resolve_many(index.tasks))
+    except (CircularDependencyError, ValueError) as e:
+        console.print(f"[red]✗ Dependency resolution failed: {e}[/red]")
+        ctx.exit(1)
+
+    def execute(task_names: List[str], initial: bool) -> bool:
+        """Run the watched tasks, or the ones a change affected and their dependents."""
+        if initial:
+            return runner.run_tasks(task_names, env_overrides)
+        selection = [name for name in graph.with_dependents(task_names) if name in scope]
+        console.print(f"[yellow]▶ Re-running affected tasks: {', '.join(selection)}[/yellow]")
+        return runner.run_tasks(selection, env_overrides, with_dependencies=False)
+
+    try:
+        watch_affected_sync(index, execute, console=console)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⊘ Watch mode stopped[/yellow]")
+    except Exception as e:
+        console.print(f"\n[red]✗ Watch failed: {e}[/red]")
+        ctx.exit(1)
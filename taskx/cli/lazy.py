@@ -0,0 +1,88 @@
+"""
+Lazy command loading for the taskx CLI.
+
+Subcommands living in their own modules are registered by import path and
+only imported when they are invoked (or listed in help), so ``taskx --version``
+and shell completion don't pay for Rich, the task runner or watchfiles.
+"""
+
+import importlib
+from typing import Any, Dict, List, Optional
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    Click group whose subcommands are imported on first use.
+
+    Example:
+        @click.group(cls=LazyGroup, lazy_commands={"watch": "taskx.cli.commands.watch:watch"})
+        def cli(): ...
+    """
+
+    def __init__(self, *args: Any, lazy_commands: Optional[Dict[str, str]] = None, **kwargs: Any):
+        """
+        Initialize group.
+
+        Args:
+            *args: Passed to click.Group
+            lazy_commands: Command name -> "module:attribute" of the command object
+            **kwargs: Passed to click.Group
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: Dict[str, str] = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """List eagerly and lazily registered command names."""
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return a command, importing it if it was registered lazily."""
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_commands:
+            command = self._load(cmd_name)
+        return command
+
+    def _load(self, cmd_name: str) -> click.Command:
+        """
+        Import a lazily registered command and cache it on the group.
+
+        Raises:
+            TypeError: If the import path doesn't point at a click command
+        """
+        module_name, attribute = self.lazy_commands[cmd_name].split(":", 1)
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{self.lazy_commands[cmd_name]} is not a click command")
+        self.add_command(command, cmd_name)
+        return command
+
+
+class CliState(Dict[str, Any]):
+    """
+    Shared ``ctx.obj`` of the CLI.
+
+    The Rich console and the console formatter are created on first access;
+    most invocations from shell completion never print through them.
+    """
+
+    def __missing__(self, key: str) -> Any:
+        if key == "console":
+            from rich.console import Console
+
+            self[key] = Console()
+        elif key == "formatter":
+            from taskx.formatters.console import ConsoleFormatter
+
+            self[key] = ConsoleFormatter(self["console"])
+        else:
+            raise KeyError(key)
+        return self[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Like dict.get, but creates the lazy entries."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
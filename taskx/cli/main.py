@@ -13,21 +13,24 @@ from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
 
 from taskx import __version__
-from taskx.cli.commands.completion import completion
-from taskx.cli.commands.graph import graph
-from taskx.cli.commands.watch import watch
-from taskx.core.config import Config, ConfigError
-from taskx.core.prompts import PromptConfig, PromptManager
-from taskx.core.runner import TaskRunner
-from taskx.formatters.console import ConsoleFormatter
-from taskx.templates import get_template
-from taskx.templates import list_templates as get_template_list
-
-
-@click.group(invoke_without_command=True)
+from taskx.cli.lazy import CliState, LazyGroup
+from taskx.execution.events import EVENT_FORMATS
+
+# Commands defined in their own modules, imported only when invoked. Keep the
+# imports in this module cheap too: shell completion runs the CLI on every <TAB>.
+LAZY_COMMANDS = {
+    "watch": "taskx.cli.commands.watch:watch",
+    "graph": "taskx.cli.commands.graph:graph",
+    "history": "taskx.cli.commands.history:history",
+    "logs": "taskx.cli.commands.logs:logs",
+    "daemon": "taskx.cli.commands.daemon:daemon",
+    "completion": "taskx.cli.commands.completion:completion",
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS, invoke_without_command=True)
 @click.option(
     "--config",
     "-c",
@@ -43,11 +46,10 @@ def cli(ctx: click.Context, config: str, version: bool) -> None:
 
     npm scripts for Python. Simple task automation that just works.
     """
-    # Store config path in context
+    # Store config path in context (console and formatter are created on first use)
     ctx.ensure_object(dict)
+    ctx.obj = CliState(ctx.obj)
     ctx.obj["config_path"] = Path(config)
-    ctx.obj["console"] = Console()
-    ctx.obj["formatter"] = ConsoleFormatter(ctx.obj["console"])
 
     # Show version if requested
     if version:
@@ -56,6 +58,8 @@ def cli(ctx: click.Context, config: str, version: bool) -> None:
 
     # If no subcommand, show available tasks
     if ctx.invoked_subcommand is None:
+        from taskx.core.config import Config, ConfigError
+
         try:
             cfg = Config(ctx.obj["config_path"])
             cfg.load()
@@ -72,6 +76,8 @@ def cli(ctx: click.Context, config: str, version: bool) -> None:
 @click.pass_context
 def list(ctx: click.Context, names_only: bool, include_aliases: bool) -> None:
     """List all available tasks."""
+    from taskx.core.config import Config, ConfigError
+
     try:
         cfg = Config(ctx.obj["config_path"])
         cfg.load()
@@ -97,13 +103,60 @@ def list(ctx: click.Context, names_only: bool, include_aliases: bool) -> None:
 @cli.command(context_settings=dict(ignore_unknown_options=True, allow_extra_args=True))
 @click.argument("task_name")
 @click.option("--env", "-e", multiple=True, help="Set environment variable (KEY=VALUE)")
+@click.option("--no-cache", is_flag=True, help="Run tasks even if their inputs are unchanged")
+@click.option(
+    "--events",
+    type=click.Choice(EVENT_FORMATS),
+    help="Emit machine-readable run events (to stdout, all other output moves to stderr)",
+)
+@click.option(
+    "--events-file",
+    type=click.Path(dir_okay=False),
+    help="Write run events to this file instead of stdout (implies --events ndjson)",
+)
 @click.pass_context
-def run(ctx: click.Context, task_name: str, env: tuple) -> None:
+def run(
+    ctx: click.Context,
+    task_name: str,
+    env: tuple,
+    no_cache: bool = False,
+    events: Optional[str] = None,
+    events_file: Optional[str] = None,
+) -> None:
     """Run a specific task."""
+    from taskx.execution import daemon
+
+    # Hand the run to a warm daemon when one serves this project
+    if not ctx.obj.get(daemon.DAEMON_CHILD):
+        argv = ["--config", str(ctx.obj["config_path"]), "run", task_name]
+        argv += [arg for e in env for arg in ("--env", e)]
+        argv += ["--no-cache"] if no_cache else []
+        argv += ["--events", events] if events else []
+        argv += ["--events-file", events_file] if events_file else []
+        code = daemon.forward_run(ctx.obj["config_path"], argv)
+        if code is not None:
+            ctx.exit(code)
+
+    from rich.console import Console
+
+    from taskx.core.config import Config, ConfigError
+    from taskx.core.runner import TaskRunner
+    from taskx.execution.events import open_event_sink
+    from taskx.formatters.console import ConsoleFormatter
+
+    # Events on stdout need everything else out of the way, commands included
+    if events_file and not events:
+        events = "ndjson"
+    events_on_stdout = events is not None and not events_file
+    console = Console(stderr=True) if events_on_stdout else ctx.obj["console"]
+    formatter = ConsoleFormatter(console) if events_on_stdout else ctx.obj["formatter"]
+
     try:
-        # Load configuration
-        cfg = Config(ctx.obj["config_path"])
-        cfg.load()
+        # Load configuration (the daemon passes the one it keeps parsed)
+        cfg = ctx.obj.get(daemon.PRELOADED_CONFIG)
+        if cfg is None:
+            cfg = Config(ctx.obj["config_path"])
+            cfg.load()
 
         # Resolve alias to actual task name
         original_name = task_name
@@ -111,15 +164,23 @@ def run(ctx: click.Context, task_name: str, env: tuple) -> None:
 
         # Check if task exists
         if actual_task_name not in cfg.tasks:
-            ctx.obj["formatter"].print_error(f"Task '{task_name}' not found")
-            click.echo(f"\nAvailable tasks: {', '.join(sorted(cfg.tasks.keys()))}")
+            formatter.print_error(f"Task '{task_name}' not found")
+            click.echo(
+                f"\nAvailable tasks: {', '.join(sorted(cfg.tasks.keys()))}", err=events_on_stdout
+            )
             if cfg.aliases:
-                click.echo(f"Available aliases: {', '.join(sorted(cfg.aliases.keys()))}")
+                click.echo(
+                    f"Available aliases: {', '.join(sorted(cfg.aliases.keys()))}",
+                    err=events_on_stdout,
+                )
             ctx.exit(1)
 
         # Show alias resolution if used
         if actual_task_name != original_name:
-            click.echo(f"→ Alias '{original_name}' resolves to task '{actual_task_name}'")
+            click.echo(
+                f"→ Alias '{original_name}' resolves to task '{actual_task_name}'",
+                err=events_on_stdout,
+            )
 
         # Parse environment overrides
         env_overrides = {}
@@ -128,21 +189,32 @@ def run(ctx: click.Context, task_name: str, env: tuple) -> None:
                 key, value = e.split("=", 1)
                 env_overrides[key] = value
 
+        sink = open_event_sink(events, events_file)
+
         # Run task
-        runner = TaskRunner(cfg, ctx.obj["console"])
-        success = runner.run(actual_task_name, env_overrides)
+        try:
+            runner = TaskRunner(
+                cfg,
+                console,
+                use_cache=not no_cache,
+                events=sink,
+                stdout=sys.stderr if events_on_stdout else None,
+            )
+            success = runner.run(actual_task_name, env_overrides)
+        finally:
+            sink.close()
 
         if not success:
             ctx.exit(1)
 
     except (FileNotFoundError, ConfigError) as e:
-        ctx.obj["formatter"].print_error(str(e))
+        formatter.print_error(str(e))
         ctx.exit(1)
     except KeyboardInterrupt:
-        ctx.obj["formatter"].print_warning("\nTask interrupted by user")
+        formatter.print_warning("\nTask interrupted by user")
         ctx.exit(130)  # Standard exit code for SIGINT
     except Exception as e:
-        ctx.obj["formatter"].print_error(f"Unexpected error: {e}")
+        formatter.print_error(f"Unexpected error: {e}")
         ctx.exit(1)
 
 
@@ -166,6 +238,10 @@ def init(
     list_templates: bool,
 ) -> None:
     """Initialize taskx configuration in current directory."""
+    from taskx.core.prompts import PromptConfig, PromptManager
+    from taskx.templates import get_template
+    from taskx.templates import list_templates as get_template_list
+
     # Show available templates if requested
     if list_templates:
         templates = get_template_list()
@@ -285,12 +361,6 @@ check = { depends = ["lint", "test"], cmd = "echo 'All checks passed!'", descrip
         click.echo("  3. Run 'taskx <task-name>' to execute a task")
 
 
-# Register additional commands
-cli.add_command(watch)
-cli.add_command(graph)
-cli.add_command(completion)
-
-
 # Register task names as dynamic commands
 @cli.command(name="__dynamic__", hidden=True, add_help_option=False)
 @click.argument("task_name", required=False)
@@ -309,6 +379,8 @@ def main() -> int:
     except SystemExit as e:
         return e.code if isinstance(e.code, int) else 1
     except Exception as e:
+        from rich.console import Console
+
         console = Console()
         console.print(f"[red]Fatal error: {e}[/red]")
         return 1
@@ -49,7 +49,7 @@ class CompletionGenerator(ABC):
         Returns:
             List of command names
         """
-        return ["list", "run", "watch", "graph", "init", "completion"]
+        return ["list", "run", "watch", "graph", "history", "logs", "daemon", "init", "completion"]
 
     def get_graph_formats(self) -> List[str]:
         """
@@ -45,7 +45,7 @@ _taskx_completion() {{
 
     # Handle completion based on previous word
     case "$prev" in
-        run|watch)
+        run|watch|history|logs)
             # Complete with task names
             local tasks="$(taskx list --names-only 2>/dev/null || echo "")"
             COMPREPLY=( $(compgen -W "$tasks" -- "$cur") )
@@ -53,7 +53,7 @@ _taskx_completion() {{
             ;;
         graph)
             # Complete with graph options
-            local options="--format --task --help"
+            local options="--format --task --critical-path --help"
             COMPREPLY=( $(compgen -W "$options" -- "$cur") )
             return
             ;;
@@ -69,6 +69,11 @@ _taskx_completion() {{
             COMPREPLY=( $(compgen -W "$tasks" -- "$cur") )
             return
             ;;
+        daemon)
+            # Complete with daemon actions
+            COMPREPLY=( $(compgen -W "start stop status --help" -- "$cur") )
+            return
+            ;;
         completion)
             # Complete with shell names
             local shells="bash zsh fish powershell --install --help"
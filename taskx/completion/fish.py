@@ -35,6 +35,9 @@ complete -c taskx -n "__fish_use_subcommand" -a "list" -d "List all available ta
 complete -c taskx -n "__fish_use_subcommand" -a "run" -d "Run a specific task"
 complete -c taskx -n "__fish_use_subcommand" -a "watch" -d "Watch files and auto-restart task"
 complete -c taskx -n "__fish_use_subcommand" -a "graph" -d "Visualize task dependencies"
+complete -c taskx -n "__fish_use_subcommand" -a "history" -d "Show task run history and durations"
+complete -c taskx -n "__fish_use_subcommand" -a "logs" -d "Show the output of a task's last run"
+complete -c taskx -n "__fish_use_subcommand" -a "daemon" -d "Keep taskx warm in the background"
 complete -c taskx -n "__fish_use_subcommand" -a "init" -d "Initialize taskx configuration"
 complete -c taskx -n "__fish_use_subcommand" -a "completion" -d "Generate shell completion script"
 
@@ -54,9 +57,22 @@ complete -c taskx -n "__fish_seen_subcommand_from run" -s e -l env -d "Set envir
 # 'watch' command - complete with task names
 complete -c taskx -n "__fish_seen_subcommand_from watch" -a "(taskx list --names-only 2>/dev/null)"
 
+# 'history' command - complete with task names
+complete -c taskx -n "__fish_seen_subcommand_from history" -a "(taskx list --names-only 2>/dev/null)"
+
+# 'logs' command - complete with task names
+complete -c taskx -n "__fish_seen_subcommand_from logs" -a "(taskx list --names-only 2>/dev/null)"
+complete -c taskx -n "__fish_seen_subcommand_from logs" -s n -l tail -d "Only print the last N lines"
+complete -c taskx -n "__fish_seen_subcommand_from logs" -l path -d "Print the log file paths"
+
+# 'daemon' command - complete with actions
+complete -c taskx -n "__fish_seen_subcommand_from daemon" -a "start stop status"
+complete -c taskx -n "__fish_seen_subcommand_from daemon" -s f -l foreground -d "Serve in this terminal"
+
 # 'graph' command options
 complete -c taskx -n "__fish_seen_subcommand_from graph" -l format -d "Output format" -a "tree mermaid dot"
 complete -c taskx -n "__fish_seen_subcommand_from graph" -l task -d "Show dependencies for specific task" -a "(taskx list --names-only 2>/dev/null)"
+complete -c taskx -n "__fish_seen_subcommand_from graph" -l critical-path -d "Show the longest dependency chain"
 
 # 'init' command options
 complete -c taskx -n "__fish_seen_subcommand_from init" -s n -l name -d "Project name"
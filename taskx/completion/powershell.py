@@ -31,7 +31,7 @@ class PowerShellCompletion(CompletionGenerator):
 Register-ArgumentCompleter -Native -CommandName taskx -ScriptBlock {
     param($wordToComplete, $commandAst, $cursorPosition)
 
-    $commands = @('list', 'run', 'watch', 'graph', 'init', 'completion', '--version', '--help')
+    $commands = @('list', 'run', 'watch', 'graph', 'history', 'logs', 'daemon', 'init', 'completion', '--version', '--help')
     $graphFormats = @('tree', 'mermaid', 'dot')
     $shells = @('bash', 'zsh', 'fish', 'powershell')
 
@@ -77,10 +77,35 @@ Register-ArgumentCompleter -Native -CommandName taskx -ScriptBlock {
                 }
             }
         }
+        'logs' {
+            # Complete with task names, then options
+            if ($wordToComplete -match '^--') {
+                @('--tail', '--path', '--help') | Where-Object { $_ -like "$wordToComplete*" } | ForEach-Object {
+                    [System.Management.Automation.CompletionResult]::new($_, $_, 'ParameterValue', $_)
+                }
+            } elseif ($commandCount -eq 2) {
+                try {
+                    $tasks = & taskx list --names-only 2>$null
+                    $tasks | Where-Object { $_ -like "$wordToComplete*" } | ForEach-Object {
+                        [System.Management.Automation.CompletionResult]::new($_, $_, 'ParameterValue', $_)
+                    }
+                } catch {
+                    # Ignore errors
+                }
+            }
+        }
+        'daemon' {
+            # Complete with daemon actions
+            if ($commandCount -eq 2) {
+                @('start', 'stop', 'status') | Where-Object { $_ -like "$wordToComplete*" } | ForEach-Object {
+                    [System.Management.Automation.CompletionResult]::new($_, $_, 'ParameterValue', $_)
+                }
+            }
+        }
         'graph' {
             # Handle graph options
             if ($wordToComplete -match '^--') {
-                @('--format', '--task', '--help') | Where-Object { $_ -like "$wordToComplete*" } | ForEach-Object {
+                @('--format', '--task', '--critical-path', '--help') | Where-Object { $_ -like "$wordToComplete*" } | ForEach-Object {
                     [System.Management.Automation.CompletionResult]::new($_, $_, 'ParameterValue', $_)
                 }
             } elseif ($elements[-2].ToString() -eq '--format') {
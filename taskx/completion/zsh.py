@@ -45,6 +45,9 @@ _taskx() {
                 'run:Run a specific task'
                 'watch:Watch files and auto-restart task on changes'
                 'graph:Visualize task dependencies'
+                'history:Show task run history and durations'
+                'logs:Show output of the last run of a task'
+                'daemon:Keep taskx warm in the background'
                 'init:Initialize taskx configuration'
                 'completion:Generate shell completion script'
                 '--version:Show version and exit'
@@ -69,10 +72,21 @@ _taskx() {
                         '--env[Set environment variable]:env:' \\
                         '--help[Show help message]'
                     ;;
+                logs)
+                    # Complete with task names
+                    local -a tasks
+                    tasks=(${(f)"$(taskx list --names-only 2>/dev/null || echo "")"})
+                    _describe 'task' tasks
+                    _arguments \\
+                        '--tail[Only print the last N lines]:lines:' \\
+                        '--path[Print the log file paths]' \\
+                        '--help[Show help message]'
+                    ;;
                 graph)
                     _arguments \\
                         '--format[Output format]:format:(tree mermaid dot)' \\
                         '--task[Show dependencies for specific task]:task:' \\
+                        '--critical-path[Show the longest dependency chain]' \\
                         '--help[Show help message]'
                     ;;
                 init)
@@ -82,6 +96,12 @@ _taskx() {
                         '--no-examples[Do not add example tasks]' \\
                         '--help[Show help message]'
                     ;;
+                daemon)
+                    _arguments \\
+                        '1:action:(start stop status)' \\
+                        '--foreground[Serve in this terminal]' \\
+                        '--help[Show help message]'
+                    ;;
                 completion)
                     _arguments \\
                         '1:shell:(bash zsh fish powershell)' \\
@@ -0,0 +1,243 @@
+"""
+Incremental task cache.
+
+Skips tasks whose inputs have not changed since their last successful run
+and restores the outputs recorded for that run.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from taskx.core.task import Task
+
+# Bump to invalidate every existing cache entry when the key format changes
+CACHE_VERSION = "1"
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """
+    Recorded result of a successful task run.
+
+    Attributes:
+        task_name: Name of the cached task
+        fingerprint: Cache key the entry was recorded under
+        outputs: Mapping of output path (relative to the task directory) to content digest
+    """
+
+    task_name: str
+    fingerprint: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+
+
+class TaskCache:
+    """
+    Content-addressed cache of task runs.
+
+    Layout (under ``cache_dir``)::
+
+        tasks/<task>/<fingerprint>.json   recorded entry
+        objects/<ab>/<digest>             stored output file contents
+
+    The fingerprint covers the expanded command, the environment variables the
+    task can observe through its config, and the contents of every input file.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize task cache.
+
+        Args:
+            cache_dir: Directory holding cache entries and stored outputs
+        """
+        self.cache_dir = cache_dir
+
+    def fingerprint(
+        self,
+        task: Task,
+        command: str,
+        env: Mapping[str, str],
+        env_keys: Iterable[str],
+        base_dir: Path,
+    ) -> str:
+        """
+        Compute the cache key for a task run.
+
+        Args:
+            task: Task being run
+            command: Fully expanded command text
+            env: Environment the task runs with
+            env_keys: Names of environment variables relevant to the task
+            base_dir: Directory input globs are resolved against
+
+        Returns:
+            Hex digest identifying this exact run
+        """
+        digest = hashlib.sha256()
+        digest.update(f"taskx-cache-{CACHE_VERSION}\0{task.name}\0{command}\0".encode())
+
+        for key in sorted(set(env_keys)):
+            digest.update(f"env:{key}={env.get(key, '')}\0".encode())
+
+        for pattern in task.outputs:
+            digest.update(f"out:{pattern}\0".encode())
+
+        for rel_path in self._expand(task.inputs, base_dir):
+            digest.update(f"in:{rel_path}\0".encode())
+            digest.update(self._hash_file(base_dir / rel_path).encode())
+
+        return digest.hexdigest()
+
+    def lookup(self, task_name: str, fingerprint: str) -> Optional[CacheEntry]:
+        """
+        Find the entry recorded for a fingerprint.
+
+        Args:
+            task_name: Task name
+            fingerprint: Cache key
+
+        Returns:
+            Cache entry if the task already ran successfully with this key
+        """
+        entry_path = self._entry_path(task_name, fingerprint)
+        try:
+            data = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        return CacheEntry(
+            task_name=task_name,
+            fingerprint=fingerprint,
+            outputs=dict(data.get("outputs", {})),
+        )
+
+    def restore(self, entry: CacheEntry, base_dir: Path) -> bool:
+        """
+        Bring the task's outputs back to their recorded state.
+
+        Only files that are missing or differ from the recorded contents are
+        copied back from the object store.
+
+        Args:
+            entry: Cache entry to restore
+            base_dir: Directory output paths are relative to
+
+        Returns:
+            True if every recorded output is in place, False if any stored
+            object is missing (the task must then run again)
+        """
+        for rel_path, digest in entry.outputs.items():
+            target = base_dir / rel_path
+            if target.is_file() and self._hash_file(target) == digest:
+                continue
+
+            source = self._object_path(digest)
+            if not source.is_file():
+                return False
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+
+        return True
+
+    def record(self, task: Task, fingerprint: str, base_dir: Path) -> CacheEntry:
+        """
+        Record a successful run and store its outputs.
+
+        Args:
+            task: Task that ran
+            fingerprint: Cache key computed before the run
+            base_dir: Directory output globs are resolved against
+
+        Returns:
+            The recorded cache entry
+        """
+        outputs: Dict[str, str] = {}
+        for rel_path in self._expand(task.outputs, base_dir):
+            source = base_dir / rel_path
+            digest = self._hash_file(source)
+            stored = self._object_path(digest)
+            if not stored.is_file():
+                self._atomic_copy(source, stored)
+            outputs[rel_path] = digest
+
+        entry = CacheEntry(task_name=task.name, fingerprint=fingerprint, outputs=outputs)
+        self._atomic_write(
+            self._entry_path(task.name, fingerprint),
+            json.dumps({"task": task.name, "outputs": outputs}, sort_keys=True),
+        )
+        return entry
+
+    def clear(self) -> None:
+        """Remove every cache entry and stored output."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _entry_path(self, task_name: str, fingerprint: str) -> Path:
+        """Path of the entry file for a task fingerprint."""
+        return self.cache_dir / "tasks" / task_name / f"{fingerprint}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        """Path of a stored output object."""
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    @staticmethod
+    def _expand(patterns: List[str], base_dir: Path) -> List[str]:
+        """
+        Expand glob patterns to a sorted list of relative file paths.
+
+        Args:
+            patterns: Glob patterns (``**`` supported)
+            base_dir: Directory patterns are resolved against
+
+        Returns:
+            Sorted POSIX-style paths relative to ``base_dir``
+        """
+        paths = set()
+        for pattern in patterns:
+            for path in base_dir.glob(pattern):
+                if path.is_file():
+                    paths.add(path.relative_to(base_dir).as_posix())
+        return sorted(paths)
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """Return the SHA-256 digest of a file's contents."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _atomic_copy(source: Path, target: Path) -> None:
+        """Copy a file so readers never observe a partial object."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copy2(source, tmp_name)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _atomic_write(target: Path, content: str) -> None:
+        """Write a text file atomically."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
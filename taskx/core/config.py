@@ -2,7 +2,12 @@
 Configuration loading and parsing.
 """
 
+import contextlib
+import hashlib
+import os
+import pickle
 import sys
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -12,8 +17,12 @@ else:
     import tomli as tomllib
 
 from taskx.core.task import Task
+from taskx.utils.platform import PlatformUtils
 from taskx.utils.validation import ConfigValidator
 
+# Bump whenever the cached Config layout changes (RESERVED_NAMES is in the key)
+CONFIG_CACHE_FORMAT = 8
+
 
 class ConfigError(Exception):
     """Raised when configuration is invalid."""
@@ -45,7 +54,17 @@ class Config:
     """
 
     # Reserved command names that cannot be used as aliases
-    RESERVED_NAMES = {"list", "run", "watch", "graph", "init", "completion"}
+    RESERVED_NAMES = {
+        "list",
+        "run",
+        "watch",
+        "graph",
+        "history",
+        "logs",
+        "daemon",
+        "init",
+        "completion",
+    }
 
     def __init__(self, config_path: Optional[Path] = None):
         """
@@ -61,10 +80,18 @@ class Config:
         self.settings: Dict[str, Any] = {}
         self._raw_data: Dict[str, Any] = {}
 
-    def load(self) -> None:
+    def load(self, use_cache: bool = True) -> None:
         """
         Load configuration from file.
 
+        A validated configuration is cached in the per-user cache directory
+        and reused while the file's mtime, size and content hash are unchanged,
+        so repeated invocations (e.g. shell completion) skip TOML parsing and
+        validation.
+
+        Args:
+            use_cache: Reuse (and refresh) the parsed-config cache
+
         Raises:
             FileNotFoundError: If configuration file doesn't exist
             ConfigError: If configuration is invalid
@@ -76,11 +103,35 @@ class Config:
             )
 
         try:
-            with open(self.config_path, "rb") as f:
-                data = tomllib.load(f)
+            stat = self.config_path.stat()
+            raw = self.config_path.read_bytes()
+        except OSError as e:
+            raise ConfigError(f"Failed to read {self.config_path}: {e}") from e
+
+        cache_key = self._cache_key(stat, raw) if use_cache else None
+        if cache_key and self._load_from_cache(cache_key):
+            return
+
+        try:
+            data = tomllib.loads(raw.decode("utf-8"))
         except Exception as e:
             raise ConfigError(f"Failed to parse {self.config_path}: {e}") from e
 
+        self._load_data(data)
+
+        if cache_key:
+            self._save_to_cache(cache_key)
+
+    def _load_data(self, data: Dict[str, Any]) -> None:
+        """
+        Populate configuration from parsed TOML data.
+
+        Args:
+            data: Parsed pyproject.toml document
+
+        Raises:
+            ConfigError: If configuration is invalid
+        """
         # Get taskx config section
         tool_section = data.get("tool", {})
         taskx_config = tool_section.get("taskx", {})
@@ -139,6 +190,94 @@ class Config:
         validator = ConfigValidator()
         validator.validate_config(self)
 
+    def _cache_file(self) -> Path:
+        """Location of the parsed-config cache for this config file."""
+        path_hash = hashlib.sha256(str(self.config_path.resolve()).encode()).hexdigest()
+        return PlatformUtils.get_cache_dir() / "config" / f"{path_hash[:16]}.pickle"
+
+    def _cache_key(self, stat: os.stat_result, raw: bytes) -> Dict[str, Any]:
+        """
+        Build the key identifying the exact file contents and taskx version.
+
+        The reserved command names are part of the key, since a cached config
+        was only checked against the names reserved when it was written.
+
+        Args:
+            stat: Result of stat() on the config file
+            raw: Raw file contents
+
+        Returns:
+            Cache key
+        """
+        from taskx import __version__
+
+        return {
+            "format": CONFIG_CACHE_FORMAT,
+            "taskx": __version__,
+            "python": sys.version_info[:2],
+            "reserved": hashlib.sha256(",".join(sorted(self.RESERVED_NAMES)).encode()).hexdigest(),
+            "path": str(self.config_path.resolve()),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        }
+
+    def _load_from_cache(self, key: Dict[str, Any]) -> bool:
+        """
+        Restore a previously validated configuration.
+
+        Args:
+            key: Cache key of the current file
+
+        Returns:
+            True if the cache matched and the configuration was restored
+        """
+        try:
+            with open(self._cache_file(), "rb") as f:
+                cached = pickle.load(f)  # noqa: S301 - file lives in the user's own cache dir
+            if cached.get("key") != key:
+                return False
+            state = cached["state"]
+            self.tasks = state["tasks"]
+            self.aliases = state["aliases"]
+            self.env = state["env"]
+            self.settings = state["settings"]
+            self._raw_data = state["raw_data"]
+            return True
+        except Exception:
+            # Missing, stale or unreadable cache: fall back to parsing
+            return False
+
+    def _save_to_cache(self, key: Dict[str, Any]) -> None:
+        """
+        Store the validated configuration for reuse.
+
+        Args:
+            key: Cache key of the current file
+        """
+        payload = {
+            "key": key,
+            "state": {
+                "tasks": self.tasks,
+                "aliases": self.aliases,
+                "env": self.env,
+                "settings": self.settings,
+                "raw_data": self._raw_data,
+            },
+        }
+        cache_file = self._cache_file()
+        # Caching is best-effort (read-only home, unpicklable values, ...)
+        with contextlib.suppress(Exception):
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
     def _validate_env(self, env: Dict[str, str]) -> None:
         """
         Validate environment variables.
@@ -257,23 +396,52 @@ class Config:
                     f"Task '{name}' aliases must be string or list, got {type(aliases)}"
                 )
 
+            # Parse shard_files field (single glob or list)
+            shard_files = task_dict.get("shard_files", [])
+            if isinstance(shard_files, str):
+                shard_files = [shard_files]
+            elif not isinstance(shard_files, list):
+                raise ConfigError(
+                    f"Task '{name}' shard_files must be a glob or list, got {type(shard_files)}"
+                )
+
+            # Parse retry_on field (single exit code or list)
+            retry_on = task_dict.get("retry_on", [])
+            if isinstance(retry_on, int):
+                retry_on = [retry_on]
+            elif not isinstance(retry_on, list):
+                raise ConfigError(
+                    f"Task '{name}' retry_on must be an exit code or list, got {type(retry_on)}"
+                )
+
             return Task(
                 name=name,
                 cmd=cmd,
                 description=task_dict.get("description"),
                 depends=task_dict.get("depends", []),
                 parallel=parallel,
+                matrix=task_dict.get("matrix", {}),
+                shards=task_dict.get("shards", 0),
+                shard_files=shard_files,
                 env=task_dict.get("env", {}),
                 cwd=task_dict.get("cwd"),
                 shell=task_dict.get("shell"),
                 timeout=task_dict.get("timeout"),
+                cpus=task_dict.get("cpus", 0),
+                mem=task_dict.get("mem", 0),
+                pool=task_dict.get("pool"),
                 retry=task_dict.get("retry", 0),
                 retry_delay=task_dict.get("retry_delay", 1),
+                retry_backoff=task_dict.get("retry_backoff", "fixed"),
+                retry_max_delay=task_dict.get("retry_max_delay"),
+                retry_on=retry_on,
                 on_error=task_dict.get("on_error"),
                 on_success=task_dict.get("on_success"),
                 pre=task_dict.get("pre"),
                 post=task_dict.get("post"),
                 watch=task_dict.get("watch", []),
+                inputs=task_dict.get("inputs", []),
+                outputs=task_dict.get("outputs", []),
                 aliases=aliases,
                 prompt=task_dict.get("prompt"),
                 confirm=task_dict.get("confirm"),
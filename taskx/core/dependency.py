@@ -1,10 +1,11 @@
 """
 Dependency resolution for tasks.
 
-Implements topological sorting and circular dependency detection.
+Implements topological sorting, circular dependency detection and a
+precomputed graph index for constant-time structural queries.
 """
 
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from taskx.core.task import Task
 
@@ -15,6 +16,254 @@ class CircularDependencyError(Exception):
     pass
 
 
+class GraphIndex:
+    """
+    Precomputed view of an acyclic task graph.
+
+    Built once in O(V + E) (plus the bitset unions for the closure), after
+    which level, reachability and parallelism queries are O(1):
+
+    - ``order``: topological order (dependencies first, ties in graph order)
+    - ``level(name)``: longest chain of dependencies below a task
+    - transitive dependencies of every task, stored as an int bitset
+
+    Dependencies on tasks outside the graph are ignored.
+    """
+
+    def __init__(self, graph: Mapping[str, Iterable[str]]):
+        """
+        Build the index.
+
+        Args:
+            graph: Mapping of task name to the names it depends on
+
+        Raises:
+            CircularDependencyError: If the graph contains a cycle
+        """
+        self.deps: Dict[str, List[str]] = {
+            name: list(dict.fromkeys(dep for dep in deps if dep in graph))
+            for name, deps in graph.items()
+        }
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.deps}
+        for name, deps in self.deps.items():
+            for dep in deps:
+                self.dependents[dep].append(name)
+
+        # Kahn's algorithm; the queue is consumed in insertion order
+        remaining = {name: len(deps) for name, deps in self.deps.items()}
+        self.order: List[str] = [name for name, count in remaining.items() if count == 0]
+        for name in self.order:
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    self.order.append(dependent)
+
+        if len(self.order) != len(self.deps):
+            stuck = sorted(name for name, count in remaining.items() if count > 0)
+            raise CircularDependencyError(
+                f"Circular dependency detected among tasks: {', '.join(stuck)}"
+            )
+
+        self._bit = {name: position for position, name in enumerate(self.order)}
+        self._levels: Dict[str, int] = {}
+        self._ancestors: Dict[str, int] = {}
+        for name in self.order:
+            deps = self.deps[name]
+            self._levels[name] = max((self._levels[dep] + 1 for dep in deps), default=0)
+            mask = 0
+            for dep in deps:
+                mask |= self._ancestors[dep] | (1 << self._bit[dep])
+            self._ancestors[name] = mask
+
+    @classmethod
+    def from_tasks(cls, tasks: Mapping[str, Task]) -> "GraphIndex":
+        """
+        Build an index from task definitions.
+
+        Args:
+            tasks: Dictionary of task name to Task object
+
+        Returns:
+            Graph index
+        """
+        return cls({name: task.depends for name, task in tasks.items()})
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.deps
+
+    def level(self, name: str) -> int:
+        """
+        Get the topological level of a task.
+
+        Args:
+            name: Task name
+
+        Returns:
+            Level (0 for tasks with no dependencies or unknown tasks)
+        """
+        return self._levels.get(name, 0)
+
+    def levels(self) -> List[List[str]]:
+        """
+        Group tasks by level.
+
+        Returns:
+            Lists of task names; every task only depends on earlier groups
+        """
+        groups: List[List[str]] = [[] for _ in range(max(self._levels.values(), default=-1) + 1)]
+        for name in self.order:
+            groups[self._levels[name]].append(name)
+        return groups
+
+    def depends_on(self, name: str, other: str) -> bool:
+        """
+        Check whether a task (transitively) depends on another.
+
+        Args:
+            name: Dependent task
+            other: Possible dependency
+
+        Returns:
+            True if ``other`` must finish before ``name`` can start
+        """
+        if name not in self.deps or other not in self.deps:
+            return False
+        return bool(self._ancestors[name] >> self._bit[other] & 1)
+
+    def can_run_parallel(self, task1: str, task2: str) -> bool:
+        """
+        Check if two distinct tasks have no dependency relationship.
+
+        Args:
+            task1: First task name
+            task2: Second task name
+
+        Returns:
+            True if tasks can run in parallel
+        """
+        if task1 == task2 or task1 not in self.deps or task2 not in self.deps:
+            return False
+        return not (self.depends_on(task1, task2) or self.depends_on(task2, task1))
+
+    def dependencies(self, name: str) -> List[str]:
+        """
+        Get every transitive dependency of a task.
+
+        Args:
+            name: Task name
+
+        Returns:
+            Dependencies in topological order (excluding the task itself)
+        """
+        mask = self._ancestors.get(name, 0)
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.order[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def closure(self, name: str) -> Set[str]:
+        """
+        Get a task together with all of its transitive dependencies.
+
+        Args:
+            name: Task name
+
+        Returns:
+            Set of task names
+        """
+        return {name, *self.dependencies(name)}
+
+    def with_dependents(self, names: Iterable[str]) -> List[str]:
+        """
+        Get tasks together with every task that (transitively) depends on them.
+
+        Args:
+            names: Task names (unknown names are ignored)
+
+        Returns:
+            Task names in topological order
+        """
+        found = {name for name in names if name in self.deps}
+        stack = list(found)
+        while stack:
+            for dependent in self.dependents[stack.pop()]:
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+        return [name for name in self.order if name in found]
+
+    def remaining_work(
+        self,
+        durations: Optional[Mapping[str, float]] = None,
+        within: Optional[Iterable[str]] = None,
+        default: float = 1.0,
+    ) -> Dict[str, float]:
+        """
+        Compute the critical-path weight of every task.
+
+        The weight of a task is its own duration plus the longest chain of
+        dependents that cannot start before it finishes. Launching ready tasks
+        with the largest weight first keeps the critical path moving.
+
+        Args:
+            durations: Expected duration of each task (e.g. from history)
+            within: Restrict the computation to these tasks (default: all)
+            default: Duration assumed for tasks without an expected duration
+
+        Returns:
+            Mapping of task name to critical-path weight
+        """
+        durations = durations or {}
+        members = set(self.deps) if within is None else set(within)
+        weights: Dict[str, float] = {}
+        for name in reversed(self.order):
+            if name not in members:
+                continue
+            downstream = max(
+                (weights[d] for d in self.dependents[name] if d in members),
+                default=0.0,
+            )
+            weights[name] = durations.get(name, default) + downstream
+        return weights
+
+    def critical_path(
+        self,
+        durations: Optional[Mapping[str, float]] = None,
+        within: Optional[Iterable[str]] = None,
+        default: float = 1.0,
+    ) -> Tuple[float, List[str]]:
+        """
+        Find the longest weighted chain through the graph.
+
+        Args:
+            durations: Expected duration of each task (e.g. from history)
+            within: Restrict the computation to these tasks (default: all)
+            default: Duration assumed for tasks without an expected duration
+
+        Returns:
+            Tuple of (total duration, task names from first to last)
+        """
+        weights = self.remaining_work(durations, within, default)
+        if not weights:
+            return 0.0, []
+
+        # Start at the heaviest task that nothing in scope depends on first
+        current = max(
+            (name for name in self.order if name in weights),
+            key=lambda name: weights[name],
+        )
+        total = weights[current]
+        path = [current]
+        while True:
+            following = [d for d in self.dependents[current] if d in weights]
+            if not following:
+                return total, path
+            current = max(following, key=lambda name: weights[name])
+            path.append(current)
+
+
 class DependencyResolver:
     """Resolves task dependencies using topological sort."""
 
@@ -26,6 +275,19 @@ class DependencyResolver:
             tasks: Dictionary of task name to Task object
         """
         self.tasks = tasks
+        self._index: Optional[GraphIndex] = None
+
+    @property
+    def index(self) -> GraphIndex:
+        """
+        Graph index of all tasks, built on first use and then reused.
+
+        Raises:
+            CircularDependencyError: If the task graph contains a cycle
+        """
+        if self._index is None:
+            self._index = GraphIndex.from_tasks(self.tasks)
+        return self._index
 
     def resolve_dependencies(self, task_name: str) -> List[str]:
         """
@@ -44,8 +306,9 @@ class DependencyResolver:
         if task_name not in self.tasks:
             raise ValueError(f"Task '{task_name}' not found")
 
-        visited: Set[str] = set()
-        visiting: Set[str] = set()
+        visited: Dict[str, None] = {}
+        # Insertion-ordered, so the current DFS path can be reported on a cycle
+        visiting: Dict[str, None] = {}
         result: List[str] = []
 
         def visit(name: str) -> None:
@@ -54,27 +317,49 @@ class DependencyResolver:
                 return
 
             if name in visiting:
+                path = list(visiting)
+                cycle = path[path.index(name) :] + [name]
                 raise CircularDependencyError(
-                    f"Circular dependency detected involving task '{name}'"
+                    f"Circular dependency detected involving task '{name}': "
+                    f"{' -> '.join(cycle)}"
                 )
 
             if name not in self.tasks:
                 raise ValueError(f"Task '{name}' not found (required by dependency chain)")
 
-            visiting.add(name)
+            visiting[name] = None
 
             # Visit dependencies first
             task = self.tasks[name]
             for dep in task.depends:
                 visit(dep)
 
-            visiting.remove(name)
-            visited.add(name)
+            del visiting[name]
+            visited[name] = None
             result.append(name)
 
         visit(task_name)
         return result
 
+    def resolve_many(self, task_names: Iterable[str]) -> List[str]:
+        """
+        Resolve the dependencies of several tasks into one execution order.
+
+        Args:
+            task_names: Names of tasks to resolve
+
+        Returns:
+            Every task needed, each once, dependencies first
+
+        Raises:
+            ValueError: If a task is not found
+            CircularDependencyError: If circular dependency detected
+        """
+        chain: Dict[str, None] = {}
+        for task_name in task_names:
+            chain.update(dict.fromkeys(self.resolve_dependencies(task_name)))
+        return list(chain)
+
     def get_dependency_graph(self) -> Dict[str, List[str]]:
         """
         Get the complete dependency graph.
@@ -91,19 +376,115 @@ class DependencyResolver:
         """
         Find all circular dependencies in the task graph.
 
+        Runs Tarjan's strongly-connected-components algorithm once over the
+        whole graph (O(V + E)); every component containing a cycle is
+        reported as a full cycle path. Dependencies on unknown tasks are
+        ignored here (they are reported by reference validation).
+
         Returns:
-            List of circular dependency chains
+            List of cycles, each a path of task names that starts and ends
+            with the same task (e.g. ``["a", "b", "a"]``)
+        """
+        cycles = []
+        for component in self.strongly_connected_components():
+            members = set(component)
+            start = component[0]
+            if len(component) == 1 and start not in self.tasks[start].depends:
+                continue
+            cycles.append(self._cycle_through(start, members))
+        return cycles
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """
+        Compute the strongly connected components of the dependency graph.
+
+        Iterative Tarjan's algorithm, so deep chains never hit the recursion
+        limit. Members of each component are listed in config order.
+
+        Returns:
+            List of components (each a list of task names)
+        """
+        order = {name: position for position, name in enumerate(self.tasks)}
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Dict[str, bool] = {}
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self.tasks:
+            if root in index:
+                continue
+
+            # Each frame: (task, iterator over its known dependencies)
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(self._known_deps(root)))]
+
+            while work:
+                name, deps = work[-1]
+                advanced = False
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack[dep] = True
+                        work.append((dep, iter(self._known_deps(dep))))
+                        advanced = True
+                        break
+                    if on_stack.get(dep):
+                        lowlink[name] = min(lowlink[name], index[dep])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[name])
+
+                if lowlink[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == name:
+                            break
+                    components.append(sorted(component, key=order.__getitem__))
+
+        return components
+
+    def _known_deps(self, name: str) -> List[str]:
+        """Dependencies of a task that exist in the graph."""
+        return [dep for dep in self.tasks[name].depends if dep in self.tasks]
+
+    def _cycle_through(self, start: str, members: Set[str]) -> List[str]:
         """
-        circles = []
+        Find the shortest cycle through ``start`` inside one component.
 
-        for task_name in self.tasks:
-            try:
-                self.resolve_dependencies(task_name)
-            except CircularDependencyError:
-                # Extract cycle from error message if possible
-                circles.append([task_name])
+        Args:
+            start: Task to start (and end) the cycle at
+            members: Tasks in the strongly connected component
 
-        return circles
+        Returns:
+            Cycle path beginning and ending with ``start``
+        """
+        parents: Dict[str, str] = {}
+        queue = [start]
+        for name in queue:
+            for dep in self._known_deps(name):
+                if dep == start:
+                    path = [name]
+                    while path[-1] != start:
+                        path.append(parents[path[-1]])
+                    return [start] + path[::-1][1:] + [start]
+                if dep in members and dep not in parents and dep != start:
+                    parents[dep] = name
+                    queue.append(dep)
+        return [start, start]
 
     def get_task_depth(self, task_name: str) -> int:
         """
@@ -115,15 +496,7 @@ class DependencyResolver:
         Returns:
             Depth (0 for tasks with no dependencies)
         """
-        if task_name not in self.tasks:
-            return 0
-
-        task = self.tasks[task_name]
-        if not task.depends:
-            return 0
-
-        max_dep_depth = max(self.get_task_depth(dep) for dep in task.depends)
-        return max_dep_depth + 1
+        return self.index.level(task_name)
 
     def get_independent_tasks(self) -> List[str]:
         """
@@ -146,10 +519,6 @@ class DependencyResolver:
             True if tasks can run in parallel
         """
         try:
-            deps1 = self.resolve_dependencies(task1)
-            deps2 = self.resolve_dependencies(task2)
-
-            # If either task depends on the other, they can't run in parallel
-            return task1 not in deps2 and task2 not in deps1
-        except (ValueError, CircularDependencyError):
+            return self.index.can_run_parallel(task1, task2)
+        except CircularDependencyError:
             return False
@@ -4,13 +4,55 @@ Environment variable management for taskx.
 
 import os
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import ChainMap, Dict, Mapping, MutableMapping, Optional, cast
 
 from dotenv import dotenv_values
 
 from taskx.utils.shell import EnvironmentExpander
 
 
+class LayeredEnv(ChainMap[str, str]):
+    """
+    Copy-on-write task environment.
+
+    Layers are looked up front to back; writes (e.g. prompt values) go to
+    the first layer, a dict owned by this environment, so the shared base
+    snapshot and the config's env tables are never copied or modified.
+    ``materialize`` builds the flat dict a child process is spawned with,
+    and ``new_child`` adds a higher-priority layer without copying.
+    """
+
+    def materialize(self) -> Dict[str, str]:
+        """
+        Flatten the layers into a new dictionary.
+
+        Returns:
+            Complete environment (earlier layers take precedence)
+        """
+        env = dict(self.maps[-1])
+        for layer in reversed(self.maps[:-1]):
+            env.update(layer)
+        return env
+
+
+def with_layer(env: Mapping[str, str], layer: Mapping[str, str]) -> LayeredEnv:
+    """
+    Put variables on top of a task environment without copying it.
+
+    Args:
+        env: Complete task environment (layered, or a plain dict of overrides
+            on top of os.environ)
+        layer: Variables taking precedence
+
+    Returns:
+        Layered environment
+    """
+    if isinstance(env, LayeredEnv):
+        return env.new_child(dict(layer))
+    return LayeredEnv(dict(layer), _read_only(env), os.environ)
+
+
 class EnvironmentManager:
     """Manages environment variables for task execution."""
 
@@ -23,6 +65,7 @@ class EnvironmentManager:
         """
         self.global_env = global_env or {}
         self.dotenv_vars: Dict[str, str] = {}
+        self._base: Optional[Mapping[str, str]] = None
 
     def load_dotenv(self, dotenv_path: Optional[Path] = None) -> None:
         """
@@ -36,12 +79,35 @@ class EnvironmentManager:
 
         if dotenv_path.exists():
             self.dotenv_vars = dict(dotenv_values(dotenv_path))
+            self._base = None
+
+    def base_env(self) -> Mapping[str, str]:
+        """
+        Get the environment shared by all tasks.
+
+        System environment, .env variables and the config's global env are
+        merged once into a read-only snapshot; later changes to os.environ
+        are not seen until ``refresh`` is called.
+
+        Returns:
+            Read-only mapping of the merged variables
+        """
+        if self._base is None:
+            base = os.environ.copy()
+            base.update(self.dotenv_vars)
+            base.update(self.global_env)
+            self._base = MappingProxyType(base)
+        return self._base
+
+    def refresh(self) -> None:
+        """Drop the cached base snapshot (re-read os.environ on next use)."""
+        self._base = None
 
     def get_env_for_task(
         self,
         task_env: Optional[Dict[str, str]] = None,
         override_env: Optional[Dict[str, str]] = None,
-    ) -> Dict[str, str]:
+    ) -> LayeredEnv:
         """
         Build complete environment for task execution.
 
@@ -57,26 +123,11 @@ class EnvironmentManager:
             override_env: Override environment variables (from CLI)
 
         Returns:
-            Complete environment dictionary
+            Complete environment; the system, .env and global layers are
+            shared between tasks, writes only affect this task
         """
-        # Start with system environment
-        env = os.environ.copy()
-
-        # Add .env variables
-        env.update(self.dotenv_vars)
-
-        # Add global environment from config
-        env.update(self.global_env)
-
-        # Add task-specific environment
-        if task_env:
-            env.update(task_env)
-
-        # Add override environment (highest priority)
-        if override_env:
-            env.update(override_env)
-
-        return env
+        layers = [layer for layer in (override_env, task_env) if layer]
+        return LayeredEnv({}, *layers, _read_only(self.base_env()))
 
     def expand_command(self, cmd: str, env: Dict[str, str]) -> str:
         """
@@ -105,3 +156,8 @@ class EnvironmentManager:
         required_vars = EnvironmentExpander.find_variables(cmd)
         missing = [var for var in required_vars if var not in env]
         return (len(missing) == 0, missing)
+
+
+def _read_only(layer: Mapping[str, str]) -> "MutableMapping[str, str]":
+    """Type a shared layer for ChainMap, which only ever writes to its first layer."""
+    return cast("MutableMapping[str, str]", layer)
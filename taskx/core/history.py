@@ -0,0 +1,347 @@
+"""
+Task execution history.
+
+Every task run is appended to a local SQLite database so that durations
+survive the run that measured them. Per-task statistics (p50/p95/max) feed
+scheduling priorities and show up in ``taskx history``. Sharded tasks also
+keep a smoothed duration estimate per file.
+"""
+
+import math
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Bump together with a migration in TaskHistory._connect when the schema changes
+SCHEMA_VERSION = 2
+
+# Number of most recent successful runs statistics are computed from
+DEFAULT_WINDOW = 100
+
+# Weight of a new measurement in the per-file duration estimate
+FILE_SMOOTHING = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    exit_code INTEGER NOT NULL,
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_task ON runs (task, id);
+CREATE TABLE IF NOT EXISTS file_durations (
+    task TEXT NOT NULL,
+    path TEXT NOT NULL,
+    duration REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (task, path)
+);
+"""
+
+
+@dataclass
+class RunRecord:
+    """
+    A single recorded task run.
+
+    Attributes:
+        task_name: Name of the task
+        started_at: Start time (seconds since the epoch)
+        duration: Wall-clock duration in seconds
+        exit_code: Exit code of the run
+        fingerprint: Incremental-cache key of the run, if the task is cacheable
+    """
+
+    task_name: str
+    started_at: float
+    duration: float
+    exit_code: int
+    fingerprint: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the run succeeded."""
+        return self.exit_code == 0
+
+
+@dataclass
+class DurationStats:
+    """
+    Duration statistics of a task's recent successful runs.
+
+    Attributes:
+        task_name: Name of the task
+        runs: Number of successful runs the statistics are based on
+        failures: Number of failed runs in the same window
+        p50: Median duration in seconds
+        p95: 95th percentile duration in seconds
+        max: Longest duration in seconds
+        last: Duration of the most recent successful run
+    """
+
+    task_name: str
+    runs: int
+    failures: int
+    p50: float
+    p95: float
+    max: float
+    last: float
+
+
+class TaskHistory:
+    """
+    Append-only store of task runs.
+
+    Each operation opens its own short-lived connection, so a single instance
+    can be shared by scheduler worker threads and several taskx processes can
+    append to the same database concurrently.
+    """
+
+    def __init__(self, path: Path, window: int = DEFAULT_WINDOW):
+        """
+        Initialize history store.
+
+        Args:
+            path: SQLite database file (created on first write)
+            window: Number of recent successful runs statistics are based on
+        """
+        self.path = path
+        self.window = max(1, window)
+
+    def record(
+        self,
+        task_name: str,
+        duration: float,
+        exit_code: int,
+        fingerprint: Optional[str] = None,
+        started_at: Optional[float] = None,
+    ) -> None:
+        """
+        Append a run to the history.
+
+        Args:
+            task_name: Name of the task
+            duration: Wall-clock duration in seconds
+            exit_code: Exit code of the run
+            fingerprint: Incremental-cache key, if any
+            started_at: Start time (default: now minus duration)
+
+        Raises:
+            sqlite3.Error: If the database cannot be written
+            OSError: If the database directory cannot be created
+        """
+        if started_at is None:
+            started_at = time.time() - duration
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO runs (task, started_at, duration, exit_code, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (task_name, started_at, duration, exit_code, fingerprint),
+            )
+
+    def runs(self, task_name: str, limit: int = 20) -> List[RunRecord]:
+        """
+        Get the most recent runs of a task.
+
+        Args:
+            task_name: Name of the task
+            limit: Maximum number of runs
+
+        Returns:
+            Runs, newest first
+        """
+        if not self.path.exists():
+            return []
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT started_at, duration, exit_code, fingerprint FROM runs "
+                "WHERE task = ? ORDER BY id DESC LIMIT ?",
+                (task_name, limit),
+            ).fetchall()
+
+        return [RunRecord(task_name, *row) for row in rows]
+
+    def stats(self, task_name: str) -> Optional[DurationStats]:
+        """
+        Compute duration statistics for a task.
+
+        Args:
+            task_name: Name of the task
+
+        Returns:
+            Statistics, or None if the task never succeeded
+        """
+        return self.stats_for([task_name]).get(task_name)
+
+    def stats_for(self, task_names: Iterable[str]) -> Dict[str, DurationStats]:
+        """
+        Compute duration statistics for several tasks.
+
+        Args:
+            task_names: Names of the tasks
+
+        Returns:
+            Mapping of task name to statistics (tasks without a successful
+            run are omitted)
+        """
+        if not self.path.exists():
+            return {}
+
+        result: Dict[str, DurationStats] = {}
+        with closing(self._connect()) as conn:
+            for name in dict.fromkeys(task_names):
+                rows = conn.execute(
+                    "SELECT duration, exit_code FROM runs WHERE task = ? ORDER BY id DESC LIMIT ?",
+                    (name, self.window),
+                ).fetchall()
+                durations = [duration for duration, exit_code in rows if exit_code == 0]
+                if not durations:
+                    continue
+                ordered = sorted(durations)
+                result[name] = DurationStats(
+                    task_name=name,
+                    runs=len(durations),
+                    failures=len(rows) - len(durations),
+                    p50=_percentile(ordered, 50),
+                    p95=_percentile(ordered, 95),
+                    max=ordered[-1],
+                    last=durations[0],
+                )
+        return result
+
+    def failures(self, task_names: Iterable[str]) -> Dict[str, int]:
+        """
+        Count the failed runs of several tasks.
+
+        Unlike ``stats_for``, this covers tasks that never succeeded.
+
+        Args:
+            task_names: Names of the tasks
+
+        Returns:
+            Mapping of task name to failed runs among its most recent runs
+            (tasks without recorded runs are omitted)
+        """
+        if not self.path.exists():
+            return {}
+
+        result: Dict[str, int] = {}
+        with closing(self._connect()) as conn:
+            for name in dict.fromkeys(task_names):
+                rows = conn.execute(
+                    "SELECT exit_code FROM runs WHERE task = ? ORDER BY id DESC LIMIT ?",
+                    (name, self.window),
+                ).fetchall()
+                if rows:
+                    result[name] = sum(1 for (exit_code,) in rows if exit_code != 0)
+        return result
+
+    def task_names(self) -> List[str]:
+        """
+        Get every task with recorded runs.
+
+        Returns:
+            Sorted task names
+        """
+        if not self.path.exists():
+            return []
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT DISTINCT task FROM runs ORDER BY task").fetchall()
+        return [row[0] for row in rows]
+
+    def expected_durations(self, task_names: Iterable[str]) -> Dict[str, float]:
+        """
+        Get the typical (median) duration of each task.
+
+        Args:
+            task_names: Names of the tasks
+
+        Returns:
+            Mapping of task name to p50 duration (tasks without history omitted)
+        """
+        return {name: stats.p50 for name, stats in self.stats_for(task_names).items()}
+
+    def record_file_durations(self, task_name: str, durations: Dict[str, float]) -> None:
+        """
+        Update the per-file duration estimates of a sharded task.
+
+        Estimates are exponentially smoothed, so one slow run doesn't
+        reshuffle every shard.
+
+        Args:
+            task_name: Name of the task
+            durations: Measured duration of each file in seconds
+
+        Raises:
+            sqlite3.Error: If the database cannot be written
+            OSError: If the database directory cannot be created
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO file_durations (task, path, duration, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (task, path) DO UPDATE SET "
+                "duration = duration + ? * (excluded.duration - duration), "
+                "updated_at = excluded.updated_at",
+                [
+                    (task_name, path, duration, now, FILE_SMOOTHING)
+                    for path, duration in durations.items()
+                ],
+            )
+
+    def file_durations(self, task_name: str) -> Dict[str, float]:
+        """
+        Get the per-file duration estimates of a sharded task.
+
+        Args:
+            task_name: Name of the task
+
+        Returns:
+            Mapping of file path to estimated duration in seconds
+        """
+        if not self.path.exists():
+            return {}
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT path, duration FROM file_durations WHERE task = ?", (task_name,)
+            ).fetchall()
+        return dict(rows)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+
+    Args:
+        ordered: Values in ascending order (non-empty)
+        percent: Percentile between 0 and 100
+
+    Returns:
+        The smallest value with at least ``percent`` % of values at or below it
+    """
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -4,7 +4,7 @@ Hook execution system for taskx.
 Handles pre/post/error/success hooks.
 """
 
-from typing import Optional
+from typing import IO, Any, Mapping, Optional
 
 from rich.console import Console
 
@@ -15,20 +15,21 @@ from taskx.utils.secure_exec import SecureCommandExecutor, SecurityError
 class HookExecutor:
     """Executes task hooks."""
 
-    def __init__(self, console: Optional[Console] = None):
+    def __init__(self, console: Optional[Console] = None, stdout: Optional[IO[Any]] = None):
         """
         Initialize hook executor.
 
         Args:
             console: Rich console for output
+            stdout: Stream receiving the output of hooks (default: the inherited stdout)
         """
         self.console = console or Console()
-        self.secure_executor = SecureCommandExecutor()
+        self.secure_executor = SecureCommandExecutor(stdout=stdout)
 
     def execute_hook(
         self,
         hook: Hook,
-        env: dict,
+        env: Mapping[str, str],
         cwd: Optional[str] = None,
     ) -> bool:
         """
@@ -65,7 +66,7 @@ class HookExecutor:
         self,
         task: Task,
         hook_type: str,
-        env: dict,
+        env: Mapping[str, str],
     ) -> bool:
         """
         Execute hooks of a specific type for a task.
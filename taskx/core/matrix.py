@@ -0,0 +1,113 @@
+"""
+Matrix task expansion.
+
+A task's ``matrix`` maps variable names to lists of values. The task runs
+once per combination ("cell") of values, with the cell's values set as
+environment variables::
+
+    test = { cmd = "tox -e py${python} -- --shard ${shard}", matrix = {
+        python = ["3.10", "3.11"], shard = [1, 2],
+        exclude = [{ python = "3.10", shard = 2 }],
+        include = [{ python = "3.12", shard = 1 }],
+    } }
+
+``exclude`` removes the cells matching all values of an entry, ``include``
+appends extra cells after the combinations.
+"""
+
+import itertools
+import re
+from typing import Any, Dict, List
+
+MATRIX_INCLUDE = "include"
+MATRIX_EXCLUDE = "exclude"
+_FILTERS = (MATRIX_INCLUDE, MATRIX_EXCLUDE)
+
+# Matrix variables are referenced as ${name} / $name in commands
+_VARIABLE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# A matrix cell: variable name -> value
+MatrixCell = Dict[str, str]
+
+
+def expand_matrix(matrix: Dict[str, Any]) -> List[MatrixCell]:
+    """
+    Expand a matrix definition into its cells.
+
+    Args:
+        matrix: Variable name -> list of values, plus optional ``include``
+            and ``exclude`` lists of tables
+
+    Returns:
+        Cells in definition order (first variable varies slowest), then the
+        included cells
+
+    Raises:
+        ValueError: If the definition is invalid or leaves no cells
+    """
+    if not isinstance(matrix, dict):
+        raise ValueError("matrix must be a table of variable names to value lists")
+    axes = {name: values for name, values in matrix.items() if name not in _FILTERS}
+    include = _filter_entries(matrix, MATRIX_INCLUDE)
+    exclude = _filter_entries(matrix, MATRIX_EXCLUDE)
+
+    for name, values in axes.items():
+        _check_name(name)
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"matrix variable '{name}' must be a non-empty list of values")
+
+    cells: List[MatrixCell] = []
+    if axes:
+        for combination in itertools.product(*axes.values()):
+            cell = {name: _format(value) for name, value in zip(axes, combination)}
+            if not any(_matches(cell, entry) for entry in exclude):
+                cells.append(cell)
+
+    for entry in include:
+        for name in entry:
+            _check_name(name)
+        if entry not in cells:
+            cells.append(dict(entry))
+
+    if not cells:
+        raise ValueError("matrix has no cells left after exclude")
+    return cells
+
+
+def cell_label(cell: MatrixCell) -> str:
+    """
+    Short identifier of a cell, e.g. ``python=3.11,shard=2``.
+
+    Args:
+        cell: Matrix cell
+
+    Returns:
+        Comma-separated name=value pairs
+    """
+    return ",".join(f"{name}={value}" for name, value in cell.items())
+
+
+def _filter_entries(matrix: Dict[str, Any], key: str) -> List[MatrixCell]:
+    """Validate and normalize the include/exclude list."""
+    entries = matrix.get(key, [])
+    if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        raise ValueError(f"matrix '{key}' must be a list of tables")
+    return [{name: _format(value) for name, value in entry.items()} for entry in entries]
+
+
+def _check_name(name: str) -> None:
+    """Reject names that can't be referenced as variables."""
+    if not _VARIABLE_NAME.fullmatch(name):
+        raise ValueError(f"matrix variable '{name}' is not a valid variable name")
+
+
+def _format(value: Any) -> str:
+    """Environment value of a matrix entry (TOML booleans as true/false)."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _matches(cell: MatrixCell, entry: MatrixCell) -> bool:
+    """Whether a cell has all values of a filter entry."""
+    return all(cell.get(name) == value for name, value in entry.items())
@@ -0,0 +1,64 @@
+"""
+Resource weights tasks can declare.
+
+Tasks may declare what each of their commands needs while it runs::
+
+    build = { cmd = "make -j8", cpus = 8, mem = "4G", pool = "db" }
+
+These are the resource kinds and the parsing of their values; admission
+against the machine's budget lives in ``taskx.execution.resources``.
+"""
+
+import re
+from typing import Dict, Union
+
+# Resource kinds tasks can declare
+CPUS = "cpus"
+MEMORY = "mem"
+POOL_PREFIX = "pool:"
+
+# Resource kind -> amount (cores, bytes)
+Resources = Dict[str, float]
+
+_MEMORY_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+_MEMORY_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*", re.IGNORECASE)
+
+
+def parse_memory(value: Union[int, float, str]) -> int:
+    """
+    Parse a memory size such as ``"512M"`` or ``"2GiB"``.
+
+    Args:
+        value: Bytes, or a number with a K/M/G/T suffix (powers of 1024)
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size is malformed or negative
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid memory size: {value!r}")
+    if isinstance(value, (int, float)):
+        if value < 0:
+            raise ValueError(f"Invalid memory size: {value!r}")
+        return int(value)
+
+    match = _MEMORY_PATTERN.fullmatch(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (expected e.g. 512M or 2G)")
+    number, unit = match.groups()
+    return int(float(number) * _MEMORY_UNITS[unit.lower()])
+
+
+def pool_resource(name: str) -> str:
+    """
+    Resource kind of a named pool.
+
+    Args:
+        name: Pool name
+
+    Returns:
+        Key of the pool in resource requests and capacities
+    """
+    return POOL_PREFIX + name
@@ -0,0 +1,120 @@
+"""
+Retry policies for failed commands.
+
+A policy decides whether a failed run is retried and how long to wait
+before the next attempt (fixed, exponential or decorrelated-jitter backoff).
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from taskx.core.task import ExecutionResult, Task
+
+BACKOFF_FIXED = "fixed"
+BACKOFF_EXPONENTIAL = "exponential"
+BACKOFF_JITTER = "decorrelated-jitter"
+BACKOFF_STRATEGIES = (BACKOFF_FIXED, BACKOFF_EXPONENTIAL, BACKOFF_JITTER)
+
+# Upper bound for growing delays when a task doesn't set retry_max_delay
+DEFAULT_MAX_DELAY = 60.0
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How a failed command is retried.
+
+    Attributes:
+        retries: Number of retries after the first attempt
+        delay: Base delay in seconds
+        backoff: "fixed", "exponential" or "decorrelated-jitter"
+        max_delay: Upper bound for a single delay in seconds
+        retry_on: Exit codes that are retried (empty: any failure)
+    """
+
+    retries: int = 0
+    delay: float = 1.0
+    backoff: str = BACKOFF_FIXED
+    max_delay: float = DEFAULT_MAX_DELAY
+    retry_on: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_task(cls, task: "Task") -> "RetryPolicy":
+        """
+        Build the policy configured on a task.
+
+        Args:
+            task: Task definition
+
+        Returns:
+            Retry policy (``retries == 0`` if the task is never retried)
+        """
+        return cls(
+            retries=task.retry,
+            delay=float(task.retry_delay),
+            backoff=task.retry_backoff,
+            max_delay=(
+                float(task.retry_max_delay)
+                if task.retry_max_delay is not None
+                else max(DEFAULT_MAX_DELAY, float(task.retry_delay))
+            ),
+            retry_on=list(task.retry_on),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether failures are retried at all."""
+        return self.retries > 0
+
+    def should_retry(self, attempt: int, result: "ExecutionResult") -> bool:
+        """
+        Decide whether a failed attempt is retried.
+
+        Only failures of a command that actually ran (non-zero exit code) or
+        timed out are retried; rejected commands (security checks, missing
+        tasks) fail immediately.
+
+        Args:
+            attempt: Number of retries already made
+            result: Result of the attempt
+
+        Returns:
+            True if another attempt should be made
+        """
+        if result.success or attempt >= self.retries:
+            return False
+        if result.error is not None and not isinstance(result.error, TimeoutError):
+            return False
+        if self.retry_on:
+            return result.exit_code in self.retry_on
+        return True
+
+    def next_delay(
+        self,
+        attempt: int,
+        previous: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ) -> float:
+        """
+        Compute the wait before the next attempt.
+
+        Args:
+            attempt: Number of retries already made (0 before the first retry)
+            previous: Delay used before the previous retry (decorrelated jitter)
+            rng: Random source (default: module-level random)
+
+        Returns:
+            Delay in seconds
+        """
+        delay: float
+        if self.backoff == BACKOFF_EXPONENTIAL:
+            delay = self.delay * (2**attempt)
+        elif self.backoff == BACKOFF_JITTER:
+            # "Decorrelated jitter": uniform between the base and 3x the last sleep
+            upper = max(self.delay, (previous if previous is not None else self.delay) * 3)
+            delay = (rng or random).uniform(self.delay, upper)
+        else:
+            delay = self.delay
+        return min(delay, self.max_delay)
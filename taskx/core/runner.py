@@ -5,20 +5,40 @@ Orchestrates task execution with dependencies, hooks, and error handling.
 """
 
 import asyncio
+import contextlib
+import shlex
+import sqlite3
 import subprocess
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import IO, Any, Dict, List, Mapping, Optional, Tuple
 
 from rich.console import Console
+from rich.markup import escape
 
+from taskx.core.cache import TaskCache
 from taskx.core.config import Config
-from taskx.core.dependency import DependencyResolver
-from taskx.core.env import EnvironmentManager
+from taskx.core.dependency import CircularDependencyError, DependencyResolver
+from taskx.core.env import EnvironmentManager, with_layer
+from taskx.core.history import TaskHistory
 from taskx.core.hooks import HookExecutor
+from taskx.core.matrix import cell_label
 from taskx.core.prompts import PromptManager, parse_confirm_config, parse_prompt_config
+from taskx.core.retry import RetryPolicy
+from taskx.core.sharding import (
+    SHARD_COUNT_VAR,
+    SHARD_FILES_VAR,
+    SHARD_INDEX_VAR,
+    Shard,
+    collect_files,
+    partition,
+)
 from taskx.core.task import ExecutionResult, Task
-from taskx.execution.parallel import ParallelExecutor
+from taskx.execution.events import EventSink
+from taskx.execution.output import DEFAULT_TAIL_BYTES, DEFAULT_TAIL_LINES
+from taskx.execution.parallel import POLICY_LONGEST_FIRST, CommandSpec, ParallelExecutor
+from taskx.execution.resources import CapacityLimiter
+from taskx.execution.scheduler import DagScheduler
 from taskx.utils.platform import PlatformUtils
 from taskx.utils.secure_exec import SecureCommandExecutor, SecurityError
 from taskx.utils.shell import EnvironmentExpander, ShellValidator
@@ -27,29 +47,62 @@ from taskx.utils.shell import EnvironmentExpander, ShellValidator
 class TaskRunner:
     """Executes tasks with dependency resolution and hooks."""
 
-    def __init__(self, config: Config, console: Optional[Console] = None):
+    def __init__(
+        self,
+        config: Config,
+        console: Optional[Console] = None,
+        use_cache: bool = True,
+        events: Optional[EventSink] = None,
+        stdout: Optional[IO[Any]] = None,
+    ):
         """
         Initialize task runner.
 
         Args:
             config: Task configuration
             console: Rich console for output
+            use_cache: Skip tasks whose inputs are unchanged (tasks with ``inputs``)
+            events: Sink receiving machine-readable run events
+            stdout: Stream receiving the output of commands and hooks (default:
+                the inherited stdout)
         """
         self.config = config
         self.console = console or Console()
+        self.events = events or EventSink()
         self.env_manager = EnvironmentManager(config.env)
-        self.hook_executor = HookExecutor(self.console)
+        self.hook_executor = HookExecutor(self.console, stdout)
         self.dependency_resolver = DependencyResolver(config.tasks)
         self.prompt_manager = PromptManager()
         self.secure_executor = SecureCommandExecutor(
             strict_mode=config.settings.get("strict_mode", False),
             allow_warnings=config.settings.get("allow_security_warnings", True),
+            stdout=stdout,
+        )
+        self.limiter = CapacityLimiter.from_settings(
+            config.settings, pools=[task.pool for task in config.tasks.values() if task.pool]
         )
         self.parallel_executor = ParallelExecutor(
             console=self.console,
             max_concurrent=config.settings.get("max_parallel_tasks", 10),
             strict_mode=config.settings.get("strict_mode", False),
+            tail_lines=config.settings.get("output_tail_lines", DEFAULT_TAIL_LINES),
+            tail_bytes=config.settings.get("output_tail_bytes", DEFAULT_TAIL_BYTES),
+            log_dir=(
+                config.config_path.parent / ".taskx" / "logs"
+                if config.settings.get("logs", True)
+                else None
+            ),
+            policy=config.settings.get("parallel_order", POLICY_LONGEST_FIRST),
+            events=self.events,
+            limiter=self.limiter,
+            stdout=stdout,
         )
+        self.task_cache: Optional[TaskCache] = None
+        if use_cache and config.settings.get("cache", True):
+            self.task_cache = TaskCache(config.config_path.parent / ".taskx" / "cache")
+        self.history: Optional[TaskHistory] = None
+        if config.settings.get("history", True):
+            self.history = TaskHistory(config.config_path.parent / ".taskx" / "history.db")
 
         # Load .env file if it exists
         self.env_manager.load_dotenv()
@@ -65,27 +118,162 @@ class TaskRunner:
         Returns:
             True if task and all dependencies succeeded, False otherwise
         """
+        return self.run_tasks([task_name], override_env)
+
+    def run_tasks(
+        self,
+        task_names: List[str],
+        override_env: Optional[Dict[str, str]] = None,
+        with_dependencies: bool = True,
+    ) -> bool:
+        """
+        Run several tasks in one scheduled run.
+
+        Args:
+            task_names: Names of tasks to run
+            override_env: Environment variable overrides from CLI
+            with_dependencies: Also run their dependencies. When False only
+                the given tasks run, ordered by the dependencies among them
+                (e.g. re-running what a file change affected)
+
+        Returns:
+            True if every task succeeded, False otherwise
+        """
         # Resolve dependencies
         try:
-            task_chain = self.dependency_resolver.resolve_dependencies(task_name)
+            if with_dependencies:
+                task_chain = self.dependency_resolver.resolve_many(task_names)
+            else:
+                missing = [name for name in task_names if name not in self.config.tasks]
+                if missing:
+                    raise ValueError(f"Task '{missing[0]}' not found")
+                selected = set(task_names)
+                task_chain = [
+                    name for name in self.dependency_resolver.index.order if name in selected
+                ]
         except Exception as e:
             self.console.print(f"[red]✗ Dependency resolution failed: {e}[/red]")
             return False
-
-        # Execute tasks in dependency order
-        for task in task_chain:
-            result = self._execute_single_task(task, override_env)
-            if not result.success:
-                # Stop on first failure unless ignore_errors is set
-                task_obj = self.config.tasks[task]
-                if not task_obj.ignore_errors:
-                    self.console.print(
-                        f"[red]✗ Task chain failed at '{task}'. Stopping execution.[/red]"
-                    )
-                    return False
+        label = " ".join(task_names)
+        in_chain = set(task_chain)
+
+        run_start = time.monotonic()
+        self.events.emit("run_start", task=label, tasks=task_chain)
+
+        # Execute tasks as soon as their dependencies are done
+        scheduler = DagScheduler(
+            graph={
+                name: [dep for dep in self.config.tasks[name].depends if dep in in_chain]
+                for name in task_chain
+            },
+            execute=lambda name: self._execute_task(name, override_env, scheduler.queue_wait(name)),
+            max_workers=self.config.settings.get("max_parallel_tasks", 10),
+            order=task_chain,
+            should_continue=lambda result: self.config.tasks[result.task_name].ignore_errors,
+            is_exclusive=self._is_interactive,
+            on_interrupt=self.parallel_executor.cancel_all,
+            priority=self._launch_priority(task_chain),
+            can_start=self._can_start,
+        )
+        success = scheduler.run()
+        self.events.emit(
+            "run_end",
+            task=label,
+            success=success,
+            duration=round(time.monotonic() - run_start, 6),
+        )
+        if not success:
+            # Stop on first failure unless ignore_errors is set
+            if scheduler.failed_task:
+                self.console.print(
+                    f"[red]✗ Task chain failed at '{scheduler.failed_task}'. "
+                    f"Stopping execution.[/red]"
+                )
+            return False
 
         return True
 
+    def _is_interactive(self, task_name: str) -> bool:
+        """Check if a task needs the terminal (prompts or confirmation)."""
+        task = self.config.tasks[task_name]
+        return bool(task.prompt or task.confirm)
+
+    def _can_start(self, task_name: str) -> bool:
+        """Check if a task's command would be admitted now (pool/cores/memory free)."""
+        task = self.config.tasks[task_name]
+        if task.is_parallel or task.is_matrix or task.is_sharded:
+            # Their commands are admitted one by one
+            return True
+        return self.limiter.available(task.resources)
+
+    def _launch_priority(self, task_chain: List[str]) -> Dict[str, float]:
+        """
+        Critical-path weight of each task in a chain.
+
+        Tasks are weighted by their median duration from the run history
+        (one second for tasks that never ran).
+
+        Args:
+            task_chain: Tasks about to run
+
+        Returns:
+            Mapping of task name to weight (empty if the graph has cycles)
+        """
+        durations = {
+            name: expected
+            for name, expected in zip(task_chain, self._expected_durations(task_chain))
+            if expected is not None
+        }
+        try:
+            return self.dependency_resolver.index.remaining_work(durations, within=task_chain)
+        except CircularDependencyError:
+            return {}
+
+    def _expected_durations(self, task_names: List[str]) -> List[Optional[float]]:
+        """
+        Median duration of each task from the run history.
+
+        Args:
+            task_names: Tasks to look up
+
+        Returns:
+            Expected duration per task (None for tasks without history)
+        """
+        durations: Dict[str, float] = {}
+        if self.history is not None:
+            with contextlib.suppress(sqlite3.Error, OSError):
+                durations = self.history.expected_durations(task_names)
+        return [durations.get(name) for name in task_names]
+
+    def _execute_task(
+        self,
+        task_name: str,
+        override_env: Optional[Dict[str, str]] = None,
+        queue_wait: float = 0.0,
+    ) -> ExecutionResult:
+        """
+        Execute a single task and report its start and end as events.
+
+        Args:
+            task_name: Task to execute
+            override_env: Environment overrides
+            queue_wait: Seconds the task waited for a free worker
+
+        Returns:
+            Execution result
+        """
+        start = time.monotonic()
+        self.events.emit("task_start", task=task_name, queue_wait=round(queue_wait, 6))
+        result = self._execute_single_task(task_name, override_env)
+        self.events.emit(
+            "task_end",
+            task=task_name,
+            success=result.success,
+            exit_code=result.exit_code,
+            duration=round(time.monotonic() - start, 6),
+        )
+        return result
+
     def _execute_single_task(
         self, task_name: str, override_env: Optional[Dict[str, str]] = None
     ) -> ExecutionResult:
@@ -107,6 +295,7 @@ class TaskRunner:
             self.console.print(
                 f"[yellow]⊘ Skipping '{task_name}': not compatible with {current_platform}[/yellow]"
             )
+            self.events.emit("task_skip", task=task_name, reason="platform")
             return ExecutionResult(task_name=task_name, success=True, exit_code=0)
 
         # Build environment
@@ -179,11 +368,20 @@ class TaskRunner:
             self.console.print(
                 f"[yellow]⊘ Skipping '{task_name}': environment condition not met[/yellow]"
             )
+            self.events.emit("task_skip", task=task_name, reason="condition")
+            return ExecutionResult(task_name=task_name, success=True, exit_code=0)
+
+        # Skip tasks whose inputs are unchanged since their last successful run
+        fingerprint = self._cache_fingerprint(task, env)
+        if fingerprint and self._restore_from_cache(task, fingerprint):
+            if not task.silent:
+                self.console.print(f"[dim]⊘ Up to date:[/dim] {task_name} (cached)")
+            self.events.emit("task_skip", task=task_name, reason="cached")
             return ExecutionResult(task_name=task_name, success=True, exit_code=0)
 
         # Execute pre hook
         if task.pre:
-            if not self.hook_executor.execute_hooks_for_task(task, "pre", env):
+            if not self._run_hooks(task, "pre", env):
                 self.console.print(f"[yellow]Warning: Pre-hook failed for '{task_name}'[/yellow]")
 
         # Execute main task
@@ -196,22 +394,31 @@ class TaskRunner:
             # Check if this is a parallel task
             if task.parallel:
                 result = self._run_parallel(task, env)
+            elif task.is_matrix:
+                result = self._run_matrix(task, env)
+            elif task.is_sharded:
+                result = self._run_sharded(task, env)
             else:
-                result = self._run_command(task, env)
+                result = self._run_with_retry(task, env)
 
             duration = time.time() - start_time
+            self._record_history(task_name, duration, result.exit_code, fingerprint, start_time)
 
             if result.success:
                 if not task.silent:
                     self.console.print(f"[green]✓ Completed:[/green] {task_name} ({duration:.2f}s)")
 
+                # Record run for incremental builds
+                if fingerprint:
+                    self._record_in_cache(task, fingerprint)
+
                 # Execute success hook
                 if task.on_success:
-                    self.hook_executor.execute_hooks_for_task(task, "on_success", env)
+                    self._run_hooks(task, "on_success", env)
 
                 # Execute post hook
                 if task.post:
-                    self.hook_executor.execute_hooks_for_task(task, "post", env)
+                    self._run_hooks(task, "post", env)
 
             else:
                 if not task.silent:
@@ -222,7 +429,7 @@ class TaskRunner:
 
                 # Execute error hook
                 if task.on_error:
-                    self.hook_executor.execute_hooks_for_task(task, "on_error", env)
+                    self._run_hooks(task, "on_error", env)
 
             return ExecutionResult(
                 task_name=task_name,
@@ -233,11 +440,12 @@ class TaskRunner:
 
         except Exception as e:
             duration = time.time() - start_time
+            self._record_history(task_name, duration, -1, fingerprint, start_time)
             self.console.print(f"[red]✗ Error executing '{task_name}': {e}[/red]")
 
             # Execute error hook
             if task.on_error:
-                self.hook_executor.execute_hooks_for_task(task, "on_error", env)
+                self._run_hooks(task, "on_error", env)
 
             return ExecutionResult(
                 task_name=task_name,
@@ -247,7 +455,180 @@ class TaskRunner:
                 error=e,
             )
 
-    def _run_command(self, task: Task, env: dict) -> ExecutionResult:
+    def _run_hooks(self, task: Task, hook_type: str, env: Mapping[str, str]) -> bool:
+        """
+        Execute a task's hooks of one type, reporting them as events.
+
+        Args:
+            task: Task the hooks belong to
+            hook_type: Type of hook ('pre', 'post', 'on_error', 'on_success')
+            env: Environment variables
+
+        Returns:
+            True if all hooks succeeded, False otherwise
+        """
+        start = time.monotonic()
+        self.events.emit("hook_start", task=task.name, hook=hook_type)
+        success = self.hook_executor.execute_hooks_for_task(task, hook_type, env)
+        self.events.emit(
+            "hook_end",
+            task=task.name,
+            hook=hook_type,
+            success=success,
+            duration=round(time.monotonic() - start, 6),
+        )
+        return success
+
+    def _task_dir(self, task: Task) -> Path:
+        """Directory a task runs in (and resolves its globs against)."""
+        return Path(task.cwd) if task.cwd else Path.cwd()
+
+    def _cache_fingerprint(self, task: Task, env: Mapping[str, str]) -> Optional[str]:
+        """
+        Compute the incremental-cache key for a task.
+
+        Args:
+            task: Task about to run
+            env: Environment variables
+
+        Returns:
+            Fingerprint, or None if the task is not cacheable
+        """
+        if self.task_cache is None or not task.is_cacheable:
+            return None
+
+        if task.parallel:
+            templates = []
+            for name in task.parallel:
+                parallel_task = self.config.tasks.get(name)
+                templates.append(
+                    parallel_task.template(parallel_task.cmd)
+                    if parallel_task
+                    else task.template(name)
+                )
+        else:
+            templates = [task.template(task.cmd)]
+
+        # Only variables the task can observe through its config affect the key
+        env_keys = set(self.config.env) | set(task.env)
+        for template in templates:
+            env_keys.update(template.variables)
+
+        envs: List[Mapping[str, str]]
+        if task.is_matrix:
+            envs = [with_layer(env, cell) for cell in task.matrix_cells]
+            env_keys.difference_update(name for cell in task.matrix_cells for name in cell)
+        else:
+            envs = [env]
+        command = "\n".join(template.expand(e) for template in templates for e in envs)
+
+        try:
+            return self.task_cache.fingerprint(task, command, env, env_keys, self._task_dir(task))
+        except OSError as e:
+            self.console.print(f"[yellow]Warning: Cannot fingerprint '{task.name}': {e}[/yellow]")
+            return None
+
+    def _restore_from_cache(self, task: Task, fingerprint: str) -> bool:
+        """
+        Restore a task's outputs if it already ran with this fingerprint.
+
+        Args:
+            task: Task to check
+            fingerprint: Cache key for this run
+
+        Returns:
+            True if the task is up to date and can be skipped
+        """
+        assert self.task_cache is not None
+        entry = self.task_cache.lookup(task.name, fingerprint)
+        if entry is None:
+            return False
+
+        try:
+            return self.task_cache.restore(entry, self._task_dir(task))
+        except OSError as e:
+            self.console.print(
+                f"[yellow]Warning: Cannot restore outputs of '{task.name}': {e}[/yellow]"
+            )
+            return False
+
+    def _record_in_cache(self, task: Task, fingerprint: str) -> None:
+        """
+        Record a successful run in the incremental cache.
+
+        Args:
+            task: Task that succeeded
+            fingerprint: Cache key computed before the run
+        """
+        assert self.task_cache is not None
+        try:
+            self.task_cache.record(task, fingerprint, self._task_dir(task))
+        except OSError as e:
+            self.console.print(f"[yellow]Warning: Cannot cache '{task.name}': {e}[/yellow]")
+
+    def _record_history(
+        self,
+        task_name: str,
+        duration: float,
+        exit_code: int,
+        fingerprint: Optional[str],
+        started_at: Optional[float],
+    ) -> None:
+        """
+        Append a finished run to the execution history.
+
+        Args:
+            task_name: Task (or matrix cell) that ran
+            duration: Wall-clock duration in seconds
+            exit_code: Exit code of the run
+            fingerprint: Incremental-cache key, if any
+            started_at: Start time (seconds since the epoch, default: now minus duration)
+        """
+        if self.history is None:
+            return
+        try:
+            self.history.record(task_name, duration, exit_code, fingerprint, started_at)
+        except (sqlite3.Error, OSError) as e:
+            self.console.print(
+                f"[yellow]Warning: Cannot record history of '{task_name}': {e}[/yellow]"
+            )
+
+    def _run_with_retry(self, task: Task, env: Mapping[str, str]) -> ExecutionResult:
+        """
+        Run a task command, retrying failures according to its retry policy.
+
+        Args:
+            task: Task to run
+            env: Environment variables
+
+        Returns:
+            Result of the last attempt
+        """
+        policy = RetryPolicy.from_task(task)
+        attempt = 0
+        delay: Optional[float] = None
+
+        while True:
+            result = self._run_command(task, env)
+            if not policy.should_retry(attempt, result):
+                return result
+
+            delay = policy.next_delay(attempt, delay)
+            attempt += 1
+            self.console.print(
+                f"[yellow]↻ Retrying {task.name} in {delay:.1f}s "
+                f"(exit code: {result.exit_code}, retry {attempt}/{policy.retries})[/yellow]"
+            )
+            self.events.emit(
+                "task_retry",
+                task=task.name,
+                attempt=attempt,
+                exit_code=result.exit_code,
+                delay=round(delay, 6),
+            )
+            time.sleep(delay)
+
+    def _run_command(self, task: Task, env: Mapping[str, str]) -> ExecutionResult:
         """
         Run task command.
 
@@ -271,7 +652,7 @@ class TaskRunner:
             )
 
         # Expand environment variables
-        cmd = self.env_manager.expand_command(cmd, env)
+        cmd = task.template(cmd).expand(env)
 
         # Validate EXPANDED command is also safe (defense in depth)
         if not ShellValidator.is_safe_command(cmd):
@@ -288,14 +669,40 @@ class TaskRunner:
         # Determine working directory
         cwd = task.cwd or str(Path.cwd())
 
+        # Wait until the machine has room for the task's cores/memory
+        queued_at = time.monotonic()
+        self.limiter.acquire(task.resources)
+        queue_wait = time.monotonic() - queued_at
+
+        def spawned(latency: float) -> None:
+            self.events.emit(
+                "command_start",
+                task=task.name,
+                command=task.name,
+                queue_wait=round(queue_wait, 6),
+                spawn_latency=round(latency, 6),
+            )
+
         # Execute command securely
+        start = time.monotonic()
         try:
-            result = self.secure_executor.execute(
-                cmd=cmd,
-                env=env,
-                cwd=cwd,
-                timeout=task.timeout,
-                shell=True,  # Required for pipes, redirects, etc.
+            try:
+                result = self.secure_executor.execute(
+                    cmd=cmd,
+                    env=env,
+                    cwd=cwd,
+                    timeout=task.timeout,
+                    shell=True,  # Required for pipes, redirects, etc.
+                    on_spawn=spawned,
+                )
+            finally:
+                self.limiter.release(task.resources)
+            self.events.emit(
+                "command_end",
+                task=task.name,
+                command=task.name,
+                exit_code=result.returncode,
+                duration=round(time.monotonic() - start, 6),
             )
 
             return ExecutionResult(
@@ -327,7 +734,7 @@ class TaskRunner:
                 error=e,
             )
 
-    def _run_parallel(self, task: Task, env: dict) -> ExecutionResult:
+    def _run_parallel(self, task: Task, env: Mapping[str, str]) -> ExecutionResult:
         """
         Run parallel tasks.
 
@@ -340,6 +747,8 @@ class TaskRunner:
         """
         # Validate and expand environment variables in all commands
         commands = []
+        # Sharded sub-tasks, to feed their file durations back after the run
+        sharded: List[Tuple[Task, List[Shard], List[CommandSpec]]] = []
         for task_name in task.parallel:
             # Look up the task to get its command
             if task_name not in self.config.tasks:
@@ -352,6 +761,36 @@ class TaskRunner:
 
             # Get the actual command from the task
             parallel_task = self.config.tasks[task_name]
+            # Sub-commands retry on their own policy, or on the group's
+            retry = RetryPolicy.from_task(parallel_task)
+            if not retry.enabled:
+                retry = RetryPolicy.from_task(task)
+            resources = {**task.resources, **parallel_task.resources}
+
+            # Matrix and sharded tasks run one command per cell or shard, as
+            # when run on their own
+            if parallel_task.is_matrix or parallel_task.is_sharded:
+                try:
+                    if parallel_task.is_matrix:
+                        specs = self._matrix_commands(parallel_task, env)
+                    elif self._task_dir(parallel_task) != self._task_dir(task):
+                        # Shard file paths are relative to the sharded task's directory
+                        raise ValueError(
+                            f"Sharded task '{task_name}' must run in the directory of '{task.name}'"
+                        )
+                    else:
+                        shards, specs = self._shard_commands(parallel_task, env)
+                        sharded.append((parallel_task, shards, specs))
+                except ValueError as e:
+                    return ExecutionResult(
+                        task_name=task.name, success=False, exit_code=-1, error=e
+                    )
+                for spec in specs:
+                    spec.retry = retry
+                    spec.resources = resources
+                commands.extend(specs)
+                continue
+
             cmd = parallel_task.cmd if parallel_task.cmd else task_name
 
             # Validate RAW command before expansion (security fix)
@@ -364,7 +803,7 @@ class TaskRunner:
                 )
 
             # Expand environment variables
-            expanded_cmd = self.env_manager.expand_command(cmd, env)
+            expanded_cmd = parallel_task.template(cmd).expand(env)
 
             # Validate EXPANDED command is also safe (defense in depth)
             if not ShellValidator.is_safe_command(expanded_cmd):
@@ -379,7 +818,21 @@ class TaskRunner:
 
             # Sanitize command
             sanitized_cmd = ShellValidator.sanitize_command(expanded_cmd)
-            commands.append(sanitized_cmd)
+            commands.append(
+                CommandSpec(
+                    cmd=sanitized_cmd,
+                    label=task_name,
+                    retry=retry,
+                    resources=resources,
+                )
+            )
+
+        # Start the slowest commands first when not all fit at once (shards
+        # already have estimates from their files)
+        unestimated = [spec for spec in commands if spec.expected_duration is None]
+        labels = [spec.name for spec in unestimated]
+        for spec, expected in zip(unestimated, self._expected_durations(labels)):
+            spec.expected_duration = expected
 
         # Determine working directory
         cwd = task.cwd or str(Path.cwd())
@@ -392,9 +845,17 @@ class TaskRunner:
                     env=env,
                     cwd=cwd,
                     timeout=task.timeout,
+                    task_name=task.name,
                 )
             )
 
+            for name, result in results.items():
+                self._record_history(name, result.duration, result.exit_code, None, None)
+            for sharded_task, shards, specs in sharded:
+                self._record_file_durations(
+                    sharded_task, shards, [results[spec.name] for spec in specs]
+                )
+
             # Aggregate results
             all_success = all(r.success for r in results.values())
             failed_cmds = [cmd for cmd, r in results.items() if not r.success]
@@ -421,3 +882,280 @@ class TaskRunner:
                 exit_code=-1,
                 error=e,
             )
+
+    def _run_matrix(self, task: Task, env: Mapping[str, str]) -> ExecutionResult:
+        """
+        Run a matrix task: its command once per matrix cell, in parallel.
+
+        Args:
+            task: Task with a matrix
+            env: Environment variables
+
+        Returns:
+            Aggregated execution result
+        """
+        try:
+            commands = self._matrix_commands(task, env)
+        except ValueError as e:
+            return ExecutionResult(task_name=task.name, success=False, exit_code=-1, error=e)
+
+        # Cells keep their own history, so slow cells start first next time
+        labels = [spec.name for spec in commands]
+        for spec, expected in zip(commands, self._expected_durations(labels)):
+            spec.expected_duration = expected
+
+        try:
+            results = asyncio.run(
+                self.parallel_executor.run_parallel(
+                    commands=commands,
+                    env=env,
+                    cwd=task.cwd or str(Path.cwd()),
+                    timeout=task.timeout,
+                    task_name=task.name,
+                )
+            )
+        except Exception as e:
+            return ExecutionResult(
+                task_name=task.name,
+                success=False,
+                exit_code=-1,
+                error=e,
+            )
+
+        for label, result in results.items():
+            self._record_history(label, result.duration, result.exit_code, None, None)
+
+        cells = [cell_label(cell) for cell in task.matrix_cells]
+        if not task.silent:
+            self._print_cell_results(
+                f"Matrix {task.name}", cells, [results[label] for label in labels]
+            )
+
+        failed = [cell for cell, label in zip(cells, labels) if not results[label].success]
+        if failed:
+            return ExecutionResult(
+                task_name=task.name,
+                success=False,
+                exit_code=-1,
+                error=ValueError(f"Matrix cells failed: {'; '.join(failed)}"),
+            )
+        return ExecutionResult(task_name=task.name, success=True, exit_code=0)
+
+    def _matrix_commands(self, task: Task, env: Mapping[str, str]) -> List[CommandSpec]:
+        """
+        Build the command of every matrix cell.
+
+        Each cell's values are set as environment variables on top of the
+        task environment and substituted into the command.
+
+        Args:
+            task: Task with a matrix
+            env: Environment variables
+
+        Returns:
+            Command of each cell, in matrix order
+
+        Raises:
+            ValueError: If the command is dangerous before or after expansion
+        """
+        # Validate RAW command before expansion (security fix)
+        if not ShellValidator.is_safe_command(task.cmd):
+            raise ValueError(f"Dangerous command detected (before expansion): {task.cmd}")
+
+        template = task.template(task.cmd)
+        retry = RetryPolicy.from_task(task)
+        commands = []
+        for cell in task.matrix_cells:
+            cell_env = with_layer(env, cell)
+            expanded_cmd = template.expand(cell_env)
+
+            # Validate EXPANDED command is also safe (defense in depth)
+            if not ShellValidator.is_safe_command(expanded_cmd):
+                raise ValueError(f"Dangerous command detected (after expansion): {expanded_cmd}")
+
+            commands.append(
+                CommandSpec(
+                    cmd=ShellValidator.sanitize_command(expanded_cmd),
+                    label=f"{task.name}[{cell_label(cell)}]",
+                    retry=retry,
+                    env=cell_env,
+                    resources=task.resources,
+                )
+            )
+        return commands
+
+    def _print_cell_results(
+        self, heading: str, descriptions: List[str], results: List[ExecutionResult]
+    ) -> None:
+        """
+        Print the outcome of every matrix cell or shard.
+
+        Args:
+            heading: Summary line prefix (e.g. "Matrix test")
+            descriptions: What each command ran, in launch-definition order
+            results: Result of each command, in the same order
+        """
+        passed = sum(1 for result in results if result.success)
+        self.console.print(f"[cyan]{escape(heading)}:[/cyan] {passed}/{len(results)} passed")
+        for description, result in zip(descriptions, results):
+            if result.success:
+                self.console.print(
+                    f"  [green]✓[/green] {escape(description)} ({result.duration:.2f}s)"
+                )
+            else:
+                self.console.print(
+                    f"  [red]✗[/red] {escape(description)} "
+                    f"(exit code: {result.exit_code}, {result.duration:.2f}s)"
+                )
+
+    def _run_sharded(self, task: Task, env: Mapping[str, str]) -> ExecutionResult:
+        """
+        Run a sharded task: its command once per shard of files, in parallel.
+
+        Files matching ``shard_files`` are balanced across ``shards`` by their
+        recorded durations; each shard gets its files in ${TASKX_SHARD_FILES}.
+
+        Args:
+            task: Task with shards
+            env: Environment variables
+
+        Returns:
+            Aggregated execution result
+        """
+        try:
+            shards, commands = self._shard_commands(task, env)
+        except ValueError as e:
+            return ExecutionResult(task_name=task.name, success=False, exit_code=-1, error=e)
+
+        try:
+            results = asyncio.run(
+                self.parallel_executor.run_parallel(
+                    commands=commands,
+                    env=env,
+                    cwd=task.cwd or str(Path.cwd()),
+                    timeout=task.timeout,
+                    task_name=task.name,
+                )
+            )
+        except Exception as e:
+            return ExecutionResult(
+                task_name=task.name,
+                success=False,
+                exit_code=-1,
+                error=e,
+            )
+
+        shard_results = [results[spec.name] for spec in commands]
+        self._record_file_durations(task, shards, shard_results)
+
+        if not task.silent:
+            self._print_cell_results(
+                f"Shards {task.name}",
+                [
+                    f"shard {s.index}/{len(shards)}: {len(s.files)} file"
+                    + ("s" if len(s.files) != 1 else "")
+                    for s in shards
+                ],
+                shard_results,
+            )
+
+        failed = [str(s.index) for s, r in zip(shards, shard_results) if not r.success]
+        if failed:
+            return ExecutionResult(
+                task_name=task.name,
+                success=False,
+                exit_code=-1,
+                error=ValueError(f"Shards failed: {', '.join(failed)} of {len(shards)}"),
+            )
+        return ExecutionResult(task_name=task.name, success=True, exit_code=0)
+
+    def _shard_commands(
+        self, task: Task, env: Mapping[str, str]
+    ) -> Tuple[List[Shard], List[CommandSpec]]:
+        """
+        Split a sharded task's files into shards and build each shard's command.
+
+        Args:
+            task: Task with shards
+            env: Environment variables
+
+        Returns:
+            Shards and the command of each shard, in shard order
+
+        Raises:
+            ValueError: If no files match, or the command is dangerous before
+                or after expansion
+        """
+        # Validate RAW command before expansion (security fix)
+        if not ShellValidator.is_safe_command(task.cmd):
+            raise ValueError(f"Dangerous command detected (before expansion): {task.cmd}")
+
+        root = self._task_dir(task)
+        files = collect_files(task.shard_files, root)
+        if not files:
+            raise ValueError(f"No files match shard_files: {', '.join(task.shard_files)}")
+
+        durations: Dict[str, float] = {}
+        if self.history is not None:
+            with contextlib.suppress(sqlite3.Error, OSError):
+                durations = self.history.file_durations(task.name)
+        shards = partition(files, task.shards, durations, root)
+
+        template = task.template(task.cmd)
+        retry = RetryPolicy.from_task(task)
+        commands = []
+        for shard in shards:
+            shard_env = with_layer(
+                env,
+                {
+                    SHARD_FILES_VAR: " ".join(shard.files),
+                    SHARD_INDEX_VAR: str(shard.index),
+                    SHARD_COUNT_VAR: str(len(shards)),
+                },
+            )
+            # One quoted argument per file instead of a single quoted string
+            quoted_files = " ".join(shlex.quote(path) for path in shard.files)
+            expanded_cmd = template.expand(shard_env, {SHARD_FILES_VAR: quoted_files})
+
+            # Validate EXPANDED command is also safe (defense in depth)
+            if not ShellValidator.is_safe_command(expanded_cmd):
+                raise ValueError(f"Dangerous command detected (after expansion): {expanded_cmd}")
+
+            commands.append(
+                CommandSpec(
+                    cmd=ShellValidator.sanitize_command(expanded_cmd),
+                    label=f"{task.name}[shard={shard.index}]",
+                    retry=retry,
+                    env=shard_env,
+                    expected_duration=shard.expected if durations else None,
+                    resources=task.resources,
+                )
+            )
+        return shards, commands
+
+    def _record_file_durations(
+        self, task: Task, shards: List[Shard], results: List[ExecutionResult]
+    ) -> None:
+        """
+        Feed the measured shard durations back into the per-file estimates.
+
+        Args:
+            task: Sharded task
+            shards: Shards that ran
+            results: Result of each shard
+        """
+        if self.history is None:
+            return
+        durations: Dict[str, float] = {}
+        for shard, result in zip(shards, results):
+            # Failed shards may have stopped early
+            if result.success:
+                durations.update(shard.attribute(result.duration))
+        if not durations:
+            return
+        try:
+            self.history.record_file_durations(task.name, durations)
+        except (sqlite3.Error, OSError) as e:
+            self.console.print(
+                f"[yellow]Warning: Cannot record file durations of '{task.name}': {e}[/yellow]"
+            )
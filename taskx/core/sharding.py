@@ -0,0 +1,134 @@
+"""
+Splitting a task's files into balanced shards.
+
+A sharded task runs its command once per shard, in parallel, with the
+shard's files in ``${TASKX_SHARD_FILES}``::
+
+    test = { cmd = "pytest ${TASKX_SHARD_FILES}", shard_files = ["tests/**/test_*.py"], shards = 4 }
+
+Files are assigned longest-first to the least loaded shard, weighted by
+their recorded durations. Files without history count as the median known
+duration; without any history, file sizes stand in for durations. After a
+run, each shard's duration is split across its files in proportion to their
+weights and fed back into the history.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Variables set for every shard (TASKX_SHARD_FILES is also substituted unquoted
+# into the command, one shell-quoted argument per file)
+SHARD_FILES_VAR = "TASKX_SHARD_FILES"
+SHARD_INDEX_VAR = "TASKX_SHARD"
+SHARD_COUNT_VAR = "TASKX_SHARD_COUNT"
+
+
+@dataclass
+class Shard:
+    """
+    Files run together by one command.
+
+    Attributes:
+        index: Shard number, starting at 1
+        files: Paths relative to the task directory, sorted
+        weights: Estimated duration (or size, without history) of each file
+        expected: Sum of the weights
+    """
+
+    index: int
+    files: List[str] = field(default_factory=list)
+    weights: Dict[str, float] = field(default_factory=dict)
+    expected: float = 0.0
+
+    def attribute(self, duration: float) -> Dict[str, float]:
+        """
+        Split a measured shard duration across its files.
+
+        Args:
+            duration: Wall-clock duration of the shard in seconds
+
+        Returns:
+            Estimated duration of each file
+        """
+        if not self.files:
+            return {}
+        if self.expected <= 0:
+            return {path: duration / len(self.files) for path in self.files}
+        return {path: duration * self.weights[path] / self.expected for path in self.files}
+
+
+def collect_files(patterns: List[str], root: Path) -> List[str]:
+    """
+    Find the files matching glob patterns.
+
+    Args:
+        patterns: Glob patterns relative to root (``**`` matches directories)
+        root: Directory the patterns are relative to
+
+    Returns:
+        Sorted relative POSIX paths of the matching files
+    """
+    found = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_file():
+                found.add(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def partition(
+    files: List[str],
+    shards: int,
+    durations: Optional[Dict[str, float]] = None,
+    root: Optional[Path] = None,
+) -> List[Shard]:
+    """
+    Split files into balanced shards (longest processing time first).
+
+    Args:
+        files: Files to split
+        shards: Maximum number of shards (fewer if there are fewer files)
+        durations: Recorded duration per file
+        root: Directory files are relative to (for the size fallback)
+
+    Returns:
+        Non-empty shards, numbered from 1
+    """
+    weights = _weights(files, durations or {}, root)
+    count = max(1, min(shards, len(files)))
+    result = [Shard(index=i + 1) for i in range(count)]
+
+    # (load, index) heap: ties go to the lower shard number
+    heap = [(0.0, i) for i in range(count)]
+    for path in sorted(files, key=lambda p: (-weights[p], p)):
+        load, i = heapq.heappop(heap)
+        shard = result[i]
+        shard.files.append(path)
+        shard.weights[path] = weights[path]
+        shard.expected = load + weights[path]
+        heapq.heappush(heap, (shard.expected, i))
+
+    for shard in result:
+        shard.files.sort()
+    return [shard for shard in result if shard.files]
+
+
+def _weights(
+    files: List[str], durations: Dict[str, float], root: Optional[Path]
+) -> Dict[str, float]:
+    """Estimated cost of each file."""
+    known = sorted(durations[path] for path in files if path in durations)
+    if known:
+        median = known[len(known) // 2]
+        return {path: durations.get(path, median) for path in files}
+
+    # No history yet: larger test files tend to take longer
+    weights = {}
+    for path in files:
+        try:
+            weights[path] = float(max(1, (root / path).stat().st_size)) if root else 1.0
+        except OSError:
+            weights[path] = 1.0
+    return weights
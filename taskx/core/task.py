@@ -4,7 +4,12 @@ Task model and related data structures.
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Union
+
+from taskx.core.matrix import MatrixCell, expand_matrix
+from taskx.core.resources import CPUS, MEMORY, Resources, parse_memory, pool_resource
+from taskx.core.retry import BACKOFF_FIXED, BACKOFF_STRATEGIES
+from taskx.utils.shell import CommandTemplate, compile_template
 
 
 @dataclass
@@ -21,23 +26,38 @@ class Task:
         description: Human-readable description
         depends: List of task names that must run before this task
         parallel: List of commands to run in parallel (mutually exclusive with cmd)
+        matrix: Variable name -> values; cmd runs once per combination in parallel
+        shards: Number of parallel shards shard_files are split into
+        shard_files: Glob patterns of the files passed to cmd as ${TASKX_SHARD_FILES}
         env: Task-specific environment variables
         cwd: Working directory for command execution
         shell: Explicitly specify shell to use
         timeout: Maximum execution time in seconds
+        cpus: Cores each of the task's commands occupies while running
+        mem: Memory each of the task's commands needs: bytes, or a size such as
+            "2G" (normalized to bytes)
+        pool: Named pool limiting how many commands using it run at the same time
         retry: Number of retry attempts on failure
-        retry_delay: Delay between retries in seconds
+        retry_delay: Delay between retries in seconds (base delay for backoff)
+        retry_backoff: Backoff strategy (fixed, exponential, decorrelated-jitter)
+        retry_max_delay: Upper bound for a single retry delay in seconds
+        retry_on: Exit codes that trigger a retry (default: any failure)
         on_error: Command to run if task fails
         on_success: Command to run if task succeeds
         pre: Command to run before main task
         post: Command to run after main task
         watch: File patterns to watch for auto-reload
+        inputs: File patterns whose contents make up the task's cache key
+        outputs: File patterns produced by the task, restored on cache hits
         prompt: Variable name to prompt user for
         confirm: Confirmation message before execution
         if_platform: Only run on specific platforms (windows, darwin, linux)
         if_env: Only run if environment variable is set
         silent: Suppress output
         ignore_errors: Continue even if task fails
+        templates: Parsed cmd/parallel commands (derived, not configurable)
+        required_vars: Variables referenced by cmd/parallel commands (derived)
+        matrix_cells: Expanded matrix combinations (derived)
     """
 
     name: str
@@ -45,17 +65,28 @@ class Task:
     description: Optional[str] = None
     depends: List[str] = field(default_factory=list)
     parallel: List[str] = field(default_factory=list)
+    matrix: Dict[str, Any] = field(default_factory=dict)
+    shards: int = 0
+    shard_files: List[str] = field(default_factory=list)
     env: Dict[str, str] = field(default_factory=dict)
     cwd: Optional[str] = None
     shell: Optional[str] = None
     timeout: Optional[int] = None
+    cpus: float = 0
+    mem: Union[int, str] = 0
+    pool: Optional[str] = None
     retry: int = 0
-    retry_delay: int = 1
+    retry_delay: float = 1
+    retry_backoff: str = BACKOFF_FIXED
+    retry_max_delay: Optional[float] = None
+    retry_on: List[int] = field(default_factory=list)
     on_error: Optional[str] = None
     on_success: Optional[str] = None
     pre: Optional[str] = None
     post: Optional[str] = None
     watch: List[str] = field(default_factory=list)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
     aliases: List[str] = field(default_factory=list)  # Per-task aliases
     prompt: Optional[str] = None
     confirm: Optional[str] = None
@@ -63,6 +94,15 @@ class Task:
     if_env: Optional[str] = None
     silent: bool = False
     ignore_errors: bool = False
+    templates: Dict[str, CommandTemplate] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    required_vars: FrozenSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
+    matrix_cells: List[MatrixCell] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """Validate task definition after initialization."""
@@ -75,24 +115,107 @@ class Task:
         if self.cmd and self.parallel:
             raise ValueError(f"Task '{self.name}' cannot have both 'cmd' and 'parallel' defined")
 
+        if self.matrix:
+            if self.parallel:
+                raise ValueError(f"Task '{self.name}' cannot have both 'matrix' and 'parallel'")
+            try:
+                self.matrix_cells = expand_matrix(self.matrix)
+            except ValueError as e:
+                raise ValueError(f"Task '{self.name}' {e}") from e
+
+        if not isinstance(self.shards, int) or self.shards < 0:
+            raise ValueError(f"Task '{self.name}' shards must be a non-negative integer")
+
+        if bool(self.shards) != bool(self.shard_files):
+            raise ValueError(f"Task '{self.name}' needs both 'shards' and 'shard_files'")
+
+        if self.shards and (self.parallel or self.matrix):
+            raise ValueError(
+                f"Task '{self.name}' cannot combine 'shards' with 'parallel' or 'matrix'"
+            )
+
         if self.timeout and self.timeout <= 0:
             raise ValueError(f"Task '{self.name}' timeout must be positive")
 
+        if isinstance(self.cpus, bool) or not isinstance(self.cpus, (int, float)) or self.cpus < 0:
+            raise ValueError(f"Task '{self.name}' cpus must be a non-negative number")
+
+        try:
+            self.mem = parse_memory(self.mem)
+        except ValueError as e:
+            raise ValueError(f"Task '{self.name}' mem: {e}") from e
+
+        if self.pool is not None and (not isinstance(self.pool, str) or not self.pool):
+            raise ValueError(f"Task '{self.name}' pool must be a non-empty name")
+
         if self.retry < 0:
             raise ValueError(f"Task '{self.name}' retry count cannot be negative")
 
         if self.retry_delay < 0:
             raise ValueError(f"Task '{self.name}' retry_delay cannot be negative")
 
+        if self.retry_backoff not in BACKOFF_STRATEGIES:
+            raise ValueError(
+                f"Task '{self.name}' retry_backoff must be one of: {', '.join(BACKOFF_STRATEGIES)}"
+            )
+
+        if self.retry_max_delay is not None and self.retry_max_delay < 0:
+            raise ValueError(f"Task '{self.name}' retry_max_delay cannot be negative")
+
+        if not all(isinstance(code, int) for code in self.retry_on):
+            raise ValueError(f"Task '{self.name}' retry_on must be a list of exit codes")
+
         # Normalize cwd to Path
         if self.cwd:
             self.cwd = str(Path(self.cwd))
 
+        # Parse commands once; expanding them is then a lookup-and-join
+        commands = [self.cmd] if self.cmd else self.parallel
+        self.templates = {command: compile_template(command) for command in commands}
+        self.required_vars = frozenset(
+            name for template in self.templates.values() for name in template.variables
+        )
+
+    def template(self, command: str) -> CommandTemplate:
+        """
+        Get the parsed template of one of the task's commands.
+
+        Args:
+            command: Raw command (the task's cmd or a parallel entry)
+
+        Returns:
+            Parsed template (parsed on demand for other commands)
+        """
+        template = self.templates.get(command)
+        return template if template is not None else compile_template(command)
+
     @property
     def is_parallel(self) -> bool:
         """Check if this is a parallel task."""
         return bool(self.parallel)
 
+    @property
+    def is_matrix(self) -> bool:
+        """Check if this task runs once per matrix cell."""
+        return bool(self.matrix_cells)
+
+    @property
+    def is_sharded(self) -> bool:
+        """Check if this task splits files across parallel shards."""
+        return self.shards > 0
+
+    @property
+    def resources(self) -> Resources:
+        """Resources each of the task's commands needs while running."""
+        resources: Resources = {}
+        if self.cpus:
+            resources[CPUS] = float(self.cpus)
+        if self.mem:
+            resources[MEMORY] = float(self.mem)
+        if self.pool:
+            resources[pool_resource(self.pool)] = 1.0
+        return resources
+
     @property
     def has_dependencies(self) -> bool:
         """Check if task has dependencies."""
@@ -108,6 +231,11 @@ class Task:
         """Check if task has watch patterns."""
         return bool(self.watch)
 
+    @property
+    def is_cacheable(self) -> bool:
+        """Check if task declares inputs for up-to-date checks."""
+        return bool(self.inputs)
+
     def should_run_on_platform(self, current_platform: str) -> bool:
         """
         Check if task should run on the current platform.
@@ -122,7 +250,7 @@ class Task:
             return True
         return current_platform.lower() == self.if_platform.lower()
 
-    def should_run_with_env(self, env_vars: Dict[str, str]) -> bool:
+    def should_run_with_env(self, env_vars: Mapping[str, str]) -> bool:
         """
         Check if task should run given environment variables.
 
@@ -1,10 +1,27 @@
 """
 Task execution modules.
 
-Provides parallel execution and watch mode capabilities.
+Provides parallel execution, dependency scheduling and watch mode capabilities.
 """
 
-from taskx.execution.parallel import ParallelExecutor
-from taskx.execution.watcher import FileWatcher, watch_task_sync
+from typing import Any
 
-__all__ = ["ParallelExecutor", "FileWatcher", "watch_task_sync"]
+__all__ = ["ParallelExecutor", "DagScheduler", "FileWatcher", "watch_task_sync"]
+
+# Exported name -> defining module; imported on first access so that light
+# submodules (e.g. taskx.execution.events) don't drag in asyncio and watchfiles
+_EXPORTS = {
+    "ParallelExecutor": "taskx.execution.parallel",
+    "DagScheduler": "taskx.execution.scheduler",
+    "FileWatcher": "taskx.execution.watcher",
+    "watch_task_sync": "taskx.execution.watcher",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import exported classes and functions on first use."""
+    if name in _EXPORTS:
+        import importlib
+
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'taskx.execution' has no attribute '{name}'")
@@ -0,0 +1,599 @@
+"""
+Background daemon that keeps taskx warm between runs.
+
+``taskx daemon start`` launches a server on a Unix socket next to the
+project's configuration (``.taskx/daemon.sock``). While it runs, ``taskx run``
+hands its invocation to the daemon instead of importing the task runner and
+parsing the configuration itself:
+
+- the client sends its arguments, working directory and environment, along
+  with its stdin/stdout/stderr file descriptors
+- the daemon forks a child from its warm state (modules imported, config
+  parsed and validated, security rules compiled) and runs the invocation
+  there, writing straight to the client's terminal
+- the child's exit code is sent back and becomes the client's exit code;
+  Ctrl+C in the client interrupts the child
+
+The configuration is re-read when pyproject.toml or .env change. Set
+``TASKX_NO_DAEMON=1`` to bypass a running daemon.
+
+Only available where Unix sockets and ``fork`` are (Linux, macOS).
+"""
+
+import array
+import contextlib
+import errno
+import hashlib
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from taskx import __version__
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Bump when requests or replies change shape
+PROTOCOL_VERSION = 2
+
+# Environment variable disabling the client side
+DISABLE_VAR = "TASKX_NO_DAEMON"
+
+# ctx.obj keys set for invocations running inside the daemon
+DAEMON_CHILD = "daemon_child"
+PRELOADED_CONFIG = "config"
+
+# Longest socket path accepted by every platform (sun_path is 104-108 bytes)
+_MAX_SOCKET_PATH = 100
+
+# Length prefix of every message
+_HEADER = struct.Struct("!I")
+
+# Messages larger than this are rejected (requests carry the environment)
+_MAX_MESSAGE = 16 * 1024 * 1024
+
+# stdin, stdout and stderr of the client
+_CLIENT_FDS = (0, 1, 2)
+
+# How long a client may take to send its request
+_REQUEST_TIMEOUT = 5.0
+
+
+class DaemonError(Exception):
+    """Raised when talking to the daemon fails."""
+
+
+def supported() -> bool:
+    """Check whether the platform has what the daemon needs."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork") and hasattr(socket, "SCM_RIGHTS")
+
+
+def socket_path(config_path: Path) -> Path:
+    """
+    Get the socket of the daemon serving a configuration.
+
+    Args:
+        config_path: Path to pyproject.toml
+
+    Returns:
+        ``.taskx/daemon.sock`` in the project, or a per-user path in the
+        temporary directory when that is too long for a Unix socket
+    """
+    project = config_path.resolve().parent
+    path = project / ".taskx" / "daemon.sock"
+    if len(str(path)) <= _MAX_SOCKET_PATH:
+        return path
+
+    import tempfile
+
+    digest = hashlib.sha256(str(project).encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"taskx-{os.getuid()}-{digest}.sock"
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any], fds: Sequence[int] = ()) -> None:
+    """
+    Send a length-prefixed JSON message, optionally passing file descriptors.
+
+    Args:
+        sock: Connected Unix socket
+        message: JSON-serializable message
+        fds: File descriptors sent along with the message
+    """
+    data = json.dumps(message).encode()
+    data = _HEADER.pack(len(data)) + data
+    if fds:
+        ancillary = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds).tobytes())]
+        sent = sock.sendmsg([data], ancillary)
+        data = data[sent:]
+    sock.sendall(data)
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    """
+    Receive a message sent with ``send_message``.
+
+    Args:
+        sock: Connected Unix socket
+
+    Returns:
+        The message and the file descriptors passed with it
+
+    Raises:
+        DaemonError: If the peer closed the connection or sent garbage
+    """
+    fds: List[int] = []
+    header = b""
+    ancillary_size = socket.CMSG_SPACE(len(_CLIENT_FDS) * array.array("i").itemsize)
+    while len(header) < _HEADER.size:
+        chunk, ancillary, _, _ = sock.recvmsg(_HEADER.size - len(header), ancillary_size)
+        for level, kind, payload in ancillary:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                received = array.array("i")
+                received.frombytes(payload[: len(payload) - len(payload) % received.itemsize])
+                fds.extend(received)
+        if not chunk:
+            _close_all(fds)
+            raise DaemonError("connection closed")
+        header += chunk
+
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_MESSAGE:
+        _close_all(fds)
+        raise DaemonError(f"message too large ({size} bytes)")
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            _close_all(fds)
+            raise DaemonError("connection closed")
+        data += chunk
+    try:
+        message = json.loads(data)
+    except ValueError as e:
+        _close_all(fds)
+        raise DaemonError(f"invalid message: {e}") from e
+    return message, fds
+
+
+def request(config_path: Path, message: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+    """
+    Send a control request (``status``, ``stop``) to a running daemon.
+
+    Args:
+        config_path: Path to pyproject.toml
+        message: Request
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        The daemon's reply
+
+    Raises:
+        DaemonError: If no daemon is running or it doesn't answer
+    """
+    try:
+        with _connect(socket_path(config_path)) as sock:
+            sock.settimeout(timeout)
+            send_message(sock, dict(message, version=PROTOCOL_VERSION))
+            return recv_message(sock)[0]
+    except OSError as e:
+        raise DaemonError(str(e)) from e
+
+
+def forward_run(config_path: Path, argv: List[str]) -> Optional[int]:
+    """
+    Run a CLI invocation on the project's daemon, if one is running.
+
+    Args:
+        config_path: Path to pyproject.toml
+        argv: Arguments of the invocation (without the program name)
+
+    Returns:
+        Exit code of the invocation, or None if it must run locally (no
+        daemon, daemon of another taskx version or configuration file, or
+        daemon disabled)
+    """
+    if os.environ.get(DISABLE_VAR) or not supported():
+        return None
+    path = socket_path(config_path)
+    if not path.exists():
+        return None
+    try:
+        sock = _connect(path)
+    except OSError:
+        # Stale socket of a daemon that is gone
+        return None
+
+    with sock:
+        try:
+            send_message(
+                sock,
+                {
+                    "op": "run",
+                    "version": PROTOCOL_VERSION,
+                    "taskx": __version__,
+                    "config": str(config_path.resolve()),
+                    "argv": argv,
+                    "cwd": os.getcwd(),
+                    "env": dict(os.environ),
+                },
+                fds=_CLIENT_FDS,
+            )
+        except OSError:
+            return None
+
+        while True:
+            try:
+                reply, _ = recv_message(sock)
+                break
+            except KeyboardInterrupt:
+                # Ctrl+C reached the client only: pass it on and keep waiting
+                try:
+                    send_message(sock, {"op": "interrupt"})
+                except OSError:
+                    return 130
+            except (DaemonError, OSError) as e:
+                from rich.console import Console
+
+                Console(stderr=True).print(f"[red]✗ Lost connection to daemon: {e}[/red]")
+                return 1
+
+    if "exit" not in reply:
+        # Rejected before anything ran (e.g. version mismatch)
+        return None
+    return int(reply["exit"])
+
+
+class DaemonServer:
+    """
+    Serves ``taskx`` invocations for one project from a warm process.
+
+    Single-threaded: a selector loop accepts requests, forks one child per
+    run and reports each child's exit code when it is reaped (SIGCHLD wakes
+    the loop). Children inherit the parsed configuration; the parent re-reads
+    it before a run when pyproject.toml or .env changed.
+    """
+
+    def __init__(self, config_path: Path, console: Optional["Console"] = None):
+        """
+        Initialize daemon.
+
+        Args:
+            config_path: Path to pyproject.toml
+            console: Rich console for the daemon's log
+        """
+        from rich.console import Console
+
+        self.config_path = config_path.resolve()
+        self.console = console or Console()
+        self.socket_path = socket_path(self.config_path)
+        self.config: Any = None
+        self.started_at = time.time()
+        self.runs = 0
+        self.reloads = 0
+
+        self._signature: Optional[Tuple[Any, ...]] = None
+        self._children: Dict[int, socket.socket] = {}
+        self._stopping = False
+        self._selector = selectors.DefaultSelector()
+        self._listener: Optional[socket.socket] = None
+        self._wakeup: Optional[Tuple[int, int]] = None
+
+    def serve(self) -> None:
+        """
+        Listen for requests until stopped (``taskx daemon stop``, SIGTERM or Ctrl+C).
+
+        Raises:
+            DaemonError: If another daemon already serves this project
+        """
+        self._refresh()
+        self._listen()
+        self._install_signals()
+        try:
+            while not self._stopping or self._children:
+                for key, _ in self._selector.select():
+                    key.data(key.fileobj)
+        finally:
+            self._close_listener()
+            signal.set_wakeup_fd(-1)
+
+    def _listen(self) -> None:
+        """Bind the socket, readable and writable by the current user only."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            try:
+                _connect(self.socket_path).close()
+            except OSError:
+                self.socket_path.unlink()
+            else:
+                raise DaemonError(f"A daemon is already running on {self.socket_path}")
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            listener.bind(str(self.socket_path))
+        finally:
+            os.umask(umask)
+        listener.listen(64)
+        listener.setblocking(False)
+        self._listener = listener
+        self._selector.register(listener, selectors.EVENT_READ, self._accept)
+
+    def _install_signals(self) -> None:
+        """Wake the loop on SIGCHLD and stop it on SIGTERM/SIGINT."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self._wakeup = (read_fd, write_fd)
+        signal.set_wakeup_fd(write_fd)
+        self._selector.register(read_fd, selectors.EVENT_READ, self._on_signal)
+
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self._stop())
+
+    def _accept(self, listener: Any) -> None:
+        """Read one request and answer or start it."""
+        try:
+            conn, _ = listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(True)
+        conn.settimeout(_REQUEST_TIMEOUT)
+
+        fds: List[int] = []
+        try:
+            if not self._same_user(conn):
+                raise DaemonError("connection from another user")
+            message, fds = recv_message(conn)
+            self._handle(conn, message, fds)
+        except (DaemonError, OSError) as e:
+            self._log(f"Rejected request: {e}")
+            conn.close()
+        finally:
+            _close_all(fds)
+
+    def _handle(self, conn: socket.socket, message: Dict[str, Any], fds: List[int]) -> None:
+        """Dispatch a request; the connection is closed unless a run keeps it."""
+        op = message.get("op")
+        if message.get("version") != PROTOCOL_VERSION:
+            self._reply(conn, {"error": "protocol version mismatch"})
+        elif op == "status":
+            self._reply(conn, self._status())
+        elif op == "stop":
+            self._reply(conn, {"stopping": True})
+            self._stop()
+        elif op == "run" and message.get("taskx") != __version__:
+            self._reply(conn, {"error": f"daemon runs taskx {__version__}"})
+        elif op == "run" and message.get("config") != str(self.config_path):
+            # Another configuration file of the project (--config): run it locally
+            self._reply(conn, {"error": f"daemon serves {self.config_path}"})
+        elif op == "run" and len(fds) == len(_CLIENT_FDS) and not self._stopping:
+            self._start_run(conn, message, fds)
+        else:
+            self._reply(conn, {"error": f"unsupported request: {op}"})
+
+    def _start_run(self, conn: socket.socket, message: Dict[str, Any], fds: List[int]) -> None:
+        """Fork a child running the invocation on the client's terminal."""
+        self._refresh()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the forked child
+            self._run_child(message, fds)
+
+        self.runs += 1
+        self._children[pid] = conn
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, self._on_client)
+        # A child that exited before SIGCHLD was handled is reaped right away
+        self._reap()
+
+    def _run_child(self, message: Dict[str, Any], fds: List[int]) -> None:
+        """Become the client's process and run its invocation (never returns)."""
+        code = 1
+        try:
+            self._selector.close()
+            self._close_listener(unlink=False)
+            for child_conn in self._children.values():
+                child_conn.close()
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+            for fd, target in zip(fds, _CLIENT_FDS):
+                os.dup2(fd, target)
+            _close_all(fds)
+            os.chdir(message["cwd"])
+            os.environ.clear()
+            os.environ.update(message["env"])
+
+            from taskx.cli.main import cli
+
+            obj = {DAEMON_CHILD: True, PRELOADED_CONFIG: self.config}
+            try:
+                # Always ends with SystemExit (standalone mode)
+                cli.main(args=message["argv"], prog_name="taskx", obj=obj)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except KeyboardInterrupt:
+            code = 130
+        except BaseException as e:  # noqa: BLE001 - report anything on the client
+            from rich.console import Console
+
+            Console(stderr=True).print(f"[red]✗ taskx daemon: {e}[/red]")
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+    def _on_client(self, conn: Any) -> None:
+        """Forward Ctrl+C from a client to its child (or stop it if the client left)."""
+        pid = next((pid for pid, c in self._children.items() if c is conn), None)
+        try:
+            message, fds = recv_message(conn)
+            _close_all(fds)
+            interrupt = message.get("op") == "interrupt"
+        except (DaemonError, OSError):
+            # Client is gone: nobody waits for the run any more
+            self._selector.unregister(conn)
+            interrupt = True
+        if pid is not None and interrupt:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGINT)
+
+    def _on_signal(self, read_fd: Any) -> None:
+        """Drain the wakeup pipe and reap finished children."""
+        try:
+            while os.read(read_fd, 512):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        self._reap()
+
+    def _reap(self) -> None:
+        """Send the exit code of every finished child to its client."""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = self._children.pop(pid, None)
+            if conn is None:
+                continue
+            code = 128 + os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+            with contextlib.suppress(KeyError, ValueError):
+                self._selector.unregister(conn)
+            conn.setblocking(True)
+            self._reply(conn, {"exit": code})
+
+    def _reply(self, conn: socket.socket, message: Dict[str, Any]) -> None:
+        """Send a final reply and close the connection."""
+        try:
+            send_message(conn, message)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def _refresh(self) -> None:
+        """Re-read the configuration if pyproject.toml or .env changed."""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+
+        from rich.console import Console
+
+        from taskx.core.config import Config, ConfigError
+        from taskx.core.runner import TaskRunner
+
+        if self._signature is not None:
+            self.reloads += 1
+            self._log("Configuration changed, reloading")
+        self._signature = signature
+        try:
+            config = Config(self.config_path)
+            config.load()
+            # Builds the executors once so compiled rules and templates are cached
+            TaskRunner(config, console=Console(quiet=True))
+        except (OSError, ConfigError, ValueError) as e:
+            # Children load it themselves and report the error to the client
+            self._log(f"Cannot load configuration: {e}")
+            self.config = None
+        else:
+            self.config = config
+
+    def _current_signature(self) -> Tuple[Any, ...]:
+        """Modification state of the files the warm state depends on."""
+        signature: List[Optional[Tuple[int, int, int]]] = []
+        for path in (self.config_path, self.config_path.parent / ".env"):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _status(self) -> Dict[str, Any]:
+        """Information shown by ``taskx daemon status``."""
+        return {
+            "pid": os.getpid(),
+            "config": str(self.config_path),
+            "taskx": __version__,
+            "started_at": self.started_at,
+            "runs": self.runs,
+            "running": len(self._children),
+            "reloads": self.reloads,
+            "config_ok": self.config is not None,
+        }
+
+    def _stop(self) -> None:
+        """Stop accepting requests; running children are waited for."""
+        if not self._stopping:
+            self._stopping = True
+            self._close_listener()
+
+    def _close_listener(self, unlink: bool = True) -> None:
+        """Close (and remove) the listening socket."""
+        if self._listener is None:
+            return
+        with contextlib.suppress(KeyError, ValueError, RuntimeError):
+            self._selector.unregister(self._listener)
+        self._listener.close()
+        self._listener = None
+        if unlink:
+            with contextlib.suppress(OSError):
+                self.socket_path.unlink()
+
+    @staticmethod
+    def _same_user(conn: socket.socket) -> bool:
+        """Check the peer's user where the platform reports it (Linux)."""
+        if not hasattr(socket, "SO_PEERCRED"):
+            # The socket file is only accessible to its owner
+            return True
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return bool(uid == os.getuid())
+
+    def _log(self, message: str) -> None:
+        """Write a line to the daemon's output (its log file when started in background)."""
+        self.console.print(
+            f"[{time.strftime('%H:%M:%S')}] {message}",
+            markup=False,
+            highlight=False,
+            soft_wrap=True,
+        )
+
+
+def _connect(path: Path) -> socket.socket:
+    """Connect to a daemon socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _close_all(fds: List[int]) -> None:
+    """Close received file descriptors, ignoring ones already closed."""
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError as e:
+            if e.errno != errno.EBADF:
+                raise
+    fds.clear()
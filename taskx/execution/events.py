@@ -0,0 +1,183 @@
+"""
+Machine-readable run events.
+
+The runner and the parallel executor report what they do (tasks starting
+and ending, hooks, process spawns, queue waits) to an event sink. The
+default sink discards everything; ``NdjsonEventSink`` writes one JSON object
+per line for CI profiling and dashboards.
+
+Every event carries ``ts`` (seconds since the epoch) and ``event``:
+
+- ``run_start`` / ``run_end``: ``task``, ``tasks`` / ``success``, ``duration``
+- ``task_start`` / ``task_end``: ``task``, ``queue_wait`` / ``success``,
+  ``exit_code``, ``duration``
+- ``task_skip``: ``task``, ``reason`` (``platform``, ``condition``, ``cached``)
+- ``hook_start`` / ``hook_end``: ``task``, ``hook`` / ``success``, ``duration``
+- ``command_start`` / ``command_end``: ``task``, ``command``,
+  ``queue_wait``, ``spawn_latency`` / ``exit_code``, ``duration``
+- ``task_retry`` / ``command_retry``: ``task`` (, ``command``), ``attempt``,
+  ``exit_code``, ``delay``
+
+Durations and latencies are in seconds.
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import IO, Any, List, Optional
+
+# Event stream formats accepted by open_event_sink
+EVENT_FORMATS = ("ndjson",)
+
+# Bytes buffered before the writer flushes
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Seconds after which buffered events are flushed on the next emit
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class EventSink:
+    """
+    Receiver of run events.
+
+    The base class discards events; ``enabled`` lets callers skip building
+    expensive fields when nobody listens.
+    """
+
+    enabled = False
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Report an event.
+
+        Args:
+            event: Event name (e.g. "task_start")
+            **fields: Event payload (JSON-serializable values)
+        """
+
+    def flush(self) -> None:
+        """Write out buffered events."""
+
+    def close(self) -> None:
+        """Flush and release the sink."""
+
+
+class NdjsonEventSink(EventSink):
+    """
+    Writes events as newline-delimited JSON.
+
+    Events are serialized on the emitting thread and appended to an
+    in-memory buffer under a lock; the stream is only written when the
+    buffer exceeds ``buffer_size`` bytes, when ``flush_interval`` seconds
+    have passed since the last write, or on ``flush``/``close``. Safe to use
+    from scheduler worker threads and event loops concurrently.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        stream: IO[str],
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        close_stream: bool = False,
+    ):
+        """
+        Initialize NDJSON writer.
+
+        Args:
+            stream: Text stream events are written to
+            buffer_size: Bytes buffered before writing
+            flush_interval: Maximum age in seconds of buffered events
+            close_stream: Whether ``close`` also closes the stream
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.close_stream = close_stream
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Report an event.
+
+        Args:
+            event: Event name (e.g. "task_start")
+            **fields: Event payload (JSON-serializable values)
+        """
+        line = json.dumps(
+            {"ts": round(time.time(), 6), "event": event, **fields},
+            separators=(",", ":"),
+            default=str,
+        )
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer.append(line + "\n")
+            self._buffered += len(line) + 1
+            if (
+                self._buffered >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._write_locked()
+
+    def flush(self) -> None:
+        """Write out buffered events."""
+        with self._lock:
+            if not self._closed:
+                self._write_locked()
+
+    def close(self) -> None:
+        """Flush buffered events and stop accepting new ones."""
+        with self._lock:
+            if self._closed:
+                return
+            self._write_locked()
+            self._closed = True
+        if self.close_stream:
+            self.stream.close()
+
+    def _write_locked(self) -> None:
+        """Write the buffer to the stream (lock must be held)."""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+
+def open_event_sink(
+    format: Optional[str],
+    path: Optional[str] = None,
+    stream: Optional[IO[str]] = None,
+) -> EventSink:
+    """
+    Create the event sink for a run.
+
+    Args:
+        format: Event format ("ndjson"), or None to discard events
+        path: File events are written to (default: ``stream``)
+        stream: Stream used when no path is given (default: stdout)
+
+    Returns:
+        Event sink (call ``close`` when the run is over)
+
+    Raises:
+        ValueError: If the format is unknown
+        OSError: If the file cannot be opened
+    """
+    if format is None:
+        return EventSink()
+    if format not in EVENT_FORMATS:
+        raise ValueError(
+            f"Unknown event format '{format}' (expected one of: {', '.join(EVENT_FORMATS)})"
+        )
+    if path:
+        return NdjsonEventSink(open(path, "w", encoding="utf-8"), close_stream=True)
+    return NdjsonEventSink(stream or sys.stdout)
@@ -0,0 +1,112 @@
+"""
+Per-command log files.
+
+Commands run in parallel (``parallel``, matrix and sharded tasks) only keep a
+bounded tail of their output in memory; the complete output of each command's
+last run is written to ``.taskx/logs/<label>.log`` through a large write
+buffer, so even gigabytes of output cost little memory and few syscalls.
+Labels too long for a file name are shortened, with the full label kept in
+a ``.label`` file next to the log.
+"""
+
+import contextlib
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, List, Tuple
+from urllib.parse import quote, unquote
+
+# Write buffer of each open log file
+LOG_BUFFER_SIZE = 256 * 1024
+
+LOG_SUFFIX = ".log"
+
+# Next to a log with a shortened name: the full label it was written for
+LABEL_SUFFIX = ".label"
+
+# Labels longer than this are shortened and made unique with a hash
+_MAX_NAME_LENGTH = 120
+
+# Characters kept as they are in file names (labels like "test[python=3.11]")
+_SAFE_CHARACTERS = "[]=,+-_."
+
+
+class LogStore:
+    """
+    Directory of command logs, one file per command label.
+
+    Each run of a command replaces the previous log of the same label.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize log store.
+
+        Args:
+            root: Directory holding the log files (created on first write)
+        """
+        self.root = root
+
+    def path(self, label: str) -> Path:
+        """
+        Get the log file of a command.
+
+        Args:
+            label: Command label (task name, matrix cell or shard)
+
+        Returns:
+            Path of the log file (which may not exist)
+        """
+        name = quote(label, safe=_SAFE_CHARACTERS)
+        if len(name) > _MAX_NAME_LENGTH:
+            digest = hashlib.sha256(label.encode()).hexdigest()[:12]
+            name = f"{name[:_MAX_NAME_LENGTH]}-{digest}"
+        return self.root / f"{name}{LOG_SUFFIX}"
+
+    def open(self, label: str) -> BinaryIO:
+        """
+        Start a new log for a command.
+
+        Args:
+            label: Command label
+
+        Returns:
+            Buffered binary file, truncated, to append lines to
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(label)
+        if len(path.name) - len(LOG_SUFFIX) > _MAX_NAME_LENGTH:
+            # The shortened name can't be mapped back to the label
+            path.with_suffix(LABEL_SUFFIX).write_text(label, encoding="utf-8")
+        return open(path, "wb", buffering=LOG_BUFFER_SIZE)
+
+    def find(self, name: str) -> List[Tuple[str, Path]]:
+        """
+        Find the logs of a task: its own and those of its matrix cells/shards.
+
+        Args:
+            name: Task name (or a full label such as ``test[shard=2]``)
+
+        Returns:
+            (label, path) pairs sorted by label
+        """
+        if not self.root.is_dir():
+            return []
+
+        found = []
+        for path in self.root.glob(f"*{LOG_SUFFIX}"):
+            label = self._label(path)
+            if label == name or label.startswith(f"{name}["):
+                found.append((label, path))
+        exact = self.path(name)
+        if exact.is_file() and all(path != exact for _, path in found):
+            found.append((name, exact))
+        return sorted(found)
+
+    def _label(self, path: Path) -> str:
+        """Label a log file was written for."""
+        stem = path.name[: -len(LOG_SUFFIX)]
+        if len(stem) > _MAX_NAME_LENGTH:
+            # Logs written without a label file are only found by exact name
+            with contextlib.suppress(OSError):
+                return path.with_suffix(LABEL_SUFFIX).read_text(encoding="utf-8")
+        return unquote(stem)
@@ -0,0 +1,122 @@
+"""
+Streaming output capture for concurrently running commands.
+
+Child output is read line by line, echoed with a per-command prefix and kept
+in a bounded ring buffer so failures can show their last lines. The complete
+output can additionally be spilled to a log file.
+"""
+
+from collections import deque
+from typing import BinaryIO, Deque, List, Optional, Tuple
+
+from rich.console import Console
+from rich.text import Text
+
+# Colors cycled through for command prefixes
+PREFIX_STYLES = ["cyan", "magenta", "green", "yellow", "blue", "bright_cyan", "bright_magenta"]
+
+# Default number of lines kept per command
+DEFAULT_TAIL_LINES = 50
+
+# Default number of bytes kept per command (the most recent line is always kept)
+DEFAULT_TAIL_BYTES = 1024 * 1024
+
+
+class TaskOutput:
+    """
+    Output of a single command.
+
+    Lines are echoed to the console as ``label | line`` as soon as they are
+    read, and the last ``tail_lines`` lines (at most ``tail_bytes``) are
+    retained in memory. With a ``log``, every line is also appended to it.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        console: Optional[Console] = None,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        style: str = "cyan",
+        width: int = 0,
+        echo: bool = True,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        log: Optional[BinaryIO] = None,
+    ):
+        """
+        Initialize output collector.
+
+        Args:
+            label: Name shown in front of each line
+            console: Rich console lines are echoed to
+            tail_lines: Number of lines retained in the ring buffer
+            style: Rich style of the prefix
+            width: Minimum prefix width (to align several commands)
+            echo: Whether lines are echoed while they arrive
+            tail_bytes: Size limit of the retained lines (UTF-8 encoded)
+            log: Binary file receiving the complete output (closed by ``close``)
+        """
+        self.label = label
+        self.console = console or Console()
+        self.style = style
+        self.echo = echo
+        self._prefix = f"{label:<{width}} | "
+        self.tail_bytes = tail_bytes
+        self.log = log
+        # (stream, line, encoded size) of each retained line
+        self._lines: Deque[Tuple[str, str, int]] = deque(maxlen=max(1, tail_lines))
+        self._retained = 0
+
+    def write(self, stream: str, line: str) -> None:
+        """
+        Record one line of output.
+
+        Args:
+            stream: "stdout" or "stderr"
+            line: Line without trailing newline
+        """
+        encoded = line.encode(errors="replace")
+        if self.log is not None:
+            self.log.write(encoded + b"\n")
+
+        if len(self._lines) == self._lines.maxlen:
+            self._retained -= self._lines[0][2]
+        self._lines.append((stream, line, len(encoded)))
+        self._retained += len(encoded)
+        while self._retained > self.tail_bytes and len(self._lines) > 1:
+            self._retained -= self._lines.popleft()[2]
+
+        if self.echo:
+            text = Text(self._prefix, style=self.style)
+            text.append(line, style="red" if stream == "stderr" else "")
+            self.console.print(text, soft_wrap=True, highlight=False)
+
+    def close(self) -> None:
+        """Flush and close the log file, if any."""
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def tail(self, lines: Optional[int] = None) -> List[str]:
+        """
+        Get the most recent lines from both streams, in arrival order.
+
+        Args:
+            lines: Maximum number of lines (default: everything retained)
+
+        Returns:
+            List of lines
+        """
+        retained = [line for _, line, _ in self._lines]
+        if lines is not None:
+            retained = retained[-lines:] if lines > 0 else []
+        return retained
+
+    @property
+    def stdout(self) -> str:
+        """Retained standard output."""
+        return "\n".join(line for stream, line, _ in self._lines if stream == "stdout")
+
+    @property
+    def stderr(self) -> str:
+        """Retained standard error."""
+        return "\n".join(line for stream, line, _ in self._lines if stream == "stderr")
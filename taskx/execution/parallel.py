@@ -1,25 +1,78 @@
 """
 Parallel task execution system.
 
-Provides async execution of multiple tasks concurrently with progress tracking.
+Provides async execution of multiple tasks concurrently with progress tracking
+and streaming, line-prefixed output.
 """
 
 import asyncio
+import subprocess
+import threading
 import time
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 from rich.console import Console
+from rich.markup import escape
 from rich.progress import (
     BarColumn,
     Progress,
     SpinnerColumn,
+    TaskID,
     TaskProgressColumn,
     TextColumn,
     TimeElapsedColumn,
 )
 
+from taskx.core.retry import RetryPolicy
 from taskx.core.task import ExecutionResult
-from taskx.utils.secure_exec import SecureCommandExecutor, SecurityError
+from taskx.execution.events import EventSink
+from taskx.execution.logs import LogStore
+from taskx.execution.output import (
+    DEFAULT_TAIL_BYTES,
+    DEFAULT_TAIL_LINES,
+    PREFIX_STYLES,
+    TaskOutput,
+)
+from taskx.execution.resources import CapacityLimiter, Resources
+from taskx.utils.secure_exec import SecureCommandExecutor, SecurityError, SpawnCallback
+
+# Rich allows a single live display per console; parallel tasks started
+# concurrently by the dependency scheduler fall back to a hidden progress.
+_progress_lock = threading.Lock()
+
+# Launch order policies for commands waiting for a free slot
+POLICY_CONFIG = "config"
+POLICY_LONGEST_FIRST = "longest-first"
+SCHEDULING_POLICIES = (POLICY_CONFIG, POLICY_LONGEST_FIRST)
+
+
+@dataclass
+class CommandSpec:
+    """
+    A command to run in parallel.
+
+    Attributes:
+        cmd: Command to execute
+        label: Name used for the output prefix and the result key (default: cmd)
+        expected_duration: Typical duration in seconds (e.g. from run history)
+        retry: Retry policy for failures (default: no retries)
+        env: Environment of this command (default: the environment of the run)
+        resources: Cores/memory held while the command runs (see ``CapacityLimiter``)
+    """
+
+    cmd: str
+    label: Optional[str] = None
+    expected_duration: Optional[float] = None
+    retry: Optional[RetryPolicy] = None
+    env: Optional[Mapping[str, str]] = None
+    resources: Optional[Resources] = None
+
+    @property
+    def name(self) -> str:
+        """Label identifying this command."""
+        return self.label or self.cmd
 
 
 class ParallelExecutor:
@@ -27,10 +80,20 @@ class ParallelExecutor:
     Executes multiple tasks in parallel using asyncio.
 
     Features:
-    - Concurrent task execution
+    - Concurrent task execution on native asyncio subprocesses (no thread per command)
+    - Timeout and cancellation kill the whole child process tree
     - Progress tracking with Rich
+    - Streaming output, prefixed with the command label, with a bounded
+      per-command tail shown when a command fails and the complete output
+      optionally spilled to a log file per command
     - Error handling and aggregation
     - Secure command execution
+    - Longest-expected-duration-first launch order when there are more
+      commands than slots, so a slow command doesn't start last
+    - Per-command retries with backoff; a command waiting to be retried
+      releases its slot
+    - Optional admission against a shared cores/memory budget, so weighted
+      commands only start when the machine has room for them
     """
 
     def __init__(
@@ -38,6 +101,13 @@ class ParallelExecutor:
         console: Optional[Console] = None,
         max_concurrent: int = 10,
         strict_mode: bool = False,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        policy: str = POLICY_LONGEST_FIRST,
+        events: Optional[EventSink] = None,
+        limiter: Optional[CapacityLimiter] = None,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        log_dir: Optional[Path] = None,
+        stdout: Optional[IO[Any]] = None,
     ):
         """
         Initialize parallel executor.
@@ -46,37 +116,159 @@ class ParallelExecutor:
             console: Rich console for output
             max_concurrent: Maximum number of concurrent tasks
             strict_mode: Enable strict security mode
+            tail_lines: Lines of output kept per command (shown on failure)
+            policy: Launch order of commands ("longest-first" orders by
+                ``CommandSpec.expected_duration``, "config" keeps the given order)
+            events: Sink receiving command_start/command_end events
+            limiter: Budget commands with ``resources`` are admitted against
+                (default: unlimited)
+            tail_bytes: Size limit of the output kept in memory per command
+            log_dir: Directory the complete output of each command is written
+                to (default: only the tail is kept)
+            stdout: Stream receiving security warnings (command output is
+                shown through the console)
+
+        Raises:
+            ValueError: If the policy is unknown
         """
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(
+                f"Unknown scheduling policy '{policy}' "
+                f"(expected one of: {', '.join(SCHEDULING_POLICIES)})"
+            )
         self.console = console or Console()
         self.max_concurrent = max_concurrent
+        self.tail_lines = tail_lines
+        self.policy = policy
+        self.events = events or EventSink()
+        self.limiter = limiter or CapacityLimiter({})
+        self.tail_bytes = tail_bytes
+        self.logs = LogStore(log_dir) if log_dir is not None else None
         self.secure_executor = SecureCommandExecutor(
             strict_mode=strict_mode,
             allow_warnings=True,
+            stdout=stdout,
         )
+        # Runs in flight, possibly on event loops in other threads
+        self._active: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Task[object]]] = set()
+        self._active_lock = threading.Lock()
+
+    def cancel_all(self) -> None:
+        """
+        Cancel every parallel run in flight and kill its child processes.
+
+        Safe to call from any thread (e.g. on Ctrl+C in the main thread while
+        runs execute in scheduler worker threads).
+        """
+        with self._active_lock:
+            active = list(self._active)
+        for loop, task in active:
+            loop.call_soon_threadsafe(task.cancel)
 
     async def run_parallel(
         self,
-        commands: List[str],
-        env: dict,
+        commands: Sequence[Union[str, CommandSpec]],
+        env: Mapping[str, str],
         cwd: Optional[str] = None,
         timeout: Optional[int] = None,
+        task_name: Optional[str] = None,
     ) -> Dict[str, ExecutionResult]:
         """
         Run multiple commands in parallel.
 
         Args:
-            commands: List of commands to execute
+            commands: Commands to execute (plain strings or labelled specs)
             env: Environment variables
             cwd: Working directory
             timeout: Timeout for each command
+            task_name: Task the commands belong to (reported in events)
 
         Returns:
-            Dictionary mapping command to execution result
+            Dictionary mapping command label (the command itself for plain
+            strings) to execution result
         """
+        specs = [c if isinstance(c, CommandSpec) else CommandSpec(cmd=c) for c in commands]
+
         # Create semaphore to limit concurrent executions
         semaphore = asyncio.Semaphore(self.max_concurrent)
 
+        current = asyncio.current_task()
+        entry = (asyncio.get_running_loop(), current) if current else None
+        if entry:
+            with self._active_lock:
+                self._active.add(entry)
+
+        # One output collector per command, prefixed and color-coded
+        width = max((len(self._short(spec.name)) for spec in specs), default=0)
+        outputs = [
+            TaskOutput(
+                label=self._short(spec.name),
+                console=self.console,
+                tail_lines=self.tail_lines,
+                style=PREFIX_STYLES[index % len(PREFIX_STYLES)],
+                width=width,
+                tail_bytes=self.tail_bytes,
+                log=self._open_log(spec.name),
+            )
+            for index, spec in enumerate(specs)
+        ]
+
+        # Slots are handed out in launch order
+        order = self._launch_order(specs)
+
         # Create progress display
+        show_progress = _progress_lock.acquire(blocking=False)
+        try:
+            launched = await self._run_with_progress(
+                [specs[i] for i in order],
+                [outputs[i] for i in order],
+                env,
+                cwd,
+                timeout,
+                semaphore,
+                show_progress,
+                task_name,
+            )
+            results = {spec.name: launched[spec.name] for spec in specs}
+        finally:
+            if show_progress:
+                _progress_lock.release()
+            for output in outputs:
+                output.close()
+            if entry:
+                with self._active_lock:
+                    self._active.discard(entry)
+
+        self._report_failures(specs, outputs, results)
+        return results
+
+    async def _run_with_progress(
+        self,
+        specs: List[CommandSpec],
+        outputs: List[TaskOutput],
+        env: Mapping[str, str],
+        cwd: Optional[str],
+        timeout: Optional[int],
+        semaphore: asyncio.Semaphore,
+        show_progress: bool,
+        task_name: Optional[str] = None,
+    ) -> Dict[str, ExecutionResult]:
+        """
+        Run commands under a progress display.
+
+        Args:
+            specs: Commands to execute
+            outputs: Output collector for each command
+            env: Environment variables
+            cwd: Working directory
+            timeout: Timeout for each command
+            semaphore: Semaphore for limiting concurrency
+            show_progress: Whether the progress display is rendered
+            task_name: Task the commands belong to (reported in events)
+
+        Returns:
+            Dictionary mapping command label to execution result
+        """
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -84,24 +276,27 @@ class ParallelExecutor:
             TaskProgressColumn(),
             TimeElapsedColumn(),
             console=self.console,
+            disable=not show_progress,
         ) as progress:
             # Create progress tasks for each command
             overall_task = progress.add_task(
-                f"[cyan]Running {len(commands)} tasks in parallel...",
-                total=len(commands),
+                f"[cyan]Running {len(specs)} tasks in parallel...",
+                total=len(specs),
             )
 
             # Create tasks for each command
             tasks = []
-            for cmd in commands:
+            for spec, output in zip(specs, outputs):
                 task = self._execute_with_progress(
-                    cmd=cmd,
+                    spec=spec,
                     env=env,
                     cwd=cwd,
                     timeout=timeout,
                     semaphore=semaphore,
                     progress=progress,
                     overall_task=overall_task,
+                    output=output,
+                    task_name=task_name,
                 )
                 tasks.append(task)
 
@@ -110,160 +305,299 @@ class ParallelExecutor:
 
         # Process results
         result_dict = {}
-        for i, cmd in enumerate(commands):
-            result = results[i]
-            if isinstance(result, Exception):
-                result_dict[cmd] = ExecutionResult(
-                    task_name=cmd,
+        for spec, result in zip(specs, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                result_dict[spec.name] = ExecutionResult(
+                    task_name=spec.name,
                     success=False,
                     exit_code=-1,
-                    error=result,
+                    error=result if isinstance(result, Exception) else None,
                 )
             else:
-                result_dict[cmd] = result
+                result_dict[spec.name] = result
 
         return result_dict
 
     async def _execute_with_progress(
         self,
-        cmd: str,
-        env: dict,
+        spec: CommandSpec,
+        env: Mapping[str, str],
         cwd: Optional[str],
         timeout: Optional[int],
         semaphore: asyncio.Semaphore,
         progress: Progress,
-        overall_task: int,
+        overall_task: TaskID,
+        output: TaskOutput,
+        task_name: Optional[str] = None,
     ) -> ExecutionResult:
         """
         Execute a single command with progress tracking.
 
         Args:
-            cmd: Command to execute
+            spec: Command to execute
             env: Environment variables
             cwd: Working directory
             timeout: Timeout in seconds
             semaphore: Semaphore for limiting concurrency
             progress: Progress display
             overall_task: Progress task ID for overall progress
+            output: Collector for the command's output
+            task_name: Task the command belongs to (reported in events)
 
         Returns:
             Execution result
         """
-        async with semaphore:
-            # Create task-specific progress
-            task_id = progress.add_task(
-                f"[yellow]{cmd[:50]}...",
-                total=None,
-            )
-
-            try:
-                start_time = time.time()
-
-                # Run command in thread pool (subprocess is blocking)
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,
-                    self._execute_sync,
-                    cmd,
-                    env,
-                    cwd,
-                    timeout,
-                )
-
-                duration = time.time() - start_time
-
-                # Update progress
-                if result.success:
-                    progress.update(
-                        task_id,
-                        description=f"[green]✓ {cmd[:50]}",
-                        completed=True,
-                    )
-                else:
-                    progress.update(
-                        task_id,
-                        description=f"[red]✗ {cmd[:50]}",
-                        completed=True,
+        # Rich markup: labels like "test[python=3.11]" must not be read as tags
+        label = escape(self._short(spec.name))
+        policy = spec.retry or RetryPolicy()
+        task_id: Optional[TaskID] = None
+        attempt = 0
+        delay: Optional[float] = None
+
+        while True:
+            queued_at = time.monotonic()
+            # Wait for the budget before taking a slot, so a command blocked on
+            # resources doesn't keep one that a smaller command could use
+            async with self.limiter.hold_async(spec.resources), semaphore:
+                queue_wait = time.monotonic() - queued_at
+
+                def spawned(latency: float, queue_wait: float = queue_wait) -> None:
+                    self.events.emit(
+                        "command_start",
+                        task=task_name,
+                        command=spec.name,
+                        queue_wait=round(queue_wait, 6),
+                        spawn_latency=round(latency, 6),
                     )
 
-                progress.update(overall_task, advance=1)
+                # Create task-specific progress (reused by retries)
+                if task_id is None:
+                    task_id = progress.add_task(f"[yellow]{label}...", total=None)
+                else:
+                    progress.update(task_id, description=f"[yellow]{label} (retry {attempt})...")
 
-                return ExecutionResult(
-                    task_name=cmd,
-                    success=result.success,
-                    exit_code=result.exit_code,
-                    duration=duration,
+                errored = False
+                start_time = time.time()
+                try:
+                    result = await self._execute_async(spec, env, cwd, timeout, output, spawned)
+                except Exception as e:
+                    errored = True
+                    result = ExecutionResult(
+                        task_name=spec.name,
+                        success=False,
+                        exit_code=-1,
+                        stdout=output.stdout,
+                        stderr=output.stderr,
+                        error=e,
+                    )
+                result.duration = time.time() - start_time
+                self._emit_end(task_name, spec, result.exit_code, result.duration)
+
+            # Wait for the retry outside the semaphore so the slot is free meanwhile
+            if policy.should_retry(attempt, result):
+                delay = policy.next_delay(attempt, delay)
+                attempt += 1
+                progress.update(task_id, description=f"[yellow]↻ {label} (retry in {delay:.1f}s)")
+                self.console.print(
+                    f"[yellow]↻ Retrying {label} in {delay:.1f}s "
+                    f"(exit code: {result.exit_code}, retry {attempt}/{policy.retries})[/yellow]",
+                    highlight=False,
                 )
-
-            except Exception as e:
-                progress.update(
-                    task_id,
-                    description=f"[red]✗ {cmd[:50]} (error)",
-                    completed=True,
+                self.events.emit(
+                    "command_retry",
+                    task=task_name,
+                    command=spec.name,
+                    attempt=attempt,
+                    exit_code=result.exit_code,
+                    delay=round(delay, 6),
                 )
-                progress.update(overall_task, advance=1)
+                await asyncio.sleep(delay)
+                continue
+
+            # Update progress
+            if result.success:
+                description = f"[green]✓ {label}"
+            elif errored:
+                description = f"[red]✗ {label} (error)"
+            else:
+                description = f"[red]✗ {label}"
+            progress.update(task_id, description=description, completed=True)
+            progress.update(overall_task, advance=1)
 
-                return ExecutionResult(
-                    task_name=cmd,
-                    success=False,
-                    exit_code=-1,
-                    error=e,
-                )
+            return result
 
-    def _execute_sync(
+    async def _execute_async(
         self,
-        cmd: str,
-        env: dict,
+        spec: CommandSpec,
+        env: Mapping[str, str],
         cwd: Optional[str],
         timeout: Optional[int],
+        output: TaskOutput,
+        on_spawn: Optional[SpawnCallback] = None,
     ) -> ExecutionResult:
         """
-        Execute command synchronously (for use in thread pool).
+        Execute command as a non-blocking asyncio subprocess.
 
         Args:
-            cmd: Command to execute
+            spec: Command to execute
             env: Environment variables
             cwd: Working directory
             timeout: Timeout in seconds
+            output: Collector receiving the command's output lines
+            on_spawn: Called with the process start latency
 
         Returns:
             Execution result
         """
+        cmd = spec.cmd
         try:
-            result = self.secure_executor.execute(
+            result = await self.secure_executor.execute_async(
                 cmd=cmd,
-                env=env,
+                env=env if spec.env is None else spec.env,
                 cwd=cwd,
                 timeout=timeout,
                 shell=True,
+                on_output=output.write,
+                on_spawn=on_spawn,
             )
 
             return ExecutionResult(
-                task_name=cmd,
+                task_name=spec.name,
                 success=result.returncode == 0,
                 exit_code=result.returncode,
+                stdout=output.stdout,
+                stderr=output.stderr,
             )
 
         except SecurityError as e:
             return ExecutionResult(
-                task_name=cmd,
+                task_name=spec.name,
                 success=False,
                 exit_code=-1,
                 error=e,
             )
 
+        except subprocess.TimeoutExpired:
+            return ExecutionResult(
+                task_name=spec.name,
+                success=False,
+                exit_code=-1,
+                stdout=output.stdout,
+                stderr=output.stderr,
+                error=TimeoutError(f"Command timed out after {timeout}s: {cmd}"),
+            )
+
         except Exception as e:
             return ExecutionResult(
-                task_name=cmd,
+                task_name=spec.name,
                 success=False,
                 exit_code=-1,
+                stdout=output.stdout,
+                stderr=output.stderr,
                 error=e,
             )
 
+    def _emit_end(
+        self, task_name: Optional[str], spec: CommandSpec, exit_code: int, duration: float
+    ) -> None:
+        """Report a finished command."""
+        self.events.emit(
+            "command_end",
+            task=task_name,
+            command=spec.name,
+            exit_code=exit_code,
+            duration=round(duration, 6),
+        )
+
+    def _launch_order(self, specs: List[CommandSpec]) -> List[int]:
+        """
+        Decide the order in which commands get a slot.
+
+        With the longest-first policy, commands are sorted by expected
+        duration (longest processing time first), which keeps a slow command
+        from starting last and dominating the wall time. Commands without an
+        expected duration are assumed to take the median of the known ones;
+        ties and the no-history case keep the given order.
+
+        Args:
+            specs: Commands to execute
+
+        Returns:
+            Indices into ``specs`` in launch order
+        """
+        indices = list(range(len(specs)))
+        known = sorted(
+            spec.expected_duration for spec in specs if spec.expected_duration is not None
+        )
+        if self.policy != POLICY_LONGEST_FIRST or not known or len(specs) <= self.max_concurrent:
+            return indices
+
+        median = known[len(known) // 2]
+
+        def expected(index: int) -> float:
+            duration = specs[index].expected_duration
+            return median if duration is None else duration
+
+        return sorted(indices, key=lambda index: -expected(index))
+
+    def _report_failures(
+        self,
+        specs: List[CommandSpec],
+        outputs: List[TaskOutput],
+        results: Dict[str, ExecutionResult],
+    ) -> None:
+        """
+        Show the retained output tail of every failed command.
+
+        Args:
+            specs: Commands that ran
+            outputs: Output collector for each command
+            results: Results of the run, keyed by label
+        """
+        for spec, output in zip(specs, outputs):
+            result = results[spec.name]
+            if result.success:
+                continue
+
+            reason = result.error or f"exit code {result.exit_code}"
+            self.console.print(
+                f"[red]✗ {escape(self._short(spec.name))} failed:[/red] {escape(str(reason))}",
+                highlight=False,
+            )
+            lines = output.tail()
+            if lines:
+                self.console.print(f"[dim]  last {len(lines)} line(s) of output:[/dim]")
+                for line in lines:
+                    self.console.print(f"  {line}", markup=False, highlight=False)
+            if self.logs is not None:
+                self.console.print(
+                    f"[dim]  full output: {escape(str(self.logs.path(spec.name)))}[/dim]",
+                    highlight=False,
+                )
+
+    def _open_log(self, label: str) -> Optional[BinaryIO]:
+        """Start the log file of a command (None if logs are off or can't be written)."""
+        if self.logs is None:
+            return None
+        try:
+            return self.logs.open(label)
+        except OSError as e:
+            self.console.print(
+                f"[yellow]Warning: Cannot write log of {escape(label)}: {escape(str(e))}[/yellow]"
+            )
+            return None
+
+    @staticmethod
+    def _short(name: str, limit: int = 30) -> str:
+        """Shorten long labels (raw commands) for display."""
+        return name if len(name) <= limit else name[: limit - 1] + "…"
+
 
 def run_parallel_sync(
-    commands: List[str],
-    env: dict,
+    commands: Sequence[Union[str, CommandSpec]],
+    env: Mapping[str, str],
     cwd: Optional[str] = None,
     timeout: Optional[int] = None,
     console: Optional[Console] = None,
@@ -272,14 +606,14 @@ def run_parallel_sync(
     Synchronous wrapper for parallel execution.
 
     Args:
-        commands: List of commands to execute
+        commands: Commands to execute (plain strings or labelled specs)
         env: Environment variables
         cwd: Working directory
         timeout: Timeout for each command
         console: Rich console for output
 
     Returns:
-        Dictionary mapping command to execution result
+        Dictionary mapping command label to execution result
     """
     executor = ParallelExecutor(console=console)
     return asyncio.run(executor.run_parallel(commands, env, cwd, timeout))
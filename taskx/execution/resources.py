@@ -0,0 +1,392 @@
+"""
+Resource-aware admission of commands.
+
+Tasks may declare what a command needs while it runs::
+
+    build = { cmd = "make -j8", cpus = 8, mem = "4G" }
+    test = { cmd = "pytest", cpus = 1, mem = "512M" }
+
+Before a command starts, its weights are taken from a machine-wide budget
+(the available cores and memory, overridable with the ``cpus`` and
+``memory`` settings) and returned when it exits. Commands that don't fit wait
+in arrival order, so a large request isn't starved by a stream of small ones.
+With the ``max_load`` setting, commands also wait while the 1-minute load
+average is at or above the limit.
+
+A task's ``pool`` names a group of commands of which only a limited number
+run at the same time (1 unless sized in the ``pools`` setting), e.g. tasks
+sharing a local database::
+
+    [tool.taskx.settings]
+    pools = { db = 1, network = 4 }
+
+Commands without weights are only limited by ``max_parallel_tasks``.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+)
+
+from taskx.core.resources import CPUS, MEMORY, Resources, parse_memory, pool_resource
+
+# Size of pools not listed in the pools setting (mutual exclusion)
+DEFAULT_POOL_SIZE = 1
+
+# Seconds between load average checks while a command waits on max_load
+LOAD_POLL_INTERVAL = 1.0
+
+
+def system_capacity() -> Resources:
+    """
+    Detect the cores and memory available to this process.
+
+    Returns:
+        Capacity per resource kind (memory is left out if it can't be read)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    capacity: Resources = {CPUS: float(cpus)}
+
+    memory = _available_memory()
+    if memory:
+        capacity[MEMORY] = float(memory)
+    return capacity
+
+
+def _available_memory() -> Optional[int]:
+    """Memory available for new processes (Linux), else physical memory."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _load_average() -> Optional[float]:
+    """1-minute load average, or None where the platform has none."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+class CapacityLimiter:
+    """
+    Weighted semaphore over several resource kinds.
+
+    Thread-safe: commands are admitted from scheduler worker threads
+    (``acquire``/``hold``) and from the event loops of parallel runs
+    (``acquire_async``/``hold_async``) against the same budget.
+
+    Requests competing for the same resource kind are granted in arrival
+    order; a request waiting on one kind (e.g. the ``db`` pool) doesn't hold
+    back requests for other kinds. A request larger than the capacity is
+    reduced to the capacity, so it runs alone rather than never. Resource
+    kinds without a capacity are not limited.
+    """
+
+    def __init__(
+        self,
+        capacity: Mapping[str, float],
+        max_load: Optional[float] = None,
+        load_average: Callable[[], Optional[float]] = _load_average,
+        poll_interval: float = LOAD_POLL_INTERVAL,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            capacity: Amount available per resource kind
+            max_load: Don't admit commands while the load average is at or
+                above this (only checked while other admitted commands run)
+            load_average: Source of the current load average
+            poll_interval: Seconds between load checks while waiting on max_load
+        """
+        self.capacity: Resources = {kind: float(v) for kind, v in capacity.items() if v > 0}
+        self.max_load = max_load
+        self.load_average = load_average
+        self.poll_interval = poll_interval
+
+        self._in_use: Resources = dict.fromkeys(self.capacity, 0.0)
+        self._holders = 0
+        self._condition = threading.Condition()
+        # Ticket -> resource kinds of each waiting request, in arrival order
+        self._waiting: Dict[object, FrozenSet[str]] = {}
+        # Wakeups of requests waiting on an event loop
+        self._wakeups: Dict[object, Callable[[], None]] = {}
+
+    @classmethod
+    def from_settings(
+        cls, settings: Mapping[str, Any], pools: Iterable[str] = ()
+    ) -> "CapacityLimiter":
+        """
+        Build the machine budget configured under ``[tool.taskx.settings]``.
+
+        Args:
+            settings: Global settings (``cpus``, ``memory`` and ``max_load``
+                override the detected capacity and enable the load check,
+                ``pools`` sizes named pools)
+            pools: Pool names used by tasks
+
+        Returns:
+            Limiter over the detected or configured capacity
+
+        Raises:
+            ValueError: If a setting is malformed
+        """
+        capacity = system_capacity()
+        if settings.get(CPUS) is not None:
+            capacity[CPUS] = float(settings[CPUS])
+        if settings.get("memory") is not None:
+            capacity[MEMORY] = float(parse_memory(settings["memory"]))
+
+        sizes = settings.get("pools", {})
+        if not isinstance(sizes, dict):
+            raise ValueError("pools setting must be a table of pool names to sizes")
+        for name in {*pools, *sizes}:
+            size = sizes.get(name, DEFAULT_POOL_SIZE)
+            if isinstance(size, bool) or not isinstance(size, int) or size < 1:
+                raise ValueError(f"Pool '{name}' size must be a positive integer")
+            capacity[pool_resource(name)] = float(size)
+
+        max_load = settings.get("max_load")
+        return cls(capacity, max_load=None if max_load is None else float(max_load))
+
+    @property
+    def in_use(self) -> Resources:
+        """Amount currently held per resource kind."""
+        with self._condition:
+            return dict(self._in_use)
+
+    def clamp(self, request: Optional[Mapping[str, float]]) -> Resources:
+        """
+        Reduce a request to the limited kinds, at most their capacity.
+
+        Args:
+            request: Amount needed per resource kind
+
+        Returns:
+            Non-zero amounts the limiter accounts for
+        """
+        return {
+            kind: min(float(amount), self.capacity[kind])
+            for kind, amount in (request or {}).items()
+            if amount > 0 and kind in self.capacity
+        }
+
+    def available(self, request: Optional[Mapping[str, float]]) -> bool:
+        """
+        Check whether a request would be admitted right now, without taking it.
+
+        Args:
+            request: Amount needed per resource kind
+
+        Returns:
+            True if the resources are free and no earlier request waits for them
+        """
+        amounts = self.clamp(request)
+        if not amounts:
+            return True
+        with self._condition:
+            return not self._waiting_ahead(amounts, None) and self._fits(amounts)
+
+    def try_acquire(self, request: Optional[Mapping[str, float]]) -> bool:
+        """
+        Take resources if they are free and no earlier request waits for them.
+
+        Args:
+            request: Amount needed per resource kind
+
+        Returns:
+            True if the resources were taken (release them with ``release``)
+        """
+        amounts = self.clamp(request)
+        if not amounts:
+            return True
+        with self._condition:
+            return self._try_take(amounts, None)
+
+    def acquire(
+        self, request: Optional[Mapping[str, float]], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Take resources, blocking until they are free.
+
+        Args:
+            request: Amount needed per resource kind
+            timeout: Give up after this many seconds (default: wait forever)
+
+        Returns:
+            True if the resources were taken, False on timeout
+        """
+        amounts = self.clamp(request)
+        if not amounts:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._try_take(amounts, None):
+                return True
+            ticket = object()
+            self._waiting[ticket] = frozenset(amounts)
+            try:
+                while not self._try_take(amounts, ticket):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(self._wait_time(remaining))
+                return True
+            finally:
+                self._leave(ticket)
+
+    async def acquire_async(self, request: Optional[Mapping[str, float]]) -> None:
+        """
+        Take resources without blocking the event loop.
+
+        Args:
+            request: Amount needed per resource kind
+        """
+        amounts = self.clamp(request)
+        if not amounts:
+            return
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+
+        def notify() -> None:
+            with contextlib.suppress(RuntimeError):  # Loop already closed
+                loop.call_soon_threadsafe(wakeup.set)
+
+        ticket = object()
+        with self._condition:
+            if self._try_take(amounts, None):
+                return
+            self._waiting[ticket] = frozenset(amounts)
+            self._wakeups[ticket] = notify
+        try:
+            while True:
+                with self._condition:
+                    if self._try_take(amounts, ticket):
+                        return
+                    wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), self._wait_time(None))
+        finally:
+            with self._condition:
+                self._leave(ticket)
+
+    def release(self, request: Optional[Mapping[str, float]]) -> None:
+        """
+        Return resources taken by ``acquire``.
+
+        Args:
+            request: The request that was acquired
+        """
+        amounts = self.clamp(request)
+        if not amounts:
+            return
+        with self._condition:
+            for kind, amount in amounts.items():
+                self._in_use[kind] = max(0.0, self._in_use[kind] - amount)
+            self._holders -= 1
+            self._wake()
+
+    @contextmanager
+    def hold(self, request: Optional[Mapping[str, float]]) -> Iterator[None]:
+        """Hold resources for the duration of a ``with`` block."""
+        self.acquire(request)
+        try:
+            yield
+        finally:
+            self.release(request)
+
+    @asynccontextmanager
+    async def hold_async(self, request: Optional[Mapping[str, float]]) -> AsyncIterator[None]:
+        """Hold resources for the duration of an ``async with`` block."""
+        await self.acquire_async(request)
+        try:
+            yield
+        finally:
+            self.release(request)
+
+    def _try_take(self, amounts: Resources, ticket: Optional[object]) -> bool:
+        """Take resources if it's this request's turn and they fit (lock held)."""
+        if self._waiting_ahead(amounts, ticket) or not self._fits(amounts):
+            return False
+
+        for kind, amount in amounts.items():
+            self._in_use[kind] += amount
+        self._holders += 1
+        if ticket is not None:
+            del self._waiting[ticket]
+            # The next request in line may fit too
+            self._wake()
+        return True
+
+    def _waiting_ahead(self, amounts: Resources, ticket: Optional[object]) -> bool:
+        """Whether an earlier waiting request needs one of the same kinds (lock held)."""
+        for waiting, kinds in self._waiting.items():
+            if waiting is ticket:
+                return False
+            if not kinds.isdisjoint(amounts):
+                return True
+        return False
+
+    def _fits(self, amounts: Resources) -> bool:
+        """Whether the amounts are free and the load allows them (lock held)."""
+        if any(
+            self._in_use[kind] + amount > self.capacity[kind] for kind, amount in amounts.items()
+        ):
+            return False
+        return self._load_allows()
+
+    def _load_allows(self) -> bool:
+        """Whether the load average admits another command (lock held)."""
+        if self.max_load is None or self._holders == 0:
+            # With nothing of ours running, waiting can't lower the load
+            return True
+        load = self.load_average()
+        return load is None or load < self.max_load
+
+    def _wait_time(self, remaining: Optional[float]) -> Optional[float]:
+        """How long to sleep before checking again (None: until woken)."""
+        if self.max_load is None:
+            return remaining
+        if remaining is None:
+            return self.poll_interval
+        return min(remaining, self.poll_interval)
+
+    def _leave(self, ticket: object) -> None:
+        """Remove a request from the queue, granted or not (lock held)."""
+        self._wakeups.pop(ticket, None)
+        if self._waiting.pop(ticket, None) is not None:
+            # Requests queued behind this one may go now
+            self._wake()
+
+    def _wake(self) -> None:
+        """Let waiting requests check again (lock held)."""
+        self._condition.notify_all()
+        for notify in self._wakeups.values():
+            notify()
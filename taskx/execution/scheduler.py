@@ -0,0 +1,207 @@
+"""
+Dependency graph scheduler.
+
+Runs a task graph with a ready queue: every task whose dependencies have
+finished is launched, up to a bounded number of concurrent workers.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from taskx.core.task import ExecutionResult
+
+
+class DagScheduler:
+    """
+    Executes a dependency graph with bounded parallelism.
+
+    Tasks are launched as soon as all of their dependencies have completed.
+    Ready tasks are started in the order given by ``order`` so that a run
+    with ``max_workers=1`` behaves exactly like a sequential topological run.
+    With more workers, ready tasks with the largest ``priority`` (typically
+    their critical-path weight, see ``GraphIndex.remaining_work``) go first.
+
+    Failure handling:
+    - A failed task stops the run (fail-fast) unless ``should_continue``
+      returns True for its result. No new tasks are started after a stop;
+      tasks already in flight are allowed to finish.
+    - Tasks flagged by ``is_exclusive`` (e.g. interactive prompts) run on the
+      calling thread while no other task is in flight.
+    - Ready tasks for which ``can_start`` is False (e.g. their pool is full)
+      are passed over for other ready tasks while anything is in flight,
+      instead of tying up a worker that would only wait.
+    """
+
+    def __init__(
+        self,
+        graph: Dict[str, List[str]],
+        execute: Callable[[str], ExecutionResult],
+        max_workers: int = 10,
+        order: Optional[List[str]] = None,
+        should_continue: Optional[Callable[[ExecutionResult], bool]] = None,
+        is_exclusive: Optional[Callable[[str], bool]] = None,
+        on_interrupt: Optional[Callable[[], None]] = None,
+        priority: Optional[Dict[str, float]] = None,
+        can_start: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            graph: Mapping of task name to the names it depends on. Every
+                dependency must itself be a key of the mapping.
+            execute: Function that runs a single task and returns its result
+            max_workers: Maximum number of tasks running at the same time
+            order: Preferred launch order for ready tasks (default: graph order)
+            should_continue: Predicate deciding whether a failed result may be
+                ignored (default: never)
+            is_exclusive: Predicate marking tasks that must run alone on the
+                calling thread (default: none)
+            on_interrupt: Called when the run is interrupted (e.g. Ctrl+C)
+                before waiting for in-flight workers, to stop their children
+            priority: Launch priority of each task when running concurrently
+                (higher first, ties broken by ``order``)
+            can_start: Predicate telling whether a ready task could start
+                right away (default: always)
+        """
+        self.graph = graph
+        self.execute = execute
+        self.max_workers = max(1, max_workers)
+        self.order = order or list(graph)
+        self.should_continue = should_continue or (lambda _result: False)
+        self.is_exclusive = is_exclusive or (lambda _name: False)
+        self.on_interrupt = on_interrupt
+        self.priority = priority or {}
+        self.can_start = can_start or (lambda _name: True)
+
+        self.results: Dict[str, ExecutionResult] = {}
+        self.failed_task: Optional[str] = None
+        # When each task's dependencies were all done (time.monotonic())
+        self.ready_at: Dict[str, float] = {}
+
+    def run(self) -> bool:
+        """
+        Run the graph to completion or until a fatal failure.
+
+        Returns:
+            True if every task ran and no fatal failure occurred
+        """
+        rank = {name: index for index, name in enumerate(self.order)}
+        remaining = {name: len(set(deps)) for name, deps in self.graph.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.graph}
+        for name, deps in self.graph.items():
+            for dep in set(deps):
+                dependents[dep].append(name)
+
+        ready: List[str] = [name for name, count in remaining.items() if count == 0]
+        started = time.monotonic()
+        self.ready_at.update((name, started) for name in ready)
+        in_flight: Dict[Future[ExecutionResult], str] = {}
+        stopped = False
+
+        def complete(name: str, result: ExecutionResult) -> None:
+            nonlocal stopped
+            self.results[name] = result
+            if not result.success and not self.should_continue(result):
+                if not stopped:
+                    self.failed_task = name
+                stopped = True
+                return
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+                    self.ready_at[dependent] = time.monotonic()
+
+        # Sequential fast path: no threads needed
+        if self.max_workers == 1:
+            while ready and not stopped:
+                ready.sort(key=rank.__getitem__)
+                name = ready.pop(0)
+                complete(name, self.execute(name))
+            return not stopped and len(self.results) == len(self.graph)
+
+        # Concurrent runs launch the heaviest critical path first
+        def launch_key(name: str) -> Tuple[float, int]:
+            return (-self.priority.get(name, 0.0), rank[name])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                while (ready and not stopped) or in_flight:
+                    ready.sort(key=launch_key)
+
+                    # Launch ready tasks while there are free workers
+                    while ready and not stopped and len(in_flight) < self.max_workers:
+                        next_task = self._next_startable(ready, bool(in_flight))
+                        if next_task is None:
+                            break
+                        name = next_task
+                        if self.is_exclusive(name):
+                            if in_flight:
+                                break
+                            ready.remove(name)
+                            complete(name, self.execute(name))
+                            ready.sort(key=launch_key)
+                            continue
+                        ready.remove(name)
+                        in_flight[pool.submit(self.execute, name)] = name
+
+                    if not in_flight:
+                        continue
+
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = in_flight.pop(future)
+                        complete(name, self._result_of(name, future))
+            except BaseException:
+                # Don't start anything else; stop and drain running workers
+                ready.clear()
+                if self.on_interrupt:
+                    self.on_interrupt()
+                raise
+
+        return not stopped and len(self.results) == len(self.graph)
+
+    def _next_startable(self, ready: List[str], busy: bool) -> Optional[str]:
+        """
+        Pick the first ready task that can start now.
+
+        Args:
+            ready: Ready tasks in launch order
+            busy: Whether tasks are in flight (if not, the first ready task
+                starts regardless, since nothing would free its resources)
+
+        Returns:
+            Task to launch, or None to wait for a running task to finish
+        """
+        if not busy:
+            return ready[0]
+        return next((name for name in ready if self.can_start(name)), None)
+
+    def queue_wait(self, name: str) -> float:
+        """
+        Time a task has been ready to run without running.
+
+        Args:
+            name: Task name
+
+        Returns:
+            Seconds since the task's dependencies finished
+        """
+        ready_at = self.ready_at.get(name)
+        return 0.0 if ready_at is None else time.monotonic() - ready_at
+
+    @property
+    def skipped(self) -> Set[str]:
+        """Tasks that never ran because the run was stopped."""
+        return set(self.graph) - set(self.results)
+
+    @staticmethod
+    def _result_of(name: str, future: "Future[ExecutionResult]") -> ExecutionResult:
+        """Unwrap a worker future into an execution result."""
+        try:
+            result: ExecutionResult = future.result()
+            return result
+        except Exception as e:
+            return ExecutionResult(task_name=name, success=False, exit_code=-1, error=e)
@@ -0,0 +1,209 @@
+"""
+Supervised child processes for watch mode.
+
+A long-running task (a dev server, a test watcher) runs as its own process
+group so it can be stopped as a whole: a graceful signal first, then, after a
+grace period, a kill of everything left in the group.
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Seconds a stopped process gets to exit before it is killed
+DEFAULT_GRACE_PERIOD = 5.0
+
+# What Ctrl+C would send: dev servers and taskx itself shut down cleanly on it
+if sys.platform == "win32":
+    DEFAULT_STOP_SIGNAL = signal.CTRL_BREAK_EVENT
+else:
+    DEFAULT_STOP_SIGNAL = signal.SIGINT
+
+# Seconds to wait for a killed process group to disappear
+_KILL_TIMEOUT = 1.0
+
+# Interval for checking whether the rest of a process group is gone
+_GROUP_POLL_INTERVAL = 0.05
+
+
+def taskx_command(config_path: Path, *args: str) -> List[str]:
+    """
+    Get the command line running taskx with the current interpreter.
+
+    Args:
+        config_path: Path to pyproject.toml
+        *args: Command and its arguments (e.g. "run", "dev")
+
+    Returns:
+        Arguments for subprocess
+    """
+    return [
+        sys.executable,
+        "-c",
+        "from taskx.cli.main import cli; cli(prog_name='taskx')",
+        "--config",
+        str(config_path.resolve()),
+        *args,
+    ]
+
+
+class ProcessSupervisor:
+    """
+    Starts, stops and restarts one command running in its own process group.
+
+    Not thread-safe: use it from a single event loop.
+    """
+
+    def __init__(
+        self,
+        argv: List[str],
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+        stop_signal: int = DEFAULT_STOP_SIGNAL,
+    ):
+        """
+        Initialize supervisor.
+
+        Args:
+            argv: Command to run
+            env: Environment of the process (defaults to os.environ)
+            cwd: Working directory
+            grace_period: Seconds between the stop signal and the kill
+            stop_signal: Signal sent to the process group to stop it
+        """
+        self.argv = argv
+        self.env = env
+        self.cwd = cwd
+        self.grace_period = grace_period
+        self.stop_signal = stop_signal
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.killed = False
+        # Whether the group of the last process may still have members
+        self._group_alive = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the process was started and hasn't exited yet."""
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """Exit code of the last process (None while it runs or before a start)."""
+        return self.process.returncode if self.process is not None else None
+
+    async def start(self) -> None:
+        """Start the process (stopping the current one first)."""
+        await self.stop()
+        self.killed = False
+        if sys.platform == "win32":
+            self.process = await asyncio.create_subprocess_exec(
+                *self.argv,
+                env=self.env,
+                cwd=self.cwd,
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+            )
+        else:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.argv, env=self.env, cwd=self.cwd, start_new_session=True
+            )
+        self._group_alive = True
+
+    async def wait(self) -> int:
+        """
+        Wait for the process to exit.
+
+        Returns:
+            Its exit code
+
+        Raises:
+            RuntimeError: If the process was never started
+        """
+        if self.process is None:
+            raise RuntimeError("Process not started")
+        return await self.process.wait()
+
+    async def stop(self) -> Optional[int]:
+        """
+        Stop the process group: stop signal, grace period, then kill.
+
+        Sets ``killed`` when the group didn't exit within the grace period.
+
+        Returns:
+            Exit code of the process, or None if none was started
+        """
+        process = self.process
+        if process is None:
+            return None
+        if not self._group_alive:
+            return await process.wait()
+        # Also reaches what the process left behind if it already exited
+        self._signal_group(self.stop_signal)
+        try:
+            await asyncio.wait_for(self._wait_group_exit(), self.grace_period)
+        except asyncio.TimeoutError:
+            self.killed = True
+        self._kill_group()
+        self._group_alive = False
+        returncode = await process.wait()
+        # SIGKILL is delivered asynchronously; a restart shouldn't race the old group
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wait_group_exit(), _KILL_TIMEOUT)
+        return returncode
+
+    async def _wait_group_exit(self) -> None:
+        """Wait for the process, then for the rest of its group (POSIX only)."""
+        assert self.process is not None
+        await self.process.wait()
+        if sys.platform == "win32":
+            return
+        # Others in the group (e.g. a server behind a shell) may still be exiting
+        while _group_alive(self.process.pid):
+            await asyncio.sleep(_GROUP_POLL_INTERVAL)
+
+    def _signal_group(self, signum: int) -> None:
+        """Send a signal to the process group."""
+        assert self.process is not None
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            if sys.platform == "win32":
+                self.process.send_signal(signum)
+            else:
+                os.killpg(self.process.pid, signum)
+
+    def _kill_group(self) -> None:
+        """Kill whatever is left of the process group."""
+        assert self.process is not None
+        if sys.platform != "win32":
+            self._signal_group(signal.SIGKILL)
+        elif self.process.returncode is None:
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(self.process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+def _group_alive(pgid: int) -> bool:
+    """
+    Check whether a process group still has members (POSIX only).
+
+    Exited members count until they are reaped: where nothing reaps orphans
+    (containers without an init process, see ``docker run --init``) a
+    stopped group only disappears once ``stop`` has waited out its timeouts.
+
+    Args:
+        pgid: Process group ID
+
+    Returns:
+        True if the group has members
+    """
+    try:
+        os.killpg(pgid, 0)
+    except (ProcessLookupError, PermissionError):
+        return False
+    return True
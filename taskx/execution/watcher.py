@@ -5,14 +5,220 @@ Provides watch mode functionality with debouncing and smart filtering.
 """
 
 import asyncio
+import os
+import re
 import time
 from pathlib import Path
-from typing import Callable, List, Optional, Set
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
 
 from rich.console import Console
-from watchfiles import awatch
+from watchfiles import Change, awatch
 
 from taskx.core.task import Task
+from taskx.execution.supervisor import ProcessSupervisor
+
+# Build/cache directories never reported (hidden files and directories aren't either)
+IGNORED_DIRS = frozenset(
+    {
+        "__pycache__",
+        "node_modules",
+        ".git",
+        ".venv",
+        "venv",
+        "dist",
+        "build",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".ruff_cache",
+    }
+)
+
+_GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
+
+class WatchMatcher:
+    """
+    Watch patterns and ignored directories compiled into single regular expressions.
+
+    Patterns are globs relative to the watched directory, with ``**``
+    matching any number of directories. A pattern without a ``/`` matches
+    file names in any directory (``*.py``); one with a ``/`` is anchored at
+    the watched directory (``src/**/*.py``), which also lets the watcher
+    watch ``src`` alone instead of the whole tree. Ignored directories (and
+    hidden ones) never match and are left out of the watched tree.
+    """
+
+    def __init__(
+        self,
+        patterns: List[str],
+        base: Optional[Path] = None,
+        ignored_dirs: Iterable[str] = IGNORED_DIRS,
+    ):
+        """
+        Initialize matcher.
+
+        Args:
+            patterns: Glob patterns (e.g., ["*.py", "src/**/*.ts"])
+            base: Watched directory the patterns are relative to
+            ignored_dirs: Directory names whose contents never match
+        """
+        self.patterns = [_normalize_pattern(pattern) for pattern in patterns]
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self.base = base
+
+        relative = [_glob_to_regex(p) for p in self.patterns if not p.startswith("/")]
+        absolute = [_glob_to_regex(p) for p in self.patterns if p.startswith("/")]
+        self._relative = _alternation(relative)
+        self._absolute = _alternation(absolute)
+
+        names = [re.escape(name) for name in sorted(self.ignored_dirs)] + [r"\.[^/]*"]
+        self._ignored = re.compile(f"(?:^|/)(?:{'|'.join(names)})(?:/|$)")
+
+    @property
+    def base(self) -> Optional[Path]:
+        """Watched directory the patterns are relative to."""
+        return self._base
+
+    @base.setter
+    def base(self, base: Optional[Path]) -> None:
+        self._base = base
+        self._prefix = f"{_posix(str(base.resolve())).rstrip('/')}/" if base else None
+
+    def matches(self, path: str) -> bool:
+        """
+        Check whether a changed path is relevant.
+
+        Args:
+            path: Absolute path as reported by watchfiles
+
+        Returns:
+            True if the path matches a pattern and isn't in an ignored directory
+        """
+        path = _posix(path)
+        if self._prefix is not None and path.startswith(self._prefix):
+            relative = path[len(self._prefix) :]
+        else:
+            relative = path.lstrip("/")
+
+        if self._ignored.search(relative):
+            return False
+        if self._relative is not None and self._relative.fullmatch(relative):
+            return True
+        return self._absolute is not None and self._absolute.fullmatch(path) is not None
+
+    def ignores_dir(self, name: str) -> bool:
+        """Check whether changes in directories with this name are never relevant."""
+        return name in self.ignored_dirs or name.startswith(".")
+
+    def roots(self, base: Path) -> List[Path]:
+        """
+        Get the directories to watch for the patterns.
+
+        Args:
+            base: Watched directory
+
+        Returns:
+            The literal directory prefixes of the patterns (e.g. ``src`` for
+            ``src/**/*.py``) that exist, without nested duplicates; just
+            ``base`` when a pattern can match anywhere in it
+        """
+        base = base.resolve()
+        candidates = []
+        for pattern in self.patterns:
+            directories = pattern.split("/")[:-1]
+            literal = []
+            for directory in directories:
+                if _GLOB_CHARACTERS.search(directory):
+                    break
+                literal.append(directory)
+            if not pattern.startswith("/") and not literal:
+                return [base]
+
+            top = Path("/") if pattern.startswith("/") else base
+            root = top.joinpath(*literal)
+            # A directory created later is seen from its closest existing parent
+            while root != top and not root.exists():
+                root = root.parent
+            candidates.append(root)
+
+        return _outermost(candidates) or [base]
+
+
+class WatchIndex:
+    """
+    Maps changed files to the tasks watching them.
+
+    Each task's patterns are relative to its own directory.
+    """
+
+    def __init__(self, matchers: Dict[str, WatchMatcher]):
+        """
+        Initialize index.
+
+        Args:
+            matchers: Task name -> matcher of its watch patterns (with its base set)
+        """
+        self.matchers = matchers
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task], default_dir: Path) -> "WatchIndex":
+        """
+        Build an index of tasks with watch patterns.
+
+        Args:
+            tasks: Tasks to index (tasks without ``watch`` patterns are skipped)
+            default_dir: Directory of tasks without a ``cwd``
+
+        Returns:
+            Watch index
+        """
+        return cls(
+            {
+                task.name: WatchMatcher(
+                    task.watch, base=Path(task.cwd) if task.cwd else default_dir
+                )
+                for task in tasks
+                if task.watch
+            }
+        )
+
+    @property
+    def tasks(self) -> List[str]:
+        """Names of the indexed tasks."""
+        return list(self.matchers)
+
+    def matches(self, path: str) -> bool:
+        """Check whether any task watches a changed path."""
+        return any(matcher.matches(path) for matcher in self.matchers.values())
+
+    def ignores_dir(self, name: str) -> bool:
+        """Check whether no task sees changes in directories with this name."""
+        return all(matcher.ignores_dir(name) for matcher in self.matchers.values())
+
+    def affected(self, paths: Iterable[Path]) -> List[str]:
+        """
+        Get the tasks watching any of the changed paths.
+
+        Args:
+            paths: Changed paths
+
+        Returns:
+            Task names, in index order
+        """
+        changed = [str(path) for path in paths]
+        return [
+            name
+            for name, matcher in self.matchers.items()
+            if any(matcher.matches(path) for path in changed)
+        ]
+
+    def roots(self) -> List[Path]:
+        """Get the directories to watch for every task."""
+        roots = []
+        for matcher in self.matchers.values():
+            assert matcher.base is not None
+            roots.extend(matcher.roots(matcher.base))
+        return _outermost(roots)
 
 
 class FileWatcher:
@@ -21,7 +227,9 @@ class FileWatcher:
 
     Features:
     - Glob pattern matching for file filtering
-    - Debouncing to prevent excessive re-executions
+    - Trailing-edge debouncing: a burst of changes (an editor or formatter
+      saving many files) leads to a single re-execution
+    - Changes made while the task runs are queued as one more run
     - Graceful shutdown handling
     - Clear change reporting
     """
@@ -31,6 +239,7 @@ class FileWatcher:
         patterns: List[str],
         console: Optional[Console] = None,
         debounce_ms: int = 100,
+        max_wait_ms: int = 1000,
     ):
         """
         Initialize file watcher.
@@ -38,13 +247,21 @@ class FileWatcher:
         Args:
             patterns: List of glob patterns to watch (e.g., ["*.py", "**/*.js"])
             console: Rich console for output
-            debounce_ms: Milliseconds to wait before triggering execution
+            debounce_ms: Milliseconds without further changes before triggering execution
+            max_wait_ms: Milliseconds after the first change at which execution is
+                triggered even if changes keep coming
         """
         self.patterns = patterns
+        self.matcher: Union[WatchMatcher, WatchIndex] = WatchMatcher(patterns)
         self.console = console or Console()
         self.debounce_ms = debounce_ms / 1000.0  # Convert to seconds
-        self._last_execution = 0.0
+        self.max_wait = max(max_wait_ms, debounce_ms) / 1000.0
         self._pending_changes: Set[Path] = set()
+        # Monotonic times of the first and the latest pending change
+        self._first_change = 0.0
+        self._last_change = 0.0
+        # Set when changes are pending (created on the loop that watches)
+        self._changed: Optional[asyncio.Event] = None
 
     async def watch_and_execute(
         self,
@@ -55,107 +272,304 @@ class FileWatcher:
         """
         Watch files and execute callback when changes are detected.
 
+        The callback runs in a worker thread while changes keep being
+        collected; changes made during a run trigger one more run after it.
+
         Args:
             task: Task being watched
             execute_callback: Function to call when files change (should return success status)
             cwd: Working directory to watch
         """
+        loop = asyncio.get_running_loop()
         watch_dir = Path(cwd) if cwd else Path.cwd()
+        collector = self._start_collecting(watch_dir)
 
-        self.console.print("[cyan]👀 Watching for changes...[/cyan]")
-        self.console.print(f"[dim]Directory: {watch_dir}[/dim]")
-        self.console.print(f"[dim]Patterns: {', '.join(self.patterns)}[/dim]")
-        self.console.print()
+        try:
+            # Initial execution
+            self.console.print("[yellow]▶ Running initial execution...[/yellow]")
+            success = await loop.run_in_executor(None, execute_callback)
+            if success:
+                self.console.print("[green]✓ Initial execution completed[/green]\n")
+            else:
+                self.console.print("[red]✗ Initial execution failed[/red]\n")
+
+            while True:
+                changes = await self._next_changes()
+                self._display_changes(changes)
 
-        # Initial execution
-        self.console.print("[yellow]▶ Running initial execution...[/yellow]")
-        success = execute_callback()
-        if success:
-            self.console.print("[green]✓ Initial execution completed[/green]\n")
-        else:
-            self.console.print("[red]✗ Initial execution failed[/red]\n")
+                # Execute task
+                self.console.print(f"[yellow]▶ Re-running task '{task.name}'...[/yellow]")
+                success = await loop.run_in_executor(None, execute_callback)
 
-        # Watch for changes
-        try:
-            async for changes in awatch(str(watch_dir), recursive=True):
-                # Filter changes based on patterns
-                relevant_changes = self._filter_changes(changes)
+                if success:
+                    self.console.print("[green]✓ Execution completed successfully[/green]\n")
+                else:
+                    self.console.print("[red]✗ Execution failed[/red]\n")
 
-                if not relevant_changes:
-                    continue
+        except KeyboardInterrupt:
+            self.console.print("\n[yellow]⊘ Watch mode stopped by user[/yellow]")
+        finally:
+            collector.cancel()
 
-                # Add to pending changes
-                self._pending_changes.update(relevant_changes)
+    async def watch_and_restart(
+        self,
+        task: Task,
+        supervisor: ProcessSupervisor,
+        cwd: Optional[str] = None,
+    ) -> None:
+        """
+        Keep a task running, restarting its process when files change.
 
-                # Debounce: wait for a short period to collect all changes
-                await asyncio.sleep(self.debounce_ms)
+        For long-running tasks such as dev servers: on a change the running
+        process group gets a graceful stop (then a kill once the supervisor's
+        grace period is over) and a fresh process is started. A task that
+        exits on its own is started again on the next change.
 
-                # Check if we should execute (respects debounce period)
-                current_time = time.time()
-                if current_time - self._last_execution < self.debounce_ms:
-                    continue
+        Args:
+            task: Task being watched
+            supervisor: Supervisor running the task's process
+            cwd: Working directory to watch
+        """
+        watch_dir = Path(cwd) if cwd else Path.cwd()
+        collector = self._start_collecting(watch_dir)
 
-                # Display changes
-                self._display_changes(self._pending_changes)
+        try:
+            self.console.print(f"[yellow]▶ Starting task '{task.name}'...[/yellow]")
+            await supervisor.start()
+
+            while True:
+                changes = asyncio.ensure_future(self._next_changes())
+                if supervisor.running:
+                    exited = asyncio.ensure_future(supervisor.wait())
+                    await asyncio.wait({changes, exited}, return_when=asyncio.FIRST_COMPLETED)
+                    if not changes.done():
+                        self._report_exit(task, exited.result())
+                    else:
+                        exited.cancel()
+
+                self._display_changes(await changes)
+                if supervisor.running:
+                    self.console.print(f"[yellow]⟳ Restarting task '{task.name}'...[/yellow]")
+                    await supervisor.stop()
+                    if supervisor.killed:
+                        self.console.print(
+                            f"[yellow]Warning: '{task.name}' did not stop within "
+                            f"{supervisor.grace_period:g}s and was killed[/yellow]"
+                        )
+                else:
+                    self.console.print(f"[yellow]▶ Starting task '{task.name}'...[/yellow]")
+                await supervisor.start()
 
-                # Execute task
-                self.console.print(f"[yellow]▶ Re-running task '{task.name}'...[/yellow]")
-                success = execute_callback()
+        except KeyboardInterrupt:
+            self.console.print("\n[yellow]⊘ Watch mode stopped by user[/yellow]")
+        finally:
+            collector.cancel()
+            await supervisor.stop()
+
+    async def watch_affected(
+        self,
+        index: WatchIndex,
+        execute_callback: Callable[[List[str], bool], bool],
+        cwd: Optional[str] = None,
+    ) -> None:
+        """
+        Watch the files of several tasks, re-running the tasks a change affects.
+
+        Args:
+            index: Watched tasks and their patterns
+            execute_callback: Called with the tasks to run and whether this is
+                the initial run (should return success status)
+            cwd: Working directory shown as the watched directory
+        """
+        loop = asyncio.get_running_loop()
+        watch_dir = Path(cwd) if cwd else Path.cwd()
+        self.matcher = index
+        collector = self._start_collecting(watch_dir, index.roots())
+
+        try:
+            self.console.print(
+                f"[yellow]▶ Running watched tasks: {', '.join(index.tasks)}[/yellow]"
+            )
+            success = await loop.run_in_executor(None, execute_callback, index.tasks, True)
+            if success:
+                self.console.print("[green]✓ Initial execution completed[/green]\n")
+            else:
+                self.console.print("[red]✗ Initial execution failed[/red]\n")
+
+            while True:
+                changes = await self._next_changes()
+                affected = index.affected(changes)
+                if not affected:
+                    continue
+                self._display_changes(changes)
 
+                success = await loop.run_in_executor(None, execute_callback, affected, False)
                 if success:
                     self.console.print("[green]✓ Execution completed successfully[/green]\n")
                 else:
                     self.console.print("[red]✗ Execution failed[/red]\n")
 
-                # Update tracking
-                self._last_execution = current_time
-                self._pending_changes.clear()
-
         except KeyboardInterrupt:
             self.console.print("\n[yellow]⊘ Watch mode stopped by user[/yellow]")
+        finally:
+            collector.cancel()
 
-    def _filter_changes(self, changes: Set) -> Set[Path]:
+    def _start_collecting(
+        self, watch_dir: Path, roots: Optional[List[Path]] = None
+    ) -> "asyncio.Future[None]":
         """
-        Filter changes based on watch patterns.
+        Show what is being watched and start consuming its events.
 
         Args:
-            changes: Set of (Change, path) tuples from watchfiles
+            watch_dir: Directory the patterns are relative to
+            roots: Directories to watch (default: those of the patterns)
 
         Returns:
-            Set of Path objects that match watch patterns
+            The collector, to cancel when watch mode ends
         """
-        relevant = set()
+        if roots is None:
+            assert isinstance(self.matcher, WatchMatcher)
+            self.matcher.base = watch_dir
+            roots = self.matcher.roots(watch_dir)
 
-        for change_type, path_str in changes:
-            path = Path(path_str)
+        self.console.print("[cyan]👀 Watching for changes...[/cyan]")
+        self.console.print(f"[dim]Directory: {watch_dir}[/dim]")
+        if roots != [watch_dir.resolve()]:
+            self.console.print(f"[dim]Watching: {', '.join(str(root) for root in roots)}[/dim]")
+        self.console.print(f"[dim]Patterns: {', '.join(self.patterns)}[/dim]")
+        self.console.print()
 
-            # Skip hidden files and directories
-            if any(part.startswith(".") for part in path.parts):
-                continue
+        self._changed = asyncio.Event()
+        return asyncio.ensure_future(self._collect(roots))
 
-            # Skip common build/cache directories
-            skip_dirs = {
-                "__pycache__",
-                "node_modules",
-                ".git",
-                ".venv",
-                "venv",
-                "dist",
-                "build",
-                ".pytest_cache",
-                ".mypy_cache",
-                ".ruff_cache",
-            }
-            if any(skip_dir in path.parts for skip_dir in skip_dirs):
-                continue
+    async def _collect(self, roots: List[Path]) -> None:
+        """
+        Consume file system events for as long as watch mode runs.
 
-            # Check if file matches any pattern
-            for pattern in self.patterns:
-                if path.match(pattern):
-                    relevant.add(path)
-                    break
+        Relevant changes are added to the pending set, even while the task
+        runs, and signalled through ``_changed``.
+
+        Directories without ignored directories below them are watched
+        recursively. The others (typically the project root, next to
+        ``node_modules`` or ``.venv``) are watched on their own, and their
+        other subdirectories recursively, so the operating system never
+        watches ignored trees. Directories created in them later are watched
+        as they appear.
+
+        Args:
+            roots: Directories to watch
+        """
+        recursive, flat = _watch_plan(roots, self.matcher.ignores_dir)
+        added: List[asyncio.Future[None]] = []
+        try:
+            streams = []
+            if recursive:
+                streams.append(self._collect_tree(recursive))
+            if flat:
+                streams.append(self._collect_flat(flat, added))
+            await asyncio.gather(*streams)
+        finally:
+            for collector in added:
+                collector.cancel()
+
+    async def _collect_tree(self, directories: List[Path]) -> None:
+        """Consume the events of directories watched recursively."""
+        paths = [str(directory) for directory in directories]
+        # Irrelevant changes are dropped by the filter, before a batch is yielded
+        async for changes in awatch(*paths, watch_filter=self._watch_filter, recursive=True):
+            self._add_changes(Path(path) for _, path in changes)
+
+    async def _collect_flat(
+        self, directories: List[Path], added: List["asyncio.Future[None]"]
+    ) -> None:
+        """
+        Consume the events of directories watched without their subdirectories.
+
+        Args:
+            directories: Directories to watch
+            added: Receives the collectors of directories created meanwhile
+        """
+
+        def relevant(change: Change, path: str) -> bool:
+            return self._watch_filter(change, path) or self._is_new_directory(change, path)
+
+        paths = [str(directory) for directory in directories]
+        async for changes in awatch(*paths, watch_filter=relevant, recursive=False):
+            new = [Path(path) for change, path in changes if self._is_new_directory(change, path)]
+            self._add_changes(Path(path) for _, path in changes if self.matcher.matches(path))
+            for directory in new:
+                added.append(asyncio.ensure_future(self._collect_tree([directory])))
+                # Files may have been written before the watch started
+                self._add_changes(_matching_files(directory, self.matcher))
+
+    def _is_new_directory(self, change: Change, path: str) -> bool:
+        """Check whether a change is a directory, not ignored, being created."""
+        return (
+            change == Change.added
+            and not self.matcher.ignores_dir(os.path.basename(path))
+            and os.path.isdir(path)
+        )
+
+    def _add_changes(self, paths: Iterable[Path]) -> None:
+        """
+        Add changed paths to the pending set and signal them.
+
+        Args:
+            paths: Changed paths
+        """
+        changed = set(paths)
+        if self._changed is None or not changed:
+            return
+        now = time.monotonic()
+        if not self._pending_changes:
+            self._first_change = now
+        self._last_change = now
+        self._pending_changes.update(changed)
+        self._changed.set()
+
+    async def _next_changes(self) -> Set[Path]:
+        """
+        Wait for the next batch of relevant changes.
+
+        The batch is taken on the trailing edge: once no change has come in
+        for ``debounce_ms``, or at the latest ``max_wait`` after its first
+        change. Changes collected while the task ran are taken as soon as they
+        have settled, so however many there were they make a single run.
+
+        Returns:
+            Changed paths collected since the previous batch
+        """
+        assert self._changed is not None
+        while True:
+            self._changed.clear()
+            if not self._pending_changes:
+                await self._changed.wait()
+                continue
+            due = min(self._last_change + self.debounce_ms, self._first_change + self.max_wait)
+            delay = due - time.monotonic()
+            if delay <= 0:
+                break
+            try:
+                # Woken early by a newer change, which postpones the batch
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except asyncio.TimeoutError:
+                break
+
+        changes = set(self._pending_changes)
+        self._pending_changes.clear()
+        return changes
+
+    def _report_exit(self, task: Task, returncode: int) -> None:
+        """Report a supervised task that exited on its own."""
+        if returncode == 0:
+            self.console.print(f"[green]✓ Task '{task.name}' exited[/green]")
+        else:
+            self.console.print(f"[red]✗ Task '{task.name}' exited with code {returncode}[/red]")
+        self.console.print("[dim]Waiting for changes...[/dim]\n")
 
-        return relevant
+    def _watch_filter(self, _change: Change, path: str) -> bool:
+        """Filter given to watchfiles, so it only reports relevant changes."""
+        return self.matcher.matches(path)
 
     def _display_changes(self, changes: Set[Path]) -> None:
         """
@@ -173,12 +587,156 @@ class FileWatcher:
         self.console.print()
 
 
+def _watch_plan(
+    roots: Iterable[Path], ignores_dir: Callable[[str], bool]
+) -> Tuple[List[Path], List[Path]]:
+    """
+    Split the watched trees so that no ignored directory is part of them.
+
+    Args:
+        roots: Directories to watch
+        ignores_dir: Whether a directory name is ignored
+
+    Returns:
+        Directories to watch recursively, and directories to watch without
+        their subdirectories (those with an ignored directory below them)
+    """
+    recursive: List[Path] = []
+    flat: List[Path] = []
+    for root in roots:
+        # Directories containing ignored ones, directly or further down
+        split: Set[str] = set()
+        for current, dirnames, _ in os.walk(root):
+            kept = [name for name in dirnames if not ignores_dir(name)]
+            if len(kept) != len(dirnames):
+                directory = current
+                while directory not in split:
+                    split.add(directory)
+                    if directory == str(root):
+                        break
+                    directory = os.path.dirname(directory)
+            dirnames[:] = sorted(kept)
+
+        pending = [str(root)]
+        while pending:
+            directory = pending.pop(0)
+            if directory not in split:
+                recursive.append(Path(directory))
+                continue
+            flat.append(Path(directory))
+            with os.scandir(directory) as entries:
+                pending.extend(
+                    sorted(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False) and not ignores_dir(entry.name)
+                    )
+                )
+    return recursive, flat
+
+
+def _matching_files(directory: Path, matcher: Union["WatchMatcher", "WatchIndex"]) -> List[Path]:
+    """Find the relevant files already in a directory."""
+    found: List[Path] = []
+    for current, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [name for name in dirnames if not matcher.ignores_dir(name)]
+        found.extend(
+            Path(current, name)
+            for name in filenames
+            if matcher.matches(os.path.join(current, name))
+        )
+    return found
+
+
+def _outermost(paths: Iterable[Path]) -> List[Path]:
+    """Drop duplicates and paths inside other paths (shallowest first)."""
+    kept: List[Path] = []
+    for path in sorted(set(paths), key=lambda path: (len(path.parts), path)):
+        if not any(path == other or other in path.parents for other in kept):
+            kept.append(path)
+    return kept
+
+
+def _normalize_pattern(pattern: str) -> str:
+    """Use forward slashes, drop "./" and make "dir/" mean everything below dir."""
+    pattern = _posix(pattern)
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+    if pattern.endswith("/"):
+        pattern += "**"
+    return pattern
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a normalized glob into a regular expression over posix paths.
+
+    Args:
+        pattern: Pattern from ``_normalize_pattern``
+
+    Returns:
+        Regular expression source, for ``fullmatch``
+    """
+    segments = [segment for segment in pattern.split("/") if segment]
+    parts = ["/"] if pattern.startswith("/") else []
+    if "/" not in pattern.lstrip("/"):
+        # A bare file name pattern matches in any directory
+        parts.append("(?:[^/]+/)*")
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            parts.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            parts.append(_segment_to_regex(segment) + ("" if last else "/"))
+    return "".join(parts)
+
+
+def _segment_to_regex(segment: str) -> str:
+    """Translate one path component of a glob (``*``, ``?``, ``[...]``)."""
+    parts = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        index += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            start = index + 1 if segment[index : index + 1] in ("!", "^") else index
+            end = segment.find("]", start + 1 if segment[start : start + 1] == "]" else start)
+            if end == -1:
+                parts.append(re.escape(char))
+                continue
+            content = segment[index:end].replace("\\", "\\\\")
+            if content[:1] in ("!", "^"):
+                content = "^" + content[1:]
+            parts.append(f"[{content}]")
+            index = end + 1
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def _alternation(expressions: List[str]) -> Optional[Pattern[str]]:
+    """Compile regular expressions into one matching any of them."""
+    if not expressions:
+        return None
+    return re.compile("|".join(f"(?:{expression})" for expression in expressions))
+
+
+def _posix(path: str) -> str:
+    """Use forward slashes on every platform."""
+    return path.replace(os.sep, "/") if os.sep != "/" else path
+
+
 def watch_task_sync(
     task: Task,
-    execute_callback: Callable[[], bool],
+    execute_callback: Optional[Callable[[], bool]] = None,
     patterns: Optional[List[str]] = None,
     cwd: Optional[str] = None,
     console: Optional[Console] = None,
+    supervisor: Optional[ProcessSupervisor] = None,
 ) -> None:
     """
     Synchronous wrapper for watch mode.
@@ -189,6 +747,11 @@ def watch_task_sync(
         patterns: List of glob patterns to watch (defaults to task.watch)
         cwd: Working directory
         console: Rich console for output
+        supervisor: Runs the task as a process restarted on changes
+            (instead of calling ``execute_callback``)
+
+    Raises:
+        ValueError: If there are no patterns, or neither a callback nor a supervisor
     """
     # Use task's watch patterns if not provided
     if patterns is None:
@@ -198,4 +761,29 @@ def watch_task_sync(
         raise ValueError(f"Task '{task.name}' has no watch patterns defined")
 
     watcher = FileWatcher(patterns=patterns, console=console)
-    asyncio.run(watcher.watch_and_execute(task, execute_callback, cwd))
+    if supervisor is not None:
+        asyncio.run(watcher.watch_and_restart(task, supervisor, cwd))
+    elif execute_callback is not None:
+        asyncio.run(watcher.watch_and_execute(task, execute_callback, cwd))
+    else:
+        raise ValueError("Either execute_callback or supervisor is required")
+
+
+def watch_affected_sync(
+    index: WatchIndex,
+    execute_callback: Callable[[List[str], bool], bool],
+    cwd: Optional[str] = None,
+    console: Optional[Console] = None,
+) -> None:
+    """
+    Synchronous wrapper for watching several tasks.
+
+    Args:
+        index: Watched tasks and their patterns
+        execute_callback: Called with the tasks to run and whether this is the initial run
+        cwd: Working directory shown as the watched directory
+        console: Rich console for output
+    """
+    patterns = [pattern for matcher in index.matchers.values() for pattern in matcher.patterns]
+    watcher = FileWatcher(patterns=list(dict.fromkeys(patterns)), console=console)
+    asyncio.run(watcher.watch_affected(index, execute_callback, cwd))
@@ -167,6 +167,32 @@ class PlatformUtils:
         """
         return Path.home()
 
+    @staticmethod
+    def get_cache_dir() -> Path:
+        """
+        Get the per-user cache directory for taskx.
+
+        Honors ``TASKX_CACHE_DIR``, then the platform convention
+        (``%LOCALAPPDATA%`` on Windows, ``~/Library/Caches`` on macOS,
+        ``$XDG_CACHE_HOME`` or ``~/.cache`` elsewhere).
+
+        Returns:
+            Path to the cache directory (not created)
+        """
+        override = os.environ.get("TASKX_CACHE_DIR")
+        if override:
+            return Path(override)
+
+        if PlatformUtils.is_windows():
+            base = os.environ.get("LOCALAPPDATA")
+            root = Path(base) if base else Path.home() / "AppData" / "Local"
+            return root / "taskx" / "Cache"
+        if PlatformUtils.is_macos():
+            return Path.home() / "Library" / "Caches" / "taskx"
+
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        return (Path(xdg) if xdg else Path.home() / ".cache") / "taskx"
+
     @staticmethod
     def get_cwd() -> Path:
         """
@@ -4,11 +4,32 @@ Secure command execution utilities.
 Provides layered security for command execution while maintaining functionality.
 """
 
+import asyncio
+import functools
 import os
 import re
 import shlex
+import signal
 import subprocess
-from typing import List, Optional, Tuple
+import time
+from typing import IO, Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Callback receiving (stream name, line) for streamed child output
+OutputCallback = Callable[[str, str], None]
+
+# Callback receiving the time in seconds it took to start the child process
+SpawnCallback = Callable[[float], None]
+
+_READ_SIZE = 64 * 1024
+
+# Output without a newline is passed on in pieces of this size (progress bars, binary data)
+MAX_LINE_SIZE = 1024 * 1024
+
+# Distinct command strings whose validation verdict is remembered
+VERDICT_CACHE_SIZE = 4096
+
+# (regex, description) pairs as listed on SecureCommandExecutor
+PatternList = Tuple[Tuple[str, str], ...]
 
 
 class SecurityError(Exception):
@@ -17,6 +38,107 @@ class SecurityError(Exception):
     pass
 
 
+class SecurityRules:
+    """
+    Forbidden and suspicious patterns compiled into a single matcher.
+
+    Every rule becomes a named group (``forbidden_<i>``/``suspicious_<i>``)
+    of one alternation, guarded by a lookahead on the characters rules can
+    start with, so a command that matches nothing (the common case) is
+    scanned once. Only when the combined matcher hits are the rules of that
+    kind checked one by one, to report every suspicious pattern and the
+    first forbidden one in list order. Verdicts are memoized per command.
+    """
+
+    def __init__(self, forbidden: PatternList, suspicious: PatternList):
+        """
+        Compile rules.
+
+        Args:
+            forbidden: Patterns that block a command (matched case-insensitively)
+            suspicious: Patterns that only produce a warning
+        """
+        self.forbidden = [(re.compile(p, re.IGNORECASE), d) for p, d in forbidden]
+        self.suspicious = [(re.compile(p), d) for p, d in suspicious]
+        self.matcher = self._combine(forbidden, suspicious)
+        self.scan = functools.lru_cache(maxsize=VERDICT_CACHE_SIZE)(self._scan)
+
+    @staticmethod
+    def _combine(forbidden: PatternList, suspicious: PatternList) -> Optional["re.Pattern[str]"]:
+        """Join all rules into one regex with a named group per rule."""
+        groups = [f"(?P<forbidden_{i}>(?i:{p}))" for i, (p, _) in enumerate(forbidden)]
+        groups += [f"(?P<suspicious_{i}>{p})" for i, (p, _) in enumerate(suspicious)]
+        if not groups:
+            return None
+
+        leading = set()
+        for pattern, _ in (*forbidden, *suspicious):
+            char = _leading_char(pattern)
+            if char is None:
+                return re.compile("|".join(groups))
+            leading.add(char)
+        # Forbidden rules ignore case, so guard both cases of their first letters
+        leading |= {c.swapcase() for c in leading}
+        guard = "".join(re.escape(c) for c in sorted(leading))
+        return re.compile(f"(?=[{guard}])(?:{'|'.join(groups)})")
+
+    def _scan(self, cmd: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        Check a command against all rules.
+
+        Args:
+            cmd: Command to check
+
+        Returns:
+            Tuple of (description of the forbidden pattern found or None,
+            descriptions of the suspicious patterns found)
+        """
+        if self.matcher is None or not self.matcher.search(cmd):
+            return None, ()
+
+        for regex, description in self.forbidden:
+            if regex.search(cmd):
+                return description, ()
+        return None, tuple(d for regex, d in self.suspicious if regex.search(cmd))
+
+
+def _leading_char(pattern: str) -> Optional[str]:
+    """
+    Character every match of a pattern starts with, if it's a plain literal.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        The literal first character, or None if the pattern may start otherwise
+    """
+    if pattern[:1] == "\\" and len(pattern) > 1 and not pattern[1].isalnum():
+        char, rest = pattern[1], pattern[2:]
+    elif pattern[:1] and pattern[0] not in ".^$*+?{}[]()|\\":
+        char, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    # A quantified first character or a top-level alternative may not match first
+    if rest[:1] in ("?", "*", "{") or "\\\\" in pattern or re.search(r"(?<!\\)\|", pattern):
+        return None
+    return char
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rules(forbidden: PatternList, suspicious: PatternList) -> SecurityRules:
+    """
+    Get the compiled rules for a set of patterns (compiled once per set).
+
+    Args:
+        forbidden: Patterns that block a command
+        suspicious: Patterns that only produce a warning
+
+    Returns:
+        Compiled rules
+    """
+    return SecurityRules(forbidden, suspicious)
+
+
 class SecureCommandExecutor:
     """
     Secure command executor with multiple security layers.
@@ -99,16 +221,25 @@ class SecureCommandExecutor:
         (r"\$\([^)]*\)", "Command substitution with $() (security risk)"),
     ]
 
-    def __init__(self, strict_mode: bool = False, allow_warnings: bool = True):
+    def __init__(
+        self,
+        strict_mode: bool = False,
+        allow_warnings: bool = True,
+        stdout: Optional[IO[Any]] = None,
+    ):
         """
         Initialize secure executor.
 
         Args:
             strict_mode: If True, only whitelisted commands allowed
             allow_warnings: If True, show security warnings but allow execution
+            stdout: Stream receiving the output of commands and security
+                warnings (default: the inherited stdout)
         """
         self.strict_mode = strict_mode
         self.allow_warnings = allow_warnings
+        self.stdout = stdout
+        self.rules = compile_rules(tuple(self.FORBIDDEN_PATTERNS), tuple(self.SUSPICIOUS_PATTERNS))
 
     def validate_command(self, cmd: str) -> Tuple[bool, List[str]]:
         """
@@ -123,21 +254,18 @@ class SecureCommandExecutor:
         Raises:
             SecurityError: If command matches forbidden pattern
         """
-        warnings = []
+        forbidden, suspicious = self.rules.scan(cmd)
 
-        # Check forbidden patterns (always blocked)
-        for pattern, description in self.FORBIDDEN_PATTERNS:
-            if re.search(pattern, cmd, re.IGNORECASE):
-                raise SecurityError(
-                    f"Forbidden command pattern detected: {description}\\n"
-                    f"Command: {cmd}\\n"
-                    f"This command is blocked for security reasons."
-                )
+        # Forbidden patterns are always blocked
+        if forbidden is not None:
+            raise SecurityError(
+                f"Forbidden command pattern detected: {forbidden}\\n"
+                f"Command: {cmd}\\n"
+                f"This command is blocked for security reasons."
+            )
 
-        # Check suspicious patterns (warnings)
-        for pattern, description in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, cmd):
-                warnings.append(f"Suspicious pattern: {description}")
+        # Suspicious patterns only warn
+        warnings = [f"Suspicious pattern: {description}" for description in suspicious]
 
         # Check whitelist in strict mode
         if self.strict_mode:
@@ -156,11 +284,12 @@ class SecureCommandExecutor:
     def execute(
         self,
         cmd: str,
-        env: Optional[dict] = None,
+        env: Optional[Mapping[str, str]] = None,
         cwd: Optional[str] = None,
         timeout: Optional[int] = None,
         shell: bool = True,
-    ) -> subprocess.CompletedProcess:
+        on_spawn: Optional[SpawnCallback] = None,
+    ) -> "subprocess.CompletedProcess[str]":
         """
         Execute command with security validation.
 
@@ -170,10 +299,125 @@ class SecureCommandExecutor:
             cwd: Working directory
             timeout: Timeout in seconds
             shell: Whether to use shell (default: True for compatibility)
+            on_spawn: Called with the process start latency once the child runs
 
         Returns:
             CompletedProcess result
 
+        Raises:
+            SecurityError: If command fails security validation
+            subprocess.TimeoutExpired: If the command exceeds its timeout
+        """
+        safe_env = self._prepare(cmd, env)
+
+        # Same semantics as subprocess.run, with the spawn timed separately
+        spawn_start = time.perf_counter()
+        with subprocess.Popen(
+            cmd, shell=shell, env=safe_env, cwd=cwd, stdout=self.stdout, text=True
+        ) as process:
+            if on_spawn:
+                on_spawn(time.perf_counter() - spawn_start)
+            try:
+                returncode = process.wait(timeout=timeout or 300)  # 5-minute default timeout
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+
+        return subprocess.CompletedProcess(cmd, returncode)
+
+    async def execute_async(
+        self,
+        cmd: str,
+        env: Optional[Mapping[str, str]] = None,
+        cwd: Optional[str] = None,
+        timeout: Optional[int] = None,
+        shell: bool = True,
+        on_output: Optional[OutputCallback] = None,
+        on_spawn: Optional[SpawnCallback] = None,
+    ) -> "subprocess.CompletedProcess[str]":
+        """
+        Execute command with security validation without blocking the event loop.
+
+        The child runs in its own process group so that a timeout or a
+        cancellation kills the whole process tree, not just the shell.
+
+        Args:
+            cmd: Command to execute
+            env: Environment variables
+            cwd: Working directory
+            timeout: Timeout in seconds
+            shell: Whether to use shell (default: True for compatibility)
+            on_output: If given, stdout/stderr are piped and every line is
+                passed to this callback as (stream, line) while the command runs
+            on_spawn: Called with the process start latency once the child runs
+
+        Returns:
+            CompletedProcess result
+
+        Raises:
+            SecurityError: If command fails security validation
+            subprocess.TimeoutExpired: If the command exceeds its timeout
+        """
+        safe_env = self._prepare(cmd, env)
+        timeout = timeout or 300  # 5-minute default timeout
+
+        stdout = asyncio.subprocess.PIPE if on_output else self.stdout
+        stderr = asyncio.subprocess.PIPE if on_output else None
+        new_session = os.name == "posix"
+        spawn_start = time.perf_counter()
+        if shell:
+            process = await asyncio.create_subprocess_shell(
+                cmd,
+                env=safe_env,
+                cwd=cwd,
+                stdout=stdout,
+                stderr=stderr,
+                start_new_session=new_session,
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                *shlex.split(cmd),
+                env=safe_env,
+                cwd=cwd,
+                stdout=stdout,
+                stderr=stderr,
+                start_new_session=new_session,
+            )
+        if on_spawn:
+            on_spawn(time.perf_counter() - spawn_start)
+
+        waiters: List[Awaitable[object]] = [process.wait()]
+        if on_output:
+            assert process.stdout is not None and process.stderr is not None
+            waiters.append(self._pump_lines(process.stdout, "stdout", on_output))
+            waiters.append(self._pump_lines(process.stderr, "stderr", on_output))
+        completion = asyncio.ensure_future(asyncio.gather(*waiters))
+
+        try:
+            await asyncio.wait_for(asyncio.shield(completion), timeout)
+        except asyncio.TimeoutError:
+            await self._kill(process, completion)
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        except asyncio.CancelledError:
+            await self._kill(process, completion)
+            raise
+
+        assert process.returncode is not None
+        return subprocess.CompletedProcess(cmd, process.returncode)
+
+    def _prepare(self, cmd: str, env: Optional[Mapping[str, str]]) -> Dict[str, str]:
+        """
+        Validate a command and build the environment it runs with.
+
+        Args:
+            cmd: Command to execute
+            env: Variables added to os.environ, or a complete layered
+                environment (anything with a ``materialize()`` method)
+
+        Returns:
+            Environment for the child process
+
         Raises:
             SecurityError: If command fails security validation
         """
@@ -182,22 +426,85 @@ class SecureCommandExecutor:
 
         # Show warnings if enabled
         if warnings and self.allow_warnings:
-            print(f"⚠️  Security warnings for command: {cmd}")
+            print(f"⚠️  Security warnings for command: {cmd}", file=self.stdout)
             for warning in warnings:
-                print(f"   - {warning}")
-            print()
+                print(f"   - {warning}", file=self.stdout)
+            print(file=self.stdout)
+
+        # A layered task environment already contains os.environ: flatten it once
+        materialize = getattr(env, "materialize", None)
+        if materialize is not None:
+            layered: Dict[str, str] = materialize()
+            return layered
 
         # Execute with security measures
         safe_env = os.environ.copy()
         if env:
             safe_env.update(env)
 
-        return subprocess.run(
-            cmd,
-            shell=shell,
-            env=safe_env,
-            cwd=cwd,
-            timeout=timeout or 300,  # 5-minute default timeout
-            capture_output=False,
-            text=True,
-        )
+        return safe_env
+
+    @staticmethod
+    async def _kill(
+        process: "asyncio.subprocess.Process", completion: "asyncio.Future[List[object]]"
+    ) -> None:
+        """Kill a child process and its process group, then reap it."""
+        if process.returncode is None or os.name == "posix":
+            try:
+                if os.name == "posix":
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except (ProcessLookupError, PermissionError):
+                pass
+        try:
+            # Pipes close once the whole group is gone
+            await asyncio.wait_for(completion, 5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            completion.cancel()
+            await process.wait()
+
+    @staticmethod
+    async def _pump_lines(
+        reader: asyncio.StreamReader, stream: str, on_line: OutputCallback
+    ) -> None:
+        """
+        Read a child pipe to EOF, calling ``on_line`` for every complete line.
+
+        Reads fixed-size chunks rather than ``readline`` so arbitrarily long
+        lines never overrun the stream buffer limit. An unfinished line is held
+        until it reaches ``MAX_LINE_SIZE`` bytes, then passed on in pieces, so
+        memory stays bounded for output without newlines.
+
+        Args:
+            reader: Child stdout or stderr pipe
+            stream: Stream name passed to ``on_line``
+            on_line: Callback receiving (stream, line)
+        """
+        pending = bytearray()
+        while True:
+            chunk = await reader.read(_READ_SIZE)
+            if not chunk:
+                break
+            # Only the new chunk can contain the end of the pending line
+            search = len(pending)
+            pending += chunk
+            start = 0
+            while True:
+                end = pending.find(b"\n", search)
+                if end < 0:
+                    break
+                on_line(stream, _decode_line(pending[start:end]))
+                start = search = end + 1
+            while len(pending) - start >= MAX_LINE_SIZE:
+                on_line(stream, _decode_line(pending[start : start + MAX_LINE_SIZE]))
+                start += MAX_LINE_SIZE
+            del pending[:start]
+
+        if pending:
+            on_line(stream, _decode_line(pending))
+
+
+def _decode_line(line: bytearray) -> str:
+    """Decode a line of child output, dropping the carriage return of a CRLF ending."""
+    return line.decode(errors="replace").rstrip("\r")
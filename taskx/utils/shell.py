@@ -4,9 +4,13 @@ Shell command utilities with security features.
 Provides safe command execution and validation.
 """
 
+import functools
 import re
 import shlex
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional, Tuple
+
+# Distinct command strings whose safety verdict is remembered
+SAFETY_CACHE_SIZE = 4096
 
 
 class ShellValidator:
@@ -36,12 +40,7 @@ class ShellValidator:
             True if safe, False if potentially dangerous
         """
         # Check for dangerous command patterns
-        cmd_lower = cmd.lower().strip()
-        for dangerous in ShellValidator.DANGEROUS_COMMANDS:
-            if dangerous.lower() in cmd_lower:
-                return False
-
-        return True
+        return _dangerous_matcher(tuple(ShellValidator.DANGEROUS_COMMANDS)).is_safe(cmd)
 
     @staticmethod
     def sanitize_command(cmd: str) -> str:
@@ -67,6 +66,27 @@ class ShellValidator:
         return cmd
 
 
+class _DangerousCommandMatcher:
+    """Case-insensitive search for any of the dangerous commands in one pass."""
+
+    def __init__(self, dangerous: Tuple[str, ...]):
+        self._regex = (
+            re.compile("|".join(re.escape(d) for d in dangerous), re.IGNORECASE)
+            if dangerous
+            else None
+        )
+        self.is_safe = functools.lru_cache(maxsize=SAFETY_CACHE_SIZE)(self._is_safe)
+
+    def _is_safe(self, cmd: str) -> bool:
+        return self._regex is None or self._regex.search(cmd) is None
+
+
+@functools.lru_cache(maxsize=None)
+def _dangerous_matcher(dangerous: Tuple[str, ...]) -> _DangerousCommandMatcher:
+    """Get the compiled matcher for a list of dangerous commands."""
+    return _DangerousCommandMatcher(dangerous)
+
+
 class CommandBuilder:
     """Builds safe shell commands."""
 
@@ -108,11 +128,97 @@ class CommandBuilder:
         return shlex.quote(arg)
 
 
+class CommandTemplate:
+    """
+    A command string parsed into literal text and ``${VAR}``/``$VAR`` references.
+
+    Parsing happens once; ``expand`` only looks up values and joins the
+    segments. Values are shell-quoted; references to unset variables are
+    kept (quoted) as written.
+    """
+
+    __slots__ = ("source", "variables", "_literals", "_placeholders")
+
+    def __init__(self, source: str):
+        """
+        Parse a command.
+
+        Args:
+            source: Command with placeholders
+        """
+        self.source = source
+        literals: List[str] = []
+        placeholders: List[Tuple[str, str]] = []
+        position = 0
+        for match in _VARIABLE_PATTERN.finditer(source):
+            literals.append(source[position : match.start()])
+            placeholders.append((match.group(1) or match.group(2), match.group(0)))
+            position = match.end()
+        literals.append(source[position:])
+
+        self._literals = tuple(literals)
+        self._placeholders = tuple(placeholders)
+        # Referenced variable names in order of appearance (with repeats)
+        self.variables: Tuple[str, ...] = tuple(name for name, _ in placeholders)
+
+    def expand(self, env: Mapping[str, Any], verbatim: Optional[Mapping[str, str]] = None) -> str:
+        """
+        Substitute variables.
+
+        Args:
+            env: Environment variables
+            verbatim: Values inserted without quoting (already shell-quoted
+                by the caller, e.g. a list of file arguments)
+
+        Returns:
+            Command with expanded and properly escaped variables
+        """
+        if not self._placeholders:
+            return self.source
+
+        parts = [self._literals[0]]
+        for (name, placeholder), literal in zip(self._placeholders, self._literals[1:]):
+            if verbatim and name in verbatim:
+                parts.append(verbatim[name])
+            else:
+                # SECURITY: Properly quote value to prevent command injection
+                parts.append(_quote(str(env.get(name, placeholder))))
+            parts.append(literal)
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        """String representation of template."""
+        return f"CommandTemplate({self.source!r})"
+
+
+# Matches ${VAR} or $VAR
+_VARIABLE_PATTERN = re.compile(r"\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)")
+
+# Distinct command strings whose parsed template is kept
+TEMPLATE_CACHE_SIZE = 4096
+
+_quote = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(shlex.quote)
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(cmd: str) -> CommandTemplate:
+    """
+    Get the parsed template of a command (parsed once per distinct string).
+
+    Args:
+        cmd: Command with placeholders
+
+    Returns:
+        Parsed template
+    """
+    return CommandTemplate(cmd)
+
+
 class EnvironmentExpander:
     """Expands environment variables in commands."""
 
     @staticmethod
-    def expand_variables(cmd: str, env: dict) -> str:
+    def expand_variables(cmd: str, env: Mapping[str, Any]) -> str:
         """
         Expand ${VAR} placeholders in command with proper escaping.
 
@@ -123,16 +229,7 @@ class EnvironmentExpander:
         Returns:
             Command with expanded and properly escaped variables
         """
-        # Pattern to match ${VAR} or $VAR
-        pattern = r"\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)"
-
-        def replace(match: re.Match) -> str:
-            var_name = match.group(1) or match.group(2)
-            value = env.get(var_name, match.group(0))
-            # SECURITY: Properly quote value to prevent command injection
-            return shlex.quote(str(value))
-
-        return re.sub(pattern, replace, cmd)
+        return compile_template(cmd).expand(env)
 
     @staticmethod
     def find_variables(cmd: str) -> List[str]:
@@ -145,6 +242,4 @@ class EnvironmentExpander:
         Returns:
             List of variable names found
         """
-        pattern = r"\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)"
-        matches = re.findall(pattern, cmd)
-        return [m[0] or m[1] for m in matches]
+        return list(compile_template(cmd).variables)
@@ -32,16 +32,13 @@ class ConfigValidator:
         self._validate_task_names(config)
 
     def _check_circular_dependencies(self, config: "Config") -> None:
-        """Check for circular dependencies in tasks."""
+        """Check for circular dependencies in tasks (single linear-time pass)."""
         from taskx.core.dependency import DependencyResolver
 
-        resolver = DependencyResolver(config.tasks)
-
-        for task_name in config.tasks:
-            try:
-                resolver.resolve_dependencies(task_name)
-            except ValueError as e:
-                raise ValueError(f"Circular dependency detected: {e}") from e
+        cycles = DependencyResolver(config.tasks).find_circular_dependencies()
+        if cycles:
+            details = "; ".join(" -> ".join(cycle) for cycle in cycles)
+            raise ValueError(f"Circular dependency detected: {details}")
 
     def _validate_task_references(self, config: "Config") -> None:
         """Validate that all task dependencies exist."""
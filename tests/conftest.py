@@ -387,6 +387,19 @@ def empty_project(temp_dir: Path) -> Path:
 # ============================================================================
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Generator[Path, None, None]:
+    """Keep taskx's per-user cache out of the real home directory."""
+    cache_dir = tmp_path_factory.mktemp("taskx-cache")
+    previous = os.environ.get("TASKX_CACHE_DIR")
+    os.environ["TASKX_CACHE_DIR"] = str(cache_dir)
+    yield cache_dir
+    if previous is None:
+        os.environ.pop("TASKX_CACHE_DIR", None)
+    else:
+        os.environ["TASKX_CACHE_DIR"] = previous
+
+
 @pytest.fixture(autouse=True)
 def cleanup_env(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
     """Clean up environment variables after each test."""
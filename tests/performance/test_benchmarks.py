@@ -9,7 +9,17 @@ import pytest
 from taskx.completion.bash import BashCompletion
 from taskx.core.config import Config
 from taskx.core.runner import TaskRunner
+from taskx.core.task import Task
 from taskx.templates import get_template
+from taskx.utils.secure_exec import SecureCommandExecutor
+from taskx.utils.shell import ShellValidator
+
+
+def assert_mean_below(benchmark, seconds):
+    """Assert the mean run time, when benchmarking is enabled (not under xdist)."""
+    if benchmark.disabled or benchmark.stats is None:
+        return
+    assert benchmark.stats.stats.mean < seconds
 
 # ============================================================================
 # Configuration Loading Benchmarks
@@ -400,6 +410,71 @@ build = "echo build"
         benchmark(load_10_times)
 
 
+# ============================================================================
+# Security Validation Benchmarks
+# ============================================================================
+
+
+@pytest.mark.performance
+class TestSecurityValidationPerformance:
+    """Benchmark command validation for large generated command sets."""
+
+    def test_benchmark_validate_10k_distinct_commands(self, benchmark):
+        """Benchmark validating 10,000 distinct commands (no verdict reuse)."""
+        executor = SecureCommandExecutor()
+        commands = [f"pytest tests/shard_{i} -k 'not slow' --maxfail={i % 5}" for i in range(10000)]
+
+        def validate_all():
+            executor.rules.scan.cache_clear()
+            for cmd in commands:
+                executor.validate_command(cmd)
+                ShellValidator.is_safe_command(cmd)
+
+        benchmark(validate_all)
+
+        # One combined scan per command (previously 14 regex searches)
+        assert_mean_below(benchmark, 0.5)
+
+    def test_benchmark_validate_10k_repeated_commands(self, benchmark):
+        """Benchmark 10,000 validations of 100 commands (matrix expansion)."""
+        executor = SecureCommandExecutor()
+        commands = [f"tox -e py3{i % 10} -- tests/part_{i // 10}" for i in range(100)] * 100
+
+        def validate_all():
+            for cmd in commands:
+                executor.validate_command(cmd)
+                ShellValidator.is_safe_command(cmd)
+
+        benchmark(validate_all)
+
+        assert_mean_below(benchmark, 0.1)
+
+
+# ============================================================================
+# Variable Expansion Benchmarks
+# ============================================================================
+
+
+@pytest.mark.performance
+class TestExpansionPerformance:
+    """Benchmark expanding the same command template many times."""
+
+    def test_benchmark_expand_template_10k_times(self, benchmark):
+        """Benchmark 10,000 expansions of a parsed template (matrix fan-out)."""
+        task = Task(name="test", cmd="pytest ${TEST_DIR} --python ${PYTHON} -n $WORKERS")
+        template = task.template(task.cmd)
+        envs = [{"TEST_DIR": "tests", "PYTHON": f"3.{i % 4 + 9}", "WORKERS": "4"} for i in range(100)]
+
+        def expand_all():
+            for _ in range(100):
+                for env in envs:
+                    template.expand(env)
+
+        benchmark(expand_all)
+
+        assert_mean_below(benchmark, 0.1)
+
+
 # ============================================================================
 # CLI Performance Benchmarks
 # ============================================================================
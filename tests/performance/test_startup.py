@@ -0,0 +1,98 @@
+"""
+CLI startup benchmarks for taskx.
+
+Shell completion runs the CLI on every keypress, so importing the entry
+point must not pull in the task runner, templates or watch mode.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Modules only subcommands that actually run tasks may import
+HEAVY_MODULES = [
+    "asyncio",
+    "jinja2",
+    "questionary",
+    "rich.console",
+    "watchfiles",
+    "taskx.core.runner",
+    "taskx.templates",
+]
+
+
+def _python(code: str) -> str:
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=60, check=True
+    )
+    return result.stdout
+
+
+@pytest.mark.performance
+class TestStartupPerformance:
+    """Benchmark cold CLI startup."""
+
+    def test_cli_import_is_lazy(self):
+        """Test that importing the CLI doesn't import heavy modules."""
+        loaded = json.loads(
+            _python(
+                "import json, sys\n"
+                "import taskx.cli.main\n"
+                f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+            )
+        )
+
+        assert loaded == []
+
+    def test_list_names_only_is_lazy(self, temp_dir):
+        """Test that completion's task listing only loads the config."""
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text('[tool.taskx.tasks]\nbuild = "echo build"\n')
+
+        output = _python(
+            "import json, sys\n"
+            "from taskx.cli.main import cli\n"
+            "try:\n"
+            f"    cli(['--config', {str(config_path)!r}, 'list', '--names-only'], obj={{}})\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        names, loaded = output.splitlines()
+
+        assert names == "build"
+        assert json.loads(loaded) == []
+
+    def test_lazy_commands_are_registered(self, cli_runner):
+        """Test that lazily loaded commands are listed and invocable."""
+        from taskx.cli.main import cli
+
+        result = cli_runner.invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name in ("watch", "graph", "history", "logs", "daemon", "completion"):
+            assert name in result.output
+
+        result = cli_runner.invoke(cli, ["completion", "--help"])
+        assert result.exit_code == 0
+
+    def test_benchmark_cli_import(self):
+        """Benchmark a cold ``import taskx.cli.main`` (best of 5)."""
+        baseline = self._best_of(5, "pass")
+        startup = self._best_of(5, "import taskx.cli.main")
+
+        # Generous bound for slow CI machines; typical is well under 50ms
+        elapsed = startup - baseline
+        assert elapsed < 0.5, f"taskx.cli.main import took {elapsed * 1000:.1f}ms"
+
+    def _best_of(self, runs: int, code: str) -> float:
+        """Fastest wall-clock time of running code in a fresh interpreter."""
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            _python(code)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
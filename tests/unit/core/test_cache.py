@@ -0,0 +1,140 @@
+"""
+Tests for the incremental task cache.
+"""
+
+from pathlib import Path
+
+from taskx.core.cache import TaskCache
+from taskx.core.config import Config
+from taskx.core.runner import TaskRunner
+from taskx.core.task import Task
+
+
+class TestTaskCache:
+    """Test fingerprinting, recording and restoring."""
+
+    def _cache_and_task(self, temp_dir: Path):
+        (temp_dir / "src").mkdir()
+        (temp_dir / "src" / "a.py").write_text("print('a')")
+        task = Task(name="build", cmd="make", inputs=["src/**/*.py"], outputs=["out/*"])
+        return TaskCache(temp_dir / ".taskx" / "cache"), task
+
+    def test_fingerprint_is_stable(self, temp_dir: Path):
+        """Test that unchanged inputs produce the same key."""
+        cache, task = self._cache_and_task(temp_dir)
+
+        first = cache.fingerprint(task, "make", {}, [], temp_dir)
+        second = cache.fingerprint(task, "make", {}, [], temp_dir)
+
+        assert first == second
+
+    def test_fingerprint_tracks_input_contents(self, temp_dir: Path):
+        """Test that editing an input file changes the key."""
+        cache, task = self._cache_and_task(temp_dir)
+        before = cache.fingerprint(task, "make", {}, [], temp_dir)
+
+        (temp_dir / "src" / "a.py").write_text("print('changed')")
+
+        assert cache.fingerprint(task, "make", {}, [], temp_dir) != before
+
+    def test_fingerprint_tracks_command_and_env(self, temp_dir: Path):
+        """Test that the command and relevant env vars are part of the key."""
+        cache, task = self._cache_and_task(temp_dir)
+        base = cache.fingerprint(task, "make", {"MODE": "dev"}, ["MODE"], temp_dir)
+
+        assert cache.fingerprint(task, "make all", {"MODE": "dev"}, ["MODE"], temp_dir) != base
+        assert cache.fingerprint(task, "make", {"MODE": "prod"}, ["MODE"], temp_dir) != base
+        # Unrelated variables don't invalidate the cache
+        assert cache.fingerprint(task, "make", {"MODE": "dev", "X": "1"}, ["MODE"], temp_dir) == base
+
+    def test_lookup_miss(self, temp_dir: Path):
+        """Test that unknown fingerprints are a miss."""
+        cache, _ = self._cache_and_task(temp_dir)
+        assert cache.lookup("build", "0" * 64) is None
+
+    def test_record_and_restore_outputs(self, temp_dir: Path):
+        """Test that deleted outputs are restored from the object store."""
+        cache, task = self._cache_and_task(temp_dir)
+        (temp_dir / "out").mkdir()
+        (temp_dir / "out" / "app.bin").write_text("binary")
+        key = cache.fingerprint(task, "make", {}, [], temp_dir)
+
+        cache.record(task, key, temp_dir)
+        (temp_dir / "out" / "app.bin").unlink()
+
+        entry = cache.lookup("build", key)
+        assert entry is not None
+        assert list(entry.outputs) == ["out/app.bin"]
+        assert cache.restore(entry, temp_dir) is True
+        assert (temp_dir / "out" / "app.bin").read_text() == "binary"
+
+    def test_restore_fails_when_object_missing(self, temp_dir: Path):
+        """Test that a pruned object store forces a re-run."""
+        cache, task = self._cache_and_task(temp_dir)
+        (temp_dir / "out").mkdir()
+        (temp_dir / "out" / "app.bin").write_text("binary")
+        key = cache.fingerprint(task, "make", {}, [], temp_dir)
+        entry = cache.record(task, key, temp_dir)
+
+        (temp_dir / "out" / "app.bin").unlink()
+        for obj in (cache.cache_dir / "objects").rglob("*"):
+            if obj.is_file():
+                obj.unlink()
+
+        assert cache.restore(entry, temp_dir) is False
+
+
+class TestRunnerCache:
+    """Test up-to-date checks in TaskRunner."""
+
+    def _config(self, temp_dir: Path) -> Config:
+        (temp_dir / "src.txt").write_text("v1")
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(
+            f"""
+[tool.taskx.tasks]
+build = {{ cmd = "cat src.txt >> runs.log && cp src.txt out.txt", cwd = "{temp_dir}", inputs = ["src.txt"], outputs = ["out.txt"] }}
+"""
+        )
+        config = Config(config_path)
+        config.load()
+        return config
+
+    def test_unchanged_task_is_skipped(self, temp_dir: Path):
+        """Test that a second run with the same inputs is skipped."""
+        config = self._config(temp_dir)
+
+        assert TaskRunner(config).run("build") is True
+        assert TaskRunner(config).run("build") is True
+
+        assert (temp_dir / "runs.log").read_text() == "v1"
+
+    def test_changed_input_reruns_task(self, temp_dir: Path):
+        """Test that editing an input triggers a new run."""
+        config = self._config(temp_dir)
+        TaskRunner(config).run("build")
+
+        (temp_dir / "src.txt").write_text("v2")
+        TaskRunner(config).run("build")
+
+        assert (temp_dir / "runs.log").read_text() == "v1v2"
+
+    def test_skipped_task_restores_outputs(self, temp_dir: Path):
+        """Test that a cache hit restores deleted outputs."""
+        config = self._config(temp_dir)
+        TaskRunner(config).run("build")
+
+        (temp_dir / "out.txt").unlink()
+        TaskRunner(config).run("build")
+
+        assert (temp_dir / "out.txt").read_text() == "v1"
+        assert (temp_dir / "runs.log").read_text() == "v1"
+
+    def test_cache_can_be_disabled(self, temp_dir: Path):
+        """Test that use_cache=False always runs the task."""
+        config = self._config(temp_dir)
+
+        TaskRunner(config, use_cache=False).run("build")
+        TaskRunner(config, use_cache=False).run("build")
+
+        assert (temp_dir / "runs.log").read_text() == "v1v1"
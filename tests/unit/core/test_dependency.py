@@ -0,0 +1,157 @@
+"""
+Tests for dependency resolution and cycle detection.
+"""
+
+import pytest
+
+from taskx.core.dependency import CircularDependencyError, DependencyResolver, GraphIndex
+from taskx.core.task import Task
+from taskx.utils.validation import ConfigValidator
+
+
+def _tasks(**depends):
+    return {
+        name: Task(name=name, cmd=f"echo {name}", depends=deps) for name, deps in depends.items()
+    }
+
+
+class TestFindCircularDependencies:
+    """Test whole-graph cycle detection."""
+
+    def test_acyclic_graph_has_no_cycles(self):
+        """Test that a DAG reports nothing."""
+        resolver = DependencyResolver(_tasks(a=[], b=["a"], c=["a", "b"]))
+        assert resolver.find_circular_dependencies() == []
+
+    def test_reports_full_cycle_path(self):
+        """Test that every task on the cycle is named, in order."""
+        resolver = DependencyResolver(_tasks(a=["b"], b=["c"], c=["a"], d=["a"]))
+        assert resolver.find_circular_dependencies() == [["a", "b", "c", "a"]]
+
+    def test_reports_every_cycle(self):
+        """Test that separate cycles and self-loops are all reported."""
+        resolver = DependencyResolver(_tasks(a=["b"], b=["a"], c=["c"], d=["e"], e=["d", "a"]))
+        assert resolver.find_circular_dependencies() == [
+            ["a", "b", "a"],
+            ["c", "c"],
+            ["d", "e", "d"],
+        ]
+
+    def test_missing_dependencies_are_ignored(self):
+        """Test that unknown tasks don't break cycle detection."""
+        resolver = DependencyResolver(_tasks(a=["missing"], b=["a"]))
+        assert resolver.find_circular_dependencies() == []
+
+    def test_deep_chain_does_not_recurse(self):
+        """Test that long chains are handled without hitting the recursion limit."""
+        count = 5000
+        tasks = _tasks(**{f"t{i}": ([f"t{i - 1}"] if i else []) for i in range(count)})
+        tasks["t0"].depends = [f"t{count - 1}"]
+
+        cycles = DependencyResolver(tasks).find_circular_dependencies()
+
+        assert len(cycles) == 1
+        assert len(cycles[0]) == count + 1
+
+    def test_resolve_many_merges_chains(self):
+        """Test that several tasks resolve into one order without duplicates."""
+        resolver = DependencyResolver(_tasks(a=[], b=["a"], c=["a"], d=["b", "c"]))
+
+        assert resolver.resolve_many(["b", "c"]) == ["a", "b", "c"]
+        assert resolver.resolve_many(["d", "a"]) == ["a", "b", "c", "d"]
+
+    def test_resolve_reports_cycle_path(self):
+        """Test that resolving into a cycle names the whole path."""
+        resolver = DependencyResolver(_tasks(a=["b"], b=["c"], c=["b"]))
+        with pytest.raises(CircularDependencyError, match="b -> c -> b"):
+            resolver.resolve_dependencies("a")
+
+
+class TestValidatorCycles:
+    """Test cycle reporting in ConfigValidator."""
+
+    def test_validator_reports_all_cycles(self):
+        """Test that validation names every cycle in a single error."""
+
+        class _Config:
+            tasks = _tasks(a=["b"], b=["a"], c=["c"])
+
+        with pytest.raises(ValueError, match=r"a -> b -> a; c -> c"):
+            ConfigValidator()._check_circular_dependencies(_Config())
+
+
+class TestGraphIndex:
+    """Test the precomputed graph index."""
+
+    def _diamond(self):
+        # lint/test both depend on setup; deploy depends on both
+        return GraphIndex(
+            {"setup": [], "lint": ["setup"], "test": ["setup"], "deploy": ["lint", "test"]}
+        )
+
+    def test_topological_order_and_levels(self):
+        """Test that dependencies come first and levels count the longest chain."""
+        index = self._diamond()
+
+        assert index.order == ["setup", "lint", "test", "deploy"]
+        assert [index.level(name) for name in index.order] == [0, 1, 1, 2]
+        assert index.levels() == [["setup"], ["lint", "test"], ["deploy"]]
+
+    def test_transitive_queries(self):
+        """Test reachability answered from the closure bitsets."""
+        index = self._diamond()
+
+        assert index.depends_on("deploy", "setup") is True
+        assert index.depends_on("setup", "deploy") is False
+        assert index.dependencies("deploy") == ["setup", "lint", "test"]
+        assert index.closure("lint") == {"lint", "setup"}
+        assert index.can_run_parallel("lint", "test") is True
+        assert index.can_run_parallel("lint", "deploy") is False
+        assert index.can_run_parallel("lint", "lint") is False
+
+    def test_with_dependents(self):
+        """Test selecting tasks plus everything that depends on them."""
+        index = self._diamond()
+
+        assert index.with_dependents(["lint"]) == ["lint", "deploy"]
+        assert index.with_dependents(["deploy", "setup"]) == ["setup", "lint", "test", "deploy"]
+        assert index.with_dependents(["unknown"]) == []
+
+    def test_cycle_is_rejected(self):
+        """Test that a cyclic graph cannot be indexed."""
+        with pytest.raises(CircularDependencyError, match="a, b"):
+            GraphIndex({"a": ["b"], "b": ["a"], "c": []})
+
+    def test_critical_path_uses_durations(self):
+        """Test that the heaviest chain wins when durations are known."""
+        index = self._diamond()
+        durations = {"setup": 1.0, "lint": 2.0, "test": 30.0, "deploy": 5.0}
+
+        total, path = index.critical_path(durations)
+
+        assert total == 36.0
+        assert path == ["setup", "test", "deploy"]
+        assert index.remaining_work(durations)["lint"] == 7.0
+
+    def test_critical_path_within_subset(self):
+        """Test restricting the computation to part of the graph."""
+        index = self._diamond()
+
+        total, path = index.critical_path(within=index.closure("lint"))
+
+        assert (total, path) == (2.0, ["setup", "lint"])
+
+    def test_wide_diamond_chain_is_fast(self):
+        """Test that depth queries stay linear on stacked diamonds."""
+        graph = {"n0": []}
+        for layer in range(1, 200):
+            graph[f"l{layer}"] = [f"n{layer - 1}"]
+            graph[f"r{layer}"] = [f"n{layer - 1}"]
+            graph[f"n{layer}"] = [f"l{layer}", f"r{layer}"]
+        tasks = _tasks(**graph)
+
+        resolver = DependencyResolver(tasks)
+
+        assert resolver.get_task_depth("n199") == 398
+        assert resolver.can_run_parallel("l5", "r5") is True
+        assert resolver.can_run_parallel("n3", "n150") is False
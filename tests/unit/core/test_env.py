@@ -0,0 +1,90 @@
+"""
+Tests for layered task environments.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from taskx.core.env import EnvironmentManager, LayeredEnv
+from taskx.utils.secure_exec import SecureCommandExecutor
+
+
+class TestEnvironmentManager:
+    """Test environment layering and the shared base snapshot."""
+
+    def test_priority(self, temp_dir: Path, monkeypatch):
+        """Test override > task > global > .env > os.environ."""
+        monkeypatch.setenv("TASKX_LAYER", "system")
+        dotenv = temp_dir / ".env"
+        dotenv.write_text("TASKX_LAYER=dotenv\nFROM_DOTENV=1\n")
+
+        manager = EnvironmentManager({"FROM_GLOBAL": "1"})
+        manager.load_dotenv(dotenv)
+
+        env = manager.get_env_for_task({"TASKX_LAYER": "task"}, {"CLI": "1"})
+        assert env["TASKX_LAYER"] == "task"
+        assert env["FROM_DOTENV"] == env["FROM_GLOBAL"] == env["CLI"] == "1"
+        assert env["PATH"] == os.environ["PATH"]
+
+        env = manager.get_env_for_task({"TASKX_LAYER": "task"}, {"TASKX_LAYER": "cli"})
+        assert env["TASKX_LAYER"] == "cli"
+        assert manager.get_env_for_task()["TASKX_LAYER"] == "dotenv"
+
+    def test_base_snapshot_is_shared(self, monkeypatch):
+        """Test that os.environ is copied once, not per task."""
+        manager = EnvironmentManager({"A": "1"})
+
+        first = manager.get_env_for_task({"X": "1"})
+        second = manager.get_env_for_task({"Y": "2"})
+
+        assert first.maps[-1] is second.maps[-1] is manager.base_env()
+
+        monkeypatch.setenv("TASKX_LATE", "1")
+        assert "TASKX_LATE" not in manager.get_env_for_task()
+        manager.refresh()
+        assert manager.get_env_for_task()["TASKX_LATE"] == "1"
+
+    def test_writes_are_copy_on_write(self):
+        """Test that task writes don't leak into shared layers."""
+        task_env = {"MODE": "dev"}
+        manager = EnvironmentManager({"G": "1"})
+
+        env = manager.get_env_for_task(task_env)
+        env["MODE"] = "prod"
+        env["PROMPTED"] = "yes"
+
+        assert task_env == {"MODE": "dev"}
+        assert "PROMPTED" not in manager.base_env()
+        assert manager.get_env_for_task(task_env)["MODE"] == "dev"
+
+    def test_materialize(self):
+        """Test flattening layers into a plain dict."""
+        env = LayeredEnv({"A": "front"}, {"A": "task", "B": "task"}, {"B": "base", "C": "base"})
+
+        flat = env.materialize()
+
+        assert type(flat) is dict
+        assert flat == {"A": "front", "B": "task", "C": "base"}
+        assert env.materialize() is not flat
+
+        child = env.new_child({"C": "child"})
+        assert isinstance(child, LayeredEnv)
+        assert child.materialize()["C"] == "child"
+        assert env["C"] == "base"
+
+
+class TestSpawnEnvironment:
+    """Test the environment a child process receives."""
+
+    def test_layered_env_reaches_child(self):
+        """Test that a layered environment is passed through unchanged."""
+        env = EnvironmentManager({"TASKX_GLOBAL": "g"}).get_env_for_task({"TASKX_TASK": "t"})
+
+        result = SecureCommandExecutor(allow_warnings=False).execute(
+            f'{sys.executable} -c "import os, sys; '
+            f"sys.exit(os.environ['TASKX_GLOBAL'] + os.environ['TASKX_TASK'] != 'gt')\"",
+            env=env,
+        )
+
+        assert result.returncode == 0
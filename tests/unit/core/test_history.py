@@ -0,0 +1,186 @@
+"""
+Tests for the task execution history store.
+"""
+
+import threading
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from taskx.cli.main import cli
+from taskx.core.config import Config
+from taskx.core.history import TaskHistory
+from taskx.core.runner import TaskRunner
+
+
+class TestTaskHistory:
+    """Test recording runs and computing statistics."""
+
+    def test_empty_history(self, temp_dir: Path):
+        """Test that a missing database reads as empty."""
+        store = TaskHistory(temp_dir / "history.db")
+
+        assert store.stats("build") is None
+        assert store.runs("build") == []
+        assert store.task_names() == []
+        assert not (temp_dir / "history.db").exists()
+
+    def test_percentiles(self, temp_dir: Path):
+        """Test nearest-rank p50/p95/max over successful runs."""
+        store = TaskHistory(temp_dir / "history.db")
+        for duration in range(1, 21):
+            store.record("test", float(duration), 0)
+        store.record("test", 500.0, 1)
+
+        stats = store.stats("test")
+
+        assert stats is not None
+        assert stats.runs == 20
+        assert stats.failures == 1
+        assert stats.p50 == 10.0
+        assert stats.p95 == 19.0
+        assert stats.max == 20.0
+        assert stats.last == 20.0
+
+    def test_window_limits_statistics(self, temp_dir: Path):
+        """Test that only the most recent runs are considered."""
+        store = TaskHistory(temp_dir / "history.db", window=3)
+        for duration in [100.0, 1.0, 2.0, 3.0]:
+            store.record("lint", duration, 0)
+
+        stats = store.stats("lint")
+
+        assert stats is not None
+        assert stats.max == 3.0
+        assert store.expected_durations(["lint", "unknown"]) == {"lint": 2.0}
+
+    def test_failures_of_tasks_that_never_succeeded(self, temp_dir: Path):
+        """Test that failures are counted for tasks without statistics."""
+        store = TaskHistory(temp_dir / "history.db", window=3)
+        for exit_code in [0, 1, 1, 2]:
+            store.record("flaky", 1.0, exit_code)
+        store.record("broken", 1.0, 3)
+
+        assert store.stats("broken") is None
+        assert store.failures(["flaky", "broken", "unknown"]) == {"flaky": 3, "broken": 1}
+
+    def test_runs_newest_first(self, temp_dir: Path):
+        """Test that recent runs keep exit code and fingerprint."""
+        store = TaskHistory(temp_dir / "history.db")
+        store.record("build", 1.0, 0, fingerprint="abc")
+        store.record("build", 2.0, 2)
+
+        runs = store.runs("build")
+
+        assert [run.exit_code for run in runs] == [2, 0]
+        assert runs[1].fingerprint == "abc"
+        assert runs[0].success is False
+
+    def test_concurrent_writers(self, temp_dir: Path):
+        """Test that scheduler threads can share one store."""
+        store = TaskHistory(temp_dir / "history.db")
+
+        def write(name):
+            for _ in range(20):
+                store.record(name, 0.1, 0)
+
+        threads = [threading.Thread(target=write, args=(f"t{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert store.task_names() == ["t0", "t1", "t2", "t3"]
+        assert all(store.stats(f"t{i}").runs == 20 for i in range(4))
+
+
+class TestRunnerHistory:
+    """Test that TaskRunner records every run."""
+
+    def _config(self, temp_dir: Path, settings: str = "") -> Config:
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(
+            f"""
+[tool.taskx.settings]
+{settings}
+
+[tool.taskx.tasks]
+ok = {{ cmd = "true", cwd = "{temp_dir}" }}
+bad = {{ cmd = "exit 3", cwd = "{temp_dir}" }}
+"""
+        )
+        config = Config(config_path)
+        config.load()
+        return config
+
+    def test_runs_are_recorded(self, temp_dir: Path):
+        """Test that successes and failures both land in the history."""
+        config = self._config(temp_dir)
+        runner = TaskRunner(config)
+
+        runner.run("ok")
+        runner.run("bad")
+
+        store = TaskHistory(temp_dir / ".taskx" / "history.db")
+        assert store.runs("ok")[0].exit_code == 0
+        assert store.runs("bad")[0].exit_code == 3
+
+    def test_history_can_be_disabled(self, temp_dir: Path):
+        """Test the history = false setting."""
+        config = self._config(temp_dir, "history = false")
+
+        TaskRunner(config).run("ok")
+
+        assert not (temp_dir / ".taskx" / "history.db").exists()
+
+    def test_history_command(self, temp_dir: Path):
+        """Test that taskx history prints per-task statistics."""
+        config = self._config(temp_dir)
+        TaskRunner(config).run("ok")
+
+        result = CliRunner().invoke(
+            cli, ["--config", str(temp_dir / "pyproject.toml"), "history"]
+        )
+
+        assert result.exit_code == 0
+        assert "ok" in result.output
+        assert "p95" in result.output
+
+    def test_history_command_shows_failing_tasks(self, temp_dir: Path):
+        """Test that a task that never succeeded still shows its failures."""
+        config = self._config(temp_dir)
+        TaskRunner(config).run("bad")
+
+        result = CliRunner().invoke(
+            cli, ["--config", str(temp_dir / "pyproject.toml"), "history"]
+        )
+
+        assert result.exit_code == 0
+        row = next(line for line in result.output.splitlines() if "bad" in line)
+        cells = [cell.strip() for cell in row.split("│")]
+        assert cells[1:5] == ["bad", "0", "1", "-"]
+
+    def test_parallel_commands_use_history_order(self, temp_dir: Path):
+        """Test that a fan-out starts the historically slowest command first."""
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(
+            f"""
+[tool.taskx.settings]
+max_parallel_tasks = 1
+
+[tool.taskx.tasks]
+a = "echo a >> order.txt"
+b = "echo b >> order.txt"
+check = {{ parallel = ["a", "b"], cwd = "{temp_dir}" }}
+"""
+        )
+        config = Config(config_path)
+        config.load()
+        store = TaskHistory(temp_dir / ".taskx" / "history.db")
+        store.record("a", 1.0, 0)
+        store.record("b", 20.0, 0)
+
+        assert TaskRunner(config).run("check") is True
+
+        assert (temp_dir / "order.txt").read_text().split() == ["b", "a"]
+        assert len(store.runs("a")) == 2
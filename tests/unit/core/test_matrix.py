@@ -0,0 +1,139 @@
+"""
+Tests for matrix task expansion.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from taskx.core.config import Config, ConfigError
+from taskx.core.matrix import cell_label, expand_matrix
+from taskx.core.runner import TaskRunner
+from taskx.core.task import Task
+
+
+class TestExpandMatrix:
+    """Test expanding matrix definitions into cells."""
+
+    def test_product_in_definition_order(self):
+        """Test that the first variable varies slowest."""
+        cells = expand_matrix({"python": ["3.10", "3.11"], "shard": [1, 2]})
+
+        assert [cell_label(cell) for cell in cells] == [
+            "python=3.10,shard=1",
+            "python=3.10,shard=2",
+            "python=3.11,shard=1",
+            "python=3.11,shard=2",
+        ]
+
+    def test_exclude_and_include(self):
+        """Test filtering cells out and adding extra cells."""
+        cells = expand_matrix(
+            {
+                "os": ["linux", "mac"],
+                "debug": [True, False],
+                "exclude": [{"os": "mac", "debug": True}],
+                "include": [{"os": "windows", "debug": False}, {"os": "linux", "debug": True}],
+            }
+        )
+
+        assert cells == [
+            {"os": "linux", "debug": "true"},
+            {"os": "linux", "debug": "false"},
+            {"os": "mac", "debug": "false"},
+            {"os": "windows", "debug": "false"},
+        ]
+
+    @pytest.mark.parametrize(
+        "matrix, message",
+        [
+            ({"python": []}, "non-empty list"),
+            ({"python": "3.11"}, "non-empty list"),
+            ({"py-version": ["3.11"]}, "not a valid variable name"),
+            ({"python": ["3.11"], "exclude": [{"python": "3.11"}]}, "no cells left"),
+            ({"python": ["3.11"], "include": "3.12"}, "list of tables"),
+            (["3.11"], "must be a table"),
+        ],
+    )
+    def test_invalid_matrix(self, matrix, message):
+        """Test validation errors."""
+        with pytest.raises(ValueError, match=message):
+            expand_matrix(matrix)
+
+    def test_task_expands_matrix(self):
+        """Test that tasks precompute their cells."""
+        task = Task(name="test", cmd="pytest --shard $shard", matrix={"shard": [1, 2]})
+
+        assert task.is_matrix
+        assert task.matrix_cells == [{"shard": "1"}, {"shard": "2"}]
+        assert not Task(name="plain", cmd="pytest").is_matrix
+
+        with pytest.raises(ValueError, match="cannot have both 'matrix' and 'parallel'"):
+            Task(name="bad", parallel=["a"], matrix={"x": [1]})
+
+
+class TestMatrixExecution:
+    """Test running matrix tasks."""
+
+    def _config(self, temp_dir: Path, task: str) -> Config:
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+history = false
+
+[tool.taskx.tasks]
+{task}
+""")
+        config = Config(config_path)
+        config.load()
+        return config
+
+    def test_each_cell_runs_with_its_env(self, temp_dir: Path):
+        """Test that every cell runs once with its values set."""
+        config = self._config(
+            temp_dir,
+            f'test = {{ cmd = "touch out_${{python}}_$shard", cwd = "{temp_dir}", '
+            'matrix = { python = ["310", "311"], shard = [1, 2], '
+            'exclude = [{ python = "310", shard = 2 }] } }',
+        )
+
+        assert TaskRunner(config).run("test") is True
+        assert sorted(p.name for p in temp_dir.glob("out_*")) == [
+            "out_310_1",
+            "out_311_1",
+            "out_311_2",
+        ]
+
+    def test_failed_cells_are_reported(self, temp_dir: Path):
+        """Test that the task fails and names the failing cells."""
+        config = self._config(
+            temp_dir,
+            f'test = {{ cmd = "test $n -lt 2", cwd = "{temp_dir}", matrix = {{ n = [1, 2, 3] }} }}',
+        )
+        runner = TaskRunner(config)
+
+        result = runner._run_matrix(config.tasks["test"], runner.env_manager.get_env_for_task())
+
+        assert result.success is False
+        assert str(result.error) == "Matrix cells failed: n=2; n=3"
+
+    def test_matrix_task_in_parallel(self, temp_dir: Path):
+        """Test that a matrix task listed in ``parallel`` runs all of its cells."""
+        config = self._config(
+            temp_dir,
+            'test = { cmd = "touch out_${py}", matrix = { py = ["310", "311"] } }\n'
+            'lint = "touch out_lint"\n'
+            f'both = {{ parallel = ["test", "lint"], cwd = "{temp_dir}" }}',
+        )
+
+        assert TaskRunner(config).run("both") is True
+        assert sorted(p.name for p in temp_dir.glob("out_*")) == [
+            "out_310",
+            "out_311",
+            "out_lint",
+        ]
+
+    def test_invalid_matrix_in_config(self, temp_dir: Path):
+        """Test that config loading rejects bad matrices."""
+        with pytest.raises(ConfigError, match="non-empty list"):
+            self._config(temp_dir, 'test = { cmd = "true", matrix = { n = [] } }')
@@ -0,0 +1,127 @@
+"""
+Tests for retry policies and retried execution.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from taskx.core.config import Config
+from taskx.core.retry import RetryPolicy
+from taskx.core.runner import TaskRunner
+from taskx.core.task import ExecutionResult, Task
+from taskx.execution.parallel import CommandSpec, ParallelExecutor
+
+
+def _failed(exit_code: int = 1, error=None) -> ExecutionResult:
+    return ExecutionResult(task_name="t", success=False, exit_code=exit_code, error=error)
+
+
+class TestRetryPolicy:
+    """Test retry decisions and backoff delays."""
+
+    def test_fixed_delay(self):
+        """Test that the fixed strategy always waits the base delay."""
+        policy = RetryPolicy(retries=3, delay=2.0)
+        assert [policy.next_delay(attempt) for attempt in range(3)] == [2.0, 2.0, 2.0]
+
+    def test_exponential_delay_is_capped(self):
+        """Test doubling delays up to max_delay."""
+        policy = RetryPolicy(retries=5, delay=1.0, backoff="exponential", max_delay=5.0)
+        assert [policy.next_delay(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    def test_decorrelated_jitter_bounds(self):
+        """Test that jittered delays stay between the base and 3x the last delay."""
+        policy = RetryPolicy(retries=10, delay=1.0, backoff="decorrelated-jitter", max_delay=30.0)
+        rng = random.Random(42)
+        delay = None
+        for attempt in range(10):
+            previous = delay
+            delay = policy.next_delay(attempt, delay, rng)
+            assert 1.0 <= delay <= min(30.0, 3 * (previous or 1.0))
+
+    def test_retry_count_and_exit_codes(self):
+        """Test that only listed exit codes are retried, up to the limit."""
+        policy = RetryPolicy(retries=2, retry_on=[75])
+
+        assert policy.should_retry(0, _failed(75)) is True
+        assert policy.should_retry(0, _failed(1)) is False
+        assert policy.should_retry(2, _failed(75)) is False
+        assert policy.should_retry(0, ExecutionResult(task_name="t", success=True)) is False
+
+    def test_rejected_commands_are_not_retried(self):
+        """Test that security failures fail immediately while timeouts retry."""
+        policy = RetryPolicy(retries=2)
+
+        assert policy.should_retry(0, _failed(-1, ValueError("Dangerous command"))) is False
+        assert policy.should_retry(0, _failed(-1, TimeoutError("timed out"))) is True
+
+    def test_from_task(self):
+        """Test building a policy from task fields."""
+        task = Task(
+            name="t", cmd="x", retry=3, retry_delay=0.5, retry_backoff="exponential", retry_on=[1]
+        )
+
+        policy = RetryPolicy.from_task(task)
+
+        assert (policy.retries, policy.delay, policy.backoff) == (3, 0.5, "exponential")
+        assert policy.retry_on == [1]
+
+    def test_invalid_backoff_rejected(self):
+        """Test task validation of the backoff strategy."""
+        with pytest.raises(ValueError, match="retry_backoff"):
+            Task(name="t", cmd="x", retry_backoff="linear")
+
+
+class TestRetriedExecution:
+    """Test retries in TaskRunner and ParallelExecutor."""
+
+    FLAKY = "if [ -f {m} ]; then echo {name} >> order.txt; else touch {m}; exit {code}; fi"
+
+    def _config(self, temp_dir: Path, tasks: str) -> Config:
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"[tool.taskx.tasks]\n{tasks}")
+        config = Config(config_path)
+        config.load()
+        return config
+
+    def test_task_retried_on_listed_exit_code(self, temp_dir: Path):
+        """Test that a flaky task succeeds on its retry."""
+        cmd = self.FLAKY.format(m="seen", name="flaky", code=75)
+        config = self._config(
+            temp_dir,
+            f'flaky = {{ cmd = "{cmd}", cwd = "{temp_dir}", retry = 2, retry_delay = 0, '
+            f"retry_on = [75] }}\n",
+        )
+
+        assert TaskRunner(config).run("flaky") is True
+
+    def test_task_not_retried_on_other_exit_code(self, temp_dir: Path):
+        """Test that unlisted exit codes fail immediately."""
+        cmd = self.FLAKY.format(m="seen", name="flaky", code=1)
+        config = self._config(
+            temp_dir,
+            f'flaky = {{ cmd = "{cmd}", cwd = "{temp_dir}", retry = 2, retry_delay = 0, '
+            f"retry_on = 75 }}\n",
+        )
+
+        assert TaskRunner(config).run("flaky") is False
+
+    @pytest.mark.asyncio
+    async def test_parallel_retry_releases_slot(self, temp_dir: Path):
+        """Test that a command waiting to be retried lets others run."""
+        executor = ParallelExecutor(max_concurrent=1, policy="config")
+        specs = [
+            CommandSpec(
+                cmd=self.FLAKY.format(m="seen", name="flaky", code=1),
+                label="flaky",
+                retry=RetryPolicy(retries=1, delay=0.5),
+            ),
+            CommandSpec(cmd="echo other >> order.txt", label="other"),
+        ]
+
+        results = await executor.run_parallel(commands=specs, env={}, cwd=str(temp_dir))
+
+        assert all(result.success for result in results.values())
+        assert (temp_dir / "order.txt").read_text().split() == ["other", "flaky"]
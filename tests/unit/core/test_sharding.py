@@ -0,0 +1,145 @@
+"""
+Tests for splitting files into balanced shards.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from taskx.core.config import Config
+from taskx.core.history import TaskHistory
+from taskx.core.runner import TaskRunner
+from taskx.core.sharding import Shard, collect_files, partition
+from taskx.core.task import Task
+
+
+class TestPartition:
+    """Test longest-processing-time-first partitioning."""
+
+    def test_balances_by_duration(self):
+        """Test that recorded durations balance the shards."""
+        durations = {"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+
+        shards = partition(sorted(durations), 2, durations)
+
+        assert [shard.files for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+        assert [shard.expected for shard in shards] == [11.0, 10.0]
+
+    def test_unknown_files_count_as_median(self):
+        """Test that new files are weighted like a typical file."""
+        shards = partition(["a", "b", "c", "new"], 2, {"a": 10.0, "b": 2.0, "c": 1.0})
+
+        assert shards[0].weights == {"a": 10.0}
+        assert shards[1].weights == {"b": 2.0, "c": 1.0, "new": 2.0}
+
+    def test_file_sizes_without_history(self, temp_dir: Path):
+        """Test that file sizes stand in for durations on the first run."""
+        (temp_dir / "big.py").write_text("x" * 300)
+        for name in ("s1.py", "s2.py", "s3.py"):
+            (temp_dir / name).write_text("x" * 100)
+
+        shards = partition(["big.py", "s1.py", "s2.py", "s3.py"], 2, root=temp_dir)
+
+        assert [shard.files for shard in shards] == [["big.py"], ["s1.py", "s2.py", "s3.py"]]
+
+    def test_fewer_files_than_shards(self):
+        """Test that no empty shards are produced."""
+        shards = partition(["a", "b"], 8)
+
+        assert [(shard.index, shard.files) for shard in shards] == [(1, ["a"]), (2, ["b"])]
+
+    def test_attribute(self):
+        """Test splitting a measured duration by weight."""
+        shard = Shard(index=1, files=["a", "b"], weights={"a": 3.0, "b": 1.0}, expected=4.0)
+
+        assert shard.attribute(8.0) == {"a": 6.0, "b": 2.0}
+
+    def test_collect_files(self, temp_dir: Path):
+        """Test globbing relative to the task directory."""
+        (temp_dir / "tests" / "unit").mkdir(parents=True)
+        for path in ("tests/test_a.py", "tests/unit/test_b.py", "tests/conftest.py"):
+            (temp_dir / path).write_text("")
+
+        files = collect_files(["tests/**/test_*.py", "tests/test_a.py"], temp_dir)
+
+        assert files == ["tests/test_a.py", "tests/unit/test_b.py"]
+
+
+class TestShardedTask:
+    """Test running sharded tasks."""
+
+    def test_task_validation(self):
+        """Test that shards and shard_files go together."""
+        assert Task(name="t", cmd="pytest", shards=2, shard_files=["*.py"]).is_sharded
+
+        with pytest.raises(ValueError, match="needs both"):
+            Task(name="t", cmd="pytest", shards=2)
+        with pytest.raises(ValueError, match="cannot combine"):
+            Task(name="t", cmd="x", shards=2, shard_files=["*.py"], matrix={"a": [1]})
+
+    def test_run_passes_files_and_learns_durations(self, temp_dir: Path):
+        """Test that each shard gets its files and durations are recorded."""
+        (temp_dir / "tests").mkdir()
+        for name in ("test_a.py", "test_b.py", "test b.py"):
+            (temp_dir / "tests" / name).write_text("")
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.tasks]
+test = {{ cmd = "touch ${{TASKX_SHARD_FILES}}.done", cwd = "{temp_dir}", shard_files = "tests/test*.py", shards = 2 }}
+""")
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config)
+        runner.history = TaskHistory(temp_dir / "history.db")
+
+        assert runner.run("test") is True
+
+        # The last file of each shard gets the suffix, every file is one argument
+        done = sorted(p.name for p in (temp_dir / "tests").glob("*.done"))
+        assert len(done) == 2
+        assert set(runner.history.file_durations("test")) == {
+            "tests/test b.py",
+            "tests/test_a.py",
+            "tests/test_b.py",
+        }
+
+    def test_no_matching_files(self, temp_dir: Path):
+        """Test that a glob matching nothing fails the task."""
+        task = Task(name="t", cmd="true", cwd=str(temp_dir), shards=2, shard_files=["*.nope"])
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text('[tool.taskx.tasks]\nt = "true"\n')
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config)
+
+        result = runner._run_sharded(task, runner.env_manager.get_env_for_task())
+
+        assert result.success is False
+        assert "No files match shard_files" in str(result.error)
+
+    def test_sharded_task_in_parallel(self, temp_dir: Path):
+        """Test that a sharded task listed in ``parallel`` runs each shard with its files."""
+        (temp_dir / "tests").mkdir()
+        for name in ("test_a.py", "test_b.py"):
+            (temp_dir / "tests" / name).write_text("")
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.tasks]
+test = {{ cmd = "touch ${{TASKX_SHARD_FILES}}.done", shard_files = "tests/test*.py", shards = 2 }}
+lint = "true"
+check = {{ parallel = ["test", "lint"], cwd = "{temp_dir}" }}
+""")
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config)
+        runner.history = TaskHistory(temp_dir / "history.db")
+
+        assert runner.run("check") is False  # test runs in a different directory
+        assert not list((temp_dir / "tests").glob("*.done"))
+
+        config.tasks["test"].cwd = str(temp_dir)
+        assert runner.run("check") is True
+
+        done = sorted(p.name for p in (temp_dir / "tests").glob("*.done"))
+        assert done == ["test_a.py.done", "test_b.py.done"]
+        assert set(runner.history.file_durations("test")) == {"tests/test_a.py", "tests/test_b.py"}
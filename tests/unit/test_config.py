@@ -114,3 +114,85 @@ FOO = "bar"
         config = Config(config_file)
         with pytest.raises(ConfigError, match="No tasks defined"):
             config.load()
+
+
+class TestConfigCache:
+    """Test the persistent parsed-config cache."""
+
+    def _write(self, path, tasks: str) -> None:
+        path.write_text(f"[tool.taskx.tasks]\n{tasks}\n")
+
+    def test_second_load_uses_cache(self, temp_dir, monkeypatch):
+        """Test that an unchanged file is not parsed again."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'hello = "echo hi"')
+        Config(config_file).load()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("config was parsed again")
+
+        monkeypatch.setattr(Config, "_load_data", fail)
+        config = Config(config_file)
+        config.load()
+
+        assert config.tasks["hello"].cmd == "echo hi"
+
+    def test_changed_file_invalidates_cache(self, temp_dir, monkeypatch):
+        """Test that editing the file is picked up immediately."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'hello = "echo hi"')
+        Config(config_file).load()
+
+        # Same size, so only the content hash can tell the versions apart
+        self._write(config_file, 'hello = "echo yo"')
+        config = Config(config_file)
+        config.load()
+
+        assert config.tasks["hello"].cmd == "echo yo"
+
+    def test_new_reserved_name_invalidates_cache(self, temp_dir, monkeypatch):
+        """Test that a cached config is checked against newly reserved names."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'hello = { cmd = "echo hi", aliases = ["status"] }')
+        Config(config_file).load()
+
+        monkeypatch.setattr(Config, "RESERVED_NAMES", Config.RESERVED_NAMES | {"status"})
+
+        with pytest.raises(ConfigError, match="reserved"):
+            Config(config_file).load()
+
+    def test_cache_can_be_bypassed(self, temp_dir, monkeypatch):
+        """Test that use_cache=False always parses the file."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'hello = "echo hi"')
+        Config(config_file).load(use_cache=False)
+
+        assert not (temp_dir / "cache").exists()
+
+    def test_corrupt_cache_is_ignored(self, temp_dir, monkeypatch):
+        """Test that an unreadable cache falls back to parsing."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'hello = "echo hi"')
+        config = Config(config_file)
+        config.load()
+        config._cache_file().write_bytes(b"not a pickle")
+
+        reloaded = Config(config_file)
+        reloaded.load()
+
+        assert reloaded.task_names() == ["hello"]
+
+    def test_invalid_config_is_not_cached(self, temp_dir, monkeypatch):
+        """Test that validation errors are raised on every load."""
+        monkeypatch.setenv("TASKX_CACHE_DIR", str(temp_dir / "cache"))
+        config_file = temp_dir / "pyproject.toml"
+        self._write(config_file, 'deploy = { depends = ["missing"], cmd = "echo" }')
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="missing"):
+                Config(config_file).load()
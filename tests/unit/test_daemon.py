@@ -0,0 +1,157 @@
+"""
+Tests for the background daemon.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Generator, List
+
+import pytest
+
+from taskx.execution import daemon
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="needs Unix sockets and fork")
+
+CLI = [sys.executable, "-c", "from taskx.cli.main import cli; cli(prog_name='taskx')"]
+
+
+def taskx(config_path: Path, *args: str, **env: str) -> subprocess.CompletedProcess:
+    """Run the CLI in a fresh interpreter, as a shell would."""
+    return subprocess.run(
+        [*CLI, "--config", str(config_path), *args],
+        cwd=str(config_path.parent),
+        env={**os.environ, **env},
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+
+def write_config(config_path: Path, message: str) -> None:
+    """Write a project whose 'hello' task prints a message."""
+    config_path.write_text(f"""
+[tool.taskx.settings]
+history = false
+
+[tool.taskx.tasks]
+hello = {{ cmd = "echo {message} $GREETING", cwd = "{config_path.parent}" }}
+fail = {{ cmd = "exit 3", cwd = "{config_path.parent}" }}
+""")
+
+
+@pytest.fixture
+def project(temp_dir: Path) -> Generator[Path, None, None]:
+    """A project with a running daemon, stopped afterwards."""
+    config_path = temp_dir / "pyproject.toml"
+    write_config(config_path, "hi")
+    result = taskx(config_path, "daemon", "start")
+    assert result.returncode == 0, result.stdout + result.stderr
+    try:
+        yield config_path
+    finally:
+        taskx(config_path, "daemon", "stop")
+
+
+class TestProtocol:
+    """Test socket paths and message framing."""
+
+    def test_socket_path(self, temp_dir: Path):
+        """Test the project socket, and the fallback for long paths."""
+        assert daemon.socket_path(temp_dir / "pyproject.toml") == (
+            temp_dir.resolve() / ".taskx" / "daemon.sock"
+        )
+
+        deep = temp_dir / ("d" * 120)
+        path = daemon.socket_path(deep / "pyproject.toml")
+        assert len(str(path)) <= 108
+        assert path == daemon.socket_path(deep / "pyproject.toml")
+
+    def test_messages_carry_file_descriptors(self, temp_dir: Path):
+        """Test that messages round-trip along with passed descriptors."""
+        log = temp_dir / "log"
+        left, right = socket.socketpair(socket.AF_UNIX)
+        with left, right, open(log, "w") as f:
+            daemon.send_message(left, {"op": "run", "env": {"A": "x" * 100000}}, fds=[f.fileno()])
+            message, fds = daemon.recv_message(right)
+
+            assert message["env"]["A"] == "x" * 100000
+            assert len(fds) == 1
+            os.write(fds[0], b"through the passed fd")
+            os.close(fds[0])
+        assert log.read_text() == "through the passed fd"
+
+    def test_closed_connection(self):
+        """Test that a peer hanging up is reported."""
+        left, right = socket.socketpair(socket.AF_UNIX)
+        with right:
+            left.close()
+            with pytest.raises(daemon.DaemonError, match="closed"):
+                daemon.recv_message(right)
+
+    def test_no_daemon_runs_locally(self, temp_dir: Path):
+        """Test that the client falls back without a (live) daemon."""
+        config_path = temp_dir / "pyproject.toml"
+        argv: List[str] = ["run", "hello"]
+
+        assert daemon.forward_run(config_path, argv) is None
+        stale = daemon.socket_path(config_path)
+        stale.parent.mkdir(parents=True)
+        listener = socket.socket(socket.AF_UNIX)
+        listener.bind(str(stale))
+        listener.close()
+        assert daemon.forward_run(config_path, argv) is None
+
+
+class TestDaemon:
+    """Test runs served by a daemon."""
+
+    def test_runs_are_served_by_the_daemon(self, project: Path):
+        """Test that output, environment and exit codes reach the client."""
+        result = taskx(project, "run", "hello", GREETING="there")
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "hi there" in result.stdout
+
+        assert taskx(project, "run", "fail").returncode == 1
+        status = taskx(project, "daemon", "status")
+        assert "Runs:    2" in status.stdout
+
+        local = taskx(project, "run", "hello", TASKX_NO_DAEMON="1")
+        assert "hi" in local.stdout
+        assert "Runs:    2" in taskx(project, "daemon", "status").stdout
+
+    def test_config_changes_are_picked_up(self, project: Path):
+        """Test that editing pyproject.toml reloads the daemon's configuration."""
+        assert "hi" in taskx(project, "run", "hello").stdout
+
+        time.sleep(0.01)
+        write_config(project, "changed")
+        result = taskx(project, "run", "hello")
+
+        assert "changed" in result.stdout
+        assert "Reloads: 1" in taskx(project, "daemon", "status").stdout
+
+    def test_other_config_runs_locally(self, project: Path):
+        """Test that --config with another file isn't served from the daemon's config."""
+        other = project.parent / "ci.toml"
+        write_config(other, "from-ci")
+
+        result = taskx(other, "run", "hello")
+
+        assert "from-ci" in result.stdout
+        assert "Runs:    0" in taskx(project, "daemon", "status").stdout
+
+    def test_stop(self, project: Path):
+        """Test stopping the daemon removes its socket."""
+        result = taskx(project, "daemon", "stop")
+
+        assert "Daemon stopped" in result.stdout
+        deadline = time.monotonic() + 5
+        while daemon.socket_path(project).exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not daemon.socket_path(project).exists()
+        assert taskx(project, "daemon", "status").returncode == 1
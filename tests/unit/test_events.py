@@ -0,0 +1,186 @@
+"""
+Tests for the machine-readable event stream.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from taskx.cli.main import cli
+from taskx.core.config import Config
+from taskx.core.runner import TaskRunner
+from taskx.execution.events import EventSink, NdjsonEventSink, open_event_sink
+
+
+def _events(text: str):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestNdjsonEventSink:
+    """Test the buffered NDJSON writer."""
+
+    def test_events_are_buffered_until_flush(self):
+        """Test that emitting doesn't write to the stream every time."""
+        stream = io.StringIO()
+        sink = NdjsonEventSink(stream, flush_interval=3600)
+
+        sink.emit("task_start", task="build", queue_wait=0.0)
+        assert stream.getvalue() == ""
+
+        sink.close()
+        [event] = _events(stream.getvalue())
+        assert event["event"] == "task_start"
+        assert event["task"] == "build"
+        assert "ts" in event
+
+    def test_buffer_size_triggers_write(self):
+        """Test that a full buffer is written without waiting for close."""
+        stream = io.StringIO()
+        sink = NdjsonEventSink(stream, buffer_size=100, flush_interval=3600)
+
+        for _ in range(5):
+            sink.emit("task_end", task="build", exit_code=0)
+
+        assert len(_events(stream.getvalue())) >= 2
+
+    def test_emit_after_close_is_ignored(self):
+        """Test that late events from workers don't raise."""
+        stream = io.StringIO()
+        sink = NdjsonEventSink(stream)
+        sink.close()
+
+        sink.emit("task_end", task="late")
+
+        assert stream.getvalue() == ""
+
+    def test_concurrent_emitters_produce_whole_lines(self):
+        """Test that lines from several threads never interleave."""
+        stream = io.StringIO()
+        sink = NdjsonEventSink(stream, buffer_size=512)
+
+        def emit(worker):
+            for i in range(200):
+                sink.emit("command_end", task=f"w{worker}", index=i)
+
+        threads = [threading.Thread(target=emit, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.close()
+
+        assert len(_events(stream.getvalue())) == 800
+
+    def test_open_event_sink(self, temp_dir: Path):
+        """Test sink selection by format."""
+        assert type(open_event_sink(None)) is EventSink
+        with pytest.raises(ValueError, match="Unknown event format"):
+            open_event_sink("xml")
+
+        sink = open_event_sink("ndjson", str(temp_dir / "events.ndjson"))
+        sink.emit("run_start", task="a")
+        sink.close()
+        assert _events((temp_dir / "events.ndjson").read_text())[0]["event"] == "run_start"
+
+
+class TestRunnerEvents:
+    """Test the events TaskRunner reports."""
+
+    def _config(self, temp_dir: Path) -> Config:
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.tasks]
+lint = "true"
+unit = "true"
+check = {{ parallel = ["lint", "unit"], cwd = "{temp_dir}" }}
+build = {{ cmd = "true", cwd = "{temp_dir}", depends = ["check"], pre = "true" }}
+""")
+        config = Config(config_path)
+        config.load()
+        return config
+
+    def test_run_reports_tasks_hooks_and_commands(self, temp_dir: Path):
+        """Test the event sequence of a small graph."""
+        stream = io.StringIO()
+        sink = NdjsonEventSink(stream)
+
+        assert TaskRunner(self._config(temp_dir), events=sink).run("build") is True
+        sink.close()
+
+        events = _events(stream.getvalue())
+        names = [event["event"] for event in events]
+        assert names[0] == "run_start"
+        assert names[-1] == "run_end"
+        assert events[-1]["success"] is True
+
+        ends = {e["task"]: e for e in events if e["event"] == "task_end"}
+        assert set(ends) == {"check", "build"}
+        assert ends["build"]["exit_code"] == 0
+
+        hooks = [e for e in events if e["event"].startswith("hook_")]
+        assert [(e["event"], e["hook"]) for e in hooks] == [
+            ("hook_start", "pre"),
+            ("hook_end", "pre"),
+        ]
+
+        starts = [e for e in events if e["event"] == "command_start"]
+        assert {e["command"] for e in starts} == {"lint", "unit", "build"}
+        assert all(e["spawn_latency"] >= 0 and e["queue_wait"] >= 0 for e in starts)
+        assert {e["task"] for e in starts if e["command"] != "build"} == {"check"}
+
+    def test_events_file_option(self, temp_dir: Path):
+        """Test taskx run --events-file."""
+        self._config(temp_dir)
+        events_path = temp_dir / "events.ndjson"
+
+        CliRunner().invoke(
+            cli,
+            [
+                "--config",
+                str(temp_dir / "pyproject.toml"),
+                "run",
+                "check",
+                "--events-file",
+                str(events_path),
+            ],
+        )
+
+        names = [event["event"] for event in _events(events_path.read_text())]
+        assert names[0] == "run_start"
+        assert names[-1] == "run_end"
+        assert names.count("command_end") == 2
+
+    def test_events_on_stdout_are_parseable(self, temp_dir: Path):
+        """Test that command output and warnings leave stdout to the events."""
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+history = false
+
+[tool.taskx.tasks]
+hi = {{ cmd = "echo from-task", cwd = "{temp_dir}", pre = "echo from-hook" }}
+piped = {{ cmd = "echo echo from-pipe | sh", cwd = "{temp_dir}", depends = ["hi"] }}
+""")
+
+        result = subprocess.run(
+            [sys.executable, "-c", "from taskx.cli.main import cli; cli(prog_name='taskx')"]
+            + ["--config", str(config_path), "run", "piped", "--events", "ndjson"],
+            env={**os.environ, "TASKX_NO_DAEMON": "1"},
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+        assert result.returncode == 0, result.stderr
+        names = [event["event"] for event in _events(result.stdout)]
+        assert names[0] == "run_start"
+        assert names[-1] == "run_end"
+        for text in ("from-task", "from-hook", "from-pipe", "Security warnings", "Piping to shell"):
+            assert text in result.stderr
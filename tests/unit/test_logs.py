@@ -0,0 +1,138 @@
+"""
+Tests for per-command log files.
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from taskx.cli.main import cli
+from taskx.execution.logs import LogStore
+from taskx.execution.output import TaskOutput
+from taskx.execution.parallel import CommandSpec, ParallelExecutor
+
+
+class TestLogStore:
+    """Test log file naming and lookup."""
+
+    def test_labels_map_to_file_names(self, temp_dir: Path):
+        """Test that labels become safe, readable file names."""
+        store = LogStore(temp_dir)
+
+        assert store.path("test[python=3.11]").name == "test[python=3.11].log"
+        assert store.path("a/b c").name == "a%2Fb%20c.log"
+        assert len(store.path("x" * 500).name) < 150
+
+    def test_find_task_and_cells(self, temp_dir: Path):
+        """Test that a task's logs include its matrix cells and shards."""
+        store = LogStore(temp_dir)
+        for label in ("test", "test[shard=1]", "test[shard=2]", "testing", "lint"):
+            store.open(label).close()
+
+        labels = [label for label, _ in store.find("test")]
+
+        assert labels == ["test", "test[shard=1]", "test[shard=2]"]
+        assert LogStore(temp_dir / "missing").find("test") == []
+
+    def test_find_cells_of_long_task_names(self, temp_dir: Path):
+        """Test that logs with shortened file names are found by their label."""
+        store = LogStore(temp_dir)
+        name = "integration-" * 12
+        for label in (name, f"{name}[shard=1]", f"{name}[shard=2]", f"{name}x[shard=1]"):
+            store.open(label).close()
+
+        labels = [label for label, _ in store.find(name)]
+
+        assert labels == [name, f"{name}[shard=1]", f"{name}[shard=2]"]
+
+
+class TestSpilledOutput:
+    """Test bounded in-memory output with complete logs on disk."""
+
+    def test_tail_is_bounded_by_size(self):
+        """Test that retained output is capped in size, keeping the last line."""
+        output = TaskOutput("t", echo=False, tail_lines=100, tail_bytes=10)
+        for line in ("aaaa", "bbbb", "cccc", "x" * 50):
+            output.write("stdout", line)
+
+        assert output.tail() == ["x" * 50]
+        output.write("stdout", "dddd")
+        assert output.tail() == ["dddd"]
+
+    def test_tail_size_counts_bytes(self):
+        """Test that the tail limit counts encoded bytes, not characters."""
+        output = TaskOutput("t", echo=False, tail_lines=100, tail_bytes=10)
+        for line in ("éé", "éé", "éé"):  # 4 bytes each
+            output.write("stdout", line)
+
+        assert output.tail() == ["éé", "éé"]
+
+    def test_log_receives_everything(self, temp_dir: Path):
+        """Test that the log keeps lines the tail dropped."""
+        log = LogStore(temp_dir).open("t")
+        output = TaskOutput("t", echo=False, tail_lines=2, log=log)
+        for i in range(5):
+            output.write("stdout" if i % 2 else "stderr", f"line{i}")
+        output.close()
+
+        assert output.tail() == ["line3", "line4"]
+        assert (temp_dir / "t.log").read_text().split() == [f"line{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_executor_writes_logs(self, temp_dir: Path):
+        """Test that parallel commands spill their output and failures point to it."""
+        console = Console(file=io.StringIO(), width=200)
+        executor = ParallelExecutor(console=console, tail_lines=2, log_dir=temp_dir / "logs")
+
+        results = await executor.run_parallel(
+            commands=[CommandSpec(cmd="seq 1 1000; exit 1", label="count")],
+            env={},
+            cwd=str(temp_dir),
+        )
+
+        assert results["count"].stdout == "999\n1000"
+        log = (temp_dir / "logs" / "count.log").read_text().split()
+        assert log == [str(i) for i in range(1, 1001)]
+        assert "count.log" in console.file.getvalue()
+
+
+class TestLogsCommand:
+    """Test 'taskx logs'."""
+
+    @pytest.fixture
+    def project(self, temp_dir: Path) -> Path:
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text("""
+[tool.taskx.tasks]
+a = "seq 1 3"
+b = "echo b"
+check = { parallel = ["a", "b"] }
+""")
+        store = LogStore(temp_dir / ".taskx" / "logs")
+        for label, content in (("a", b"1\n2\n3\n"), ("b", b"b\n")):
+            with store.open(label) as log:
+                log.write(content)
+        return config_path
+
+    def test_shows_parallel_commands(self, cli_runner, project: Path):
+        """Test that a parallel task shows the log of each command."""
+        result = cli_runner.invoke(cli, ["--config", str(project), "logs", "check"])
+
+        assert result.exit_code == 0
+        assert result.output == "==> a <==\n1\n2\n3\n\n==> b <==\nb\n"
+
+    def test_tail(self, cli_runner, project: Path):
+        """Test printing only the end of a log."""
+        result = cli_runner.invoke(cli, ["--config", str(project), "logs", "a", "-n", "2"])
+
+        assert result.exit_code == 0
+        assert result.output == "2\n3\n"
+
+    def test_missing(self, cli_runner, project: Path):
+        """Test that tasks without logs are reported."""
+        result = cli_runner.invoke(cli, ["--config", str(project), "logs", "nope"])
+
+        assert result.exit_code == 1
+        assert "No logs recorded" in result.output
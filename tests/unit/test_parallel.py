@@ -2,11 +2,18 @@
 Tests for parallel task execution.
 """
 
+import asyncio
+import io
+import time
 from pathlib import Path
+from typing import List
 
 import pytest
+from rich.console import Console
 
-from taskx.execution.parallel import ParallelExecutor, run_parallel_sync
+from taskx.execution.output import TaskOutput
+from taskx.execution.parallel import CommandSpec, ParallelExecutor, run_parallel_sync
+from taskx.utils.secure_exec import MAX_LINE_SIZE, SecureCommandExecutor
 
 
 class TestParallelExecutor:
@@ -221,3 +228,233 @@ class TestParallelExecutorErrorHandling:
 
         # Should fail due to invalid cwd
         assert results["echo 'test'"].success is False
+
+
+class TestParallelExecutorAsyncEngine:
+    """Test the native asyncio subprocess engine."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_not_capped_by_thread_pool(self, temp_dir: Path):
+        """Test that many commands run at once without a thread per command."""
+        import threading
+
+        executor = ParallelExecutor(max_concurrent=64)
+        commands = [f"sleep 0.5; echo {i}" for i in range(64)]
+        threads_before = threading.active_count()
+
+        start = time.monotonic()
+        results = await executor.run_parallel(commands=commands, env={}, cwd=str(temp_dir))
+        elapsed = time.monotonic() - start
+
+        assert all(r.success for r in results.values())
+        # 64 half-second sleeps finish together, not in thread-pool-sized waves
+        assert elapsed < 5
+        assert threading.active_count() <= threads_before + 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process_tree(self, temp_dir: Path):
+        """Test that a timeout kills children of the shell, not just the shell."""
+        executor = ParallelExecutor()
+        marker = temp_dir / "survived"
+
+        start = time.monotonic()
+        results = await executor.run_parallel(
+            commands=[f"sleep 2 && touch {marker}"],
+            env={},
+            cwd=str(temp_dir),
+            timeout=1,
+        )
+
+        assert results[f"sleep 2 && touch {marker}"].success is False
+        assert time.monotonic() - start < 2
+        await asyncio.sleep(1.5)
+        assert not marker.exists()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_kills_children(self, temp_dir: Path):
+        """Test that cancelling a run stops its commands."""
+        executor = ParallelExecutor()
+        marker = temp_dir / "survived"
+
+        run = asyncio.ensure_future(
+            executor.run_parallel(
+                commands=[f"sleep 1 && touch {marker}"], env={}, cwd=str(temp_dir)
+            )
+        )
+        await asyncio.sleep(0.3)
+        executor.cancel_all()
+
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        await asyncio.sleep(1.2)
+        assert not marker.exists()
+
+
+class TestLaunchOrder:
+    """Test longest-expected-duration-first scheduling."""
+
+    def _specs(self, durations):
+        return [
+            CommandSpec(cmd=f"echo {name} >> order.txt", label=name, expected_duration=duration)
+            for name, duration in durations
+        ]
+
+    def test_longest_first(self):
+        """Test that the slowest commands get a slot first."""
+        executor = ParallelExecutor(max_concurrent=2)
+        specs = self._specs([("fast", 1.0), ("slow", 30.0), ("medium", 5.0)])
+
+        assert executor._launch_order(specs) == [1, 2, 0]
+
+    def test_unknown_durations_use_median(self):
+        """Test that commands without history are placed at the median."""
+        executor = ParallelExecutor(max_concurrent=1)
+        specs = self._specs([("new", None), ("a", 1.0), ("b", 9.0), ("c", 5.0)])
+
+        assert executor._launch_order(specs) == [2, 0, 3, 1]
+
+    def test_config_order_without_history(self):
+        """Test the fallback to the given order."""
+        executor = ParallelExecutor(max_concurrent=1)
+        specs = self._specs([("a", None), ("b", None)])
+
+        assert executor._launch_order(specs) == [0, 1]
+
+    def test_config_policy_keeps_order(self):
+        """Test that the config policy ignores durations."""
+        executor = ParallelExecutor(max_concurrent=1, policy="config")
+        specs = self._specs([("fast", 1.0), ("slow", 30.0)])
+
+        assert executor._launch_order(specs) == [0, 1]
+
+    def test_unknown_policy_rejected(self):
+        """Test that a typo in the policy is reported."""
+        with pytest.raises(ValueError, match="Unknown scheduling policy"):
+            ParallelExecutor(policy="random")
+
+    @pytest.mark.asyncio
+    async def test_run_launches_in_policy_order(self, temp_dir: Path):
+        """Test the launch order end to end, with results in config order."""
+        executor = ParallelExecutor(max_concurrent=1)
+        specs = self._specs([("fast", 1.0), ("slow", 30.0), ("medium", 5.0)])
+
+        results = await executor.run_parallel(commands=specs, env={}, cwd=str(temp_dir))
+
+        assert (temp_dir / "order.txt").read_text().split() == ["slow", "medium", "fast"]
+        assert list(results) == ["fast", "slow", "medium"]
+
+
+class TestParallelOutputCapture:
+    """Test streaming, line-prefixed output capture."""
+
+    @pytest.mark.asyncio
+    async def test_results_capture_stdout_and_stderr(self, temp_dir: Path):
+        """Test that ExecutionResult carries the command's output."""
+        executor = ParallelExecutor()
+
+        results = await executor.run_parallel(
+            commands=["echo out; echo err >&2"], env={}, cwd=str(temp_dir)
+        )
+
+        result = results["echo out; echo err >&2"]
+        assert result.stdout == "out"
+        assert result.stderr == "err"
+
+    @pytest.mark.asyncio
+    async def test_lines_are_prefixed_with_label(self, temp_dir: Path):
+        """Test that echoed output is prefixed with the command label."""
+        console = Console(record=True, width=200)
+        executor = ParallelExecutor(console=console)
+
+        results = await executor.run_parallel(
+            commands=[
+                CommandSpec(cmd="echo hello", label="shard-1"),
+                CommandSpec(cmd="echo world", label="shard-2"),
+            ],
+            env={},
+            cwd=str(temp_dir),
+        )
+
+        assert set(results) == {"shard-1", "shard-2"}
+        text = console.export_text()
+        assert "shard-1 | hello" in text
+        assert "shard-2 | world" in text
+
+    @pytest.mark.asyncio
+    async def test_output_is_bounded_and_tail_shown_on_failure(self, temp_dir: Path):
+        """Test that only the last N lines are kept and failures show them."""
+        console = Console(record=True, width=200)
+        executor = ParallelExecutor(console=console, tail_lines=3)
+
+        results = await executor.run_parallel(
+            commands=[
+                CommandSpec(cmd="for i in 1 2 3 4 5; do echo line$i; done; exit 2", label="t")
+            ],
+            env={},
+            cwd=str(temp_dir),
+        )
+
+        result = results["t"]
+        assert result.exit_code == 2
+        assert result.stdout.split("\n") == ["line3", "line4", "line5"]
+        assert "last 3 line(s) of output" in console.export_text()
+
+    @pytest.mark.asyncio
+    async def test_long_lines_are_not_truncated(self, temp_dir: Path):
+        """Test that lines longer than the pipe buffer limit are captured whole."""
+        executor = ParallelExecutor(console=Console(file=io.StringIO()))
+
+        results = await executor.run_parallel(
+            commands=[CommandSpec(cmd="python3 -c \"print('x' * 200000)\"", label="long")],
+            env={},
+            cwd=str(temp_dir),
+        )
+
+        assert len(results["long"].stdout) == 200000
+
+    @pytest.mark.asyncio
+    async def test_output_without_newlines_is_passed_on_in_pieces(self):
+        """Test that an unfinished line is not buffered beyond MAX_LINE_SIZE."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"first\r\n" + b"x" * (2 * MAX_LINE_SIZE + 10))
+        reader.feed_eof()
+        lines: List[str] = []
+
+        await SecureCommandExecutor._pump_lines(
+            reader, "stdout", lambda _, line: lines.append(line)
+        )
+
+        assert lines[0] == "first"
+        assert [len(line) for line in lines[1:]] == [MAX_LINE_SIZE, MAX_LINE_SIZE, 10]
+
+
+class TestTaskOutput:
+    """Test the per-command output collector."""
+
+    def test_ring_buffer_keeps_last_lines(self):
+        """Test that the tail is bounded."""
+        output = TaskOutput("t", echo=False, tail_lines=2)
+        for i in range(5):
+            output.write("stdout", f"line{i}")
+
+        assert output.tail() == ["line3", "line4"]
+        assert output.tail(1) == ["line4"]
+
+    def test_streams_are_separated(self):
+        """Test that stdout and stderr can be read separately."""
+        output = TaskOutput("t", echo=False)
+        output.write("stdout", "a")
+        output.write("stderr", "b")
+        output.write("stdout", "c")
+
+        assert output.stdout == "a\nc"
+        assert output.stderr == "b"
+        assert output.tail() == ["a", "b", "c"]
+
+    def test_markup_in_output_is_not_interpreted(self):
+        """Test that child output containing Rich markup is printed literally."""
+        console = Console(record=True, width=100)
+        output = TaskOutput("t", console=console)
+        output.write("stdout", "[red]not markup[/red]")
+
+        assert "[red]not markup[/red]" in console.export_text()
@@ -0,0 +1,257 @@
+"""
+Tests for resource-aware admission of commands.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from taskx.core.config import Config
+from taskx.core.resources import parse_memory, pool_resource
+from taskx.core.runner import TaskRunner
+from taskx.core.task import Task
+from taskx.execution.parallel import CommandSpec, ParallelExecutor
+from taskx.execution.resources import CapacityLimiter
+
+
+class TestParseMemory:
+    """Test memory size parsing."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (1024, 1024),
+            ("512", 512),
+            ("512M", 512 << 20),
+            ("2G", 2 << 30),
+            ("1.5g", 3 << 29),
+            ("2GiB", 2 << 30),
+            ("64 KB", 64 << 10),
+        ],
+    )
+    def test_sizes(self, value, expected):
+        """Test plain byte counts and K/M/G suffixes."""
+        assert parse_memory(value) == expected
+
+    @pytest.mark.parametrize("value", ["lots", "2X", "-1G", -5, True])
+    def test_invalid(self, value):
+        """Test that malformed sizes are rejected."""
+        with pytest.raises(ValueError):
+            parse_memory(value)
+
+    def test_task_resources(self):
+        """Test that tasks normalize their declared resources."""
+        task = Task(name="build", cmd="make", cpus=4, mem="2G")
+
+        assert task.mem == 2 << 30
+        assert task.resources == {"cpus": 4.0, "mem": float(2 << 30)}
+        assert Task(name="lint", cmd="ruff").resources == {}
+        with pytest.raises(ValueError, match="cpus"):
+            Task(name="bad", cmd="make", cpus=-1)
+
+
+class TestCapacityLimiter:
+    """Test the weighted semaphore."""
+
+    def test_acquire_and_release(self):
+        """Test that requests are admitted while they fit."""
+        limiter = CapacityLimiter({"cpus": 4, "mem": 100})
+
+        assert limiter.try_acquire({"cpus": 3, "mem": 50})
+        assert not limiter.try_acquire({"cpus": 2})
+        assert limiter.try_acquire({"cpus": 1, "mem": 50})
+        assert limiter.in_use == {"cpus": 4.0, "mem": 100.0}
+
+        limiter.release({"cpus": 3, "mem": 50})
+        assert limiter.in_use == {"cpus": 1.0, "mem": 50.0}
+
+    def test_oversized_and_unknown_requests(self):
+        """Test that large requests run alone and unknown kinds aren't limited."""
+        limiter = CapacityLimiter({"cpus": 2})
+
+        assert limiter.try_acquire({"cpus": 16, "gpus": 1})
+        assert limiter.in_use == {"cpus": 2.0}
+        assert limiter.try_acquire({"gpus": 8})
+        assert limiter.try_acquire(None)
+
+    def test_timeout(self):
+        """Test giving up when resources stay taken."""
+        limiter = CapacityLimiter({"cpus": 1})
+        limiter.acquire({"cpus": 1})
+
+        assert limiter.acquire({"cpus": 1}, timeout=0.05) is False
+        # The abandoned request doesn't block later ones
+        limiter.release({"cpus": 1})
+        assert limiter.try_acquire({"cpus": 1})
+
+    def test_waiters_are_served_in_arrival_order(self):
+        """Test that a large request isn't overtaken by small ones."""
+        limiter = CapacityLimiter({"cpus": 4})
+        limiter.acquire({"cpus": 2})
+        order = []
+
+        def run(name: str, cpus: int) -> None:
+            with limiter.hold({"cpus": cpus}):
+                order.append(name)
+                time.sleep(0.02)
+
+        big = threading.Thread(target=run, args=("big", 4))
+        big.start()
+        time.sleep(0.05)
+        # Fits next to the held request, but the big one asked first
+        assert not limiter.try_acquire({"cpus": 1})
+        small = threading.Thread(target=run, args=("small", 1))
+        small.start()
+        time.sleep(0.05)
+
+        limiter.release({"cpus": 2})
+        big.join(timeout=5)
+        small.join(timeout=5)
+
+        assert order == ["big", "small"]
+        assert limiter.in_use == {"cpus": 0.0}
+
+    def test_max_load(self):
+        """Test that the load average gates admission while commands run."""
+        load = [8.0]
+        limiter = CapacityLimiter(
+            {"cpus": 8}, max_load=4.0, load_average=lambda: load[0], poll_interval=0.01
+        )
+
+        # Nothing of ours runs yet: waiting wouldn't lower the load
+        assert limiter.try_acquire({"cpus": 1})
+        assert not limiter.try_acquire({"cpus": 1})
+
+        threading.Timer(0.05, lambda: load.__setitem__(0, 1.0)).start()
+        assert limiter.acquire({"cpus": 1}, timeout=5)
+
+    def test_waiters_only_block_the_same_kinds(self):
+        """Test that a request waiting on a pool doesn't hold back others."""
+        limiter = CapacityLimiter({"cpus": 4, "mem": 10, "pool:db": 1})
+        limiter.acquire({"pool:db": 1})
+        waiter = threading.Thread(target=limiter.acquire, args=({"pool:db": 1, "cpus": 1},))
+        waiter.start()
+        time.sleep(0.05)
+
+        # cpus are free, but the waiter asked for them first
+        assert not limiter.available({"cpus": 1})
+        assert limiter.try_acquire({"mem": 1})
+        limiter.release({"pool:db": 1})
+        waiter.join(timeout=5)
+        assert limiter.in_use == {"cpus": 1.0, "mem": 1.0, "pool:db": 1.0}
+
+    def test_pools_from_settings(self):
+        """Test pool sizes from settings, and mutual exclusion by default."""
+        limiter = CapacityLimiter.from_settings(
+            {"cpus": 2, "pools": {"network": 4}}, pools=["db", "network"]
+        )
+
+        assert limiter.capacity[pool_resource("db")] == 1.0
+        assert limiter.capacity[pool_resource("network")] == 4.0
+        assert limiter.capacity["cpus"] == 2.0
+        with pytest.raises(ValueError, match="positive integer"):
+            CapacityLimiter.from_settings({"pools": {"db": 0}})
+
+    @pytest.mark.asyncio
+    async def test_async_waiters_share_the_budget(self):
+        """Test that event-loop waiters are woken by releases from threads."""
+        limiter = CapacityLimiter({"cpus": 2})
+        limiter.acquire({"cpus": 2})
+
+        waiter = asyncio.ensure_future(limiter.acquire_async({"cpus": 1}))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+
+        threading.Timer(0.02, limiter.release, args=({"cpus": 2},)).start()
+        await asyncio.wait_for(waiter, timeout=5)
+        assert limiter.in_use == {"cpus": 1.0}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        """Test that cancelling a waiting command doesn't block others."""
+        limiter = CapacityLimiter({"cpus": 1})
+        limiter.acquire({"cpus": 1})
+
+        waiter = asyncio.ensure_future(limiter.acquire_async({"cpus": 1}))
+        await asyncio.sleep(0.02)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limiter.release({"cpus": 1})
+        assert limiter.try_acquire({"cpus": 1})
+
+
+class TestResourceAdmission:
+    """Test admission of parallel commands."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_commands_dont_overlap(self, temp_dir: Path):
+        """Test that commands needing the whole budget run one at a time."""
+        executor = ParallelExecutor(
+            console=Console(quiet=True), limiter=CapacityLimiter({"cpus": 2})
+        )
+        log = temp_dir / "log"
+        commands = [
+            CommandSpec(
+                cmd=f"echo start >> {log}; sleep 0.2; echo end >> {log}",
+                label=f"job{i}",
+                resources={"cpus": 2},
+            )
+            for i in range(3)
+        ]
+
+        results = await executor.run_parallel(commands, env={}, cwd=str(temp_dir))
+
+        assert all(result.success for result in results.values())
+        assert log.read_text().split() == ["start", "end"] * 3
+
+    def test_runner_admits_dependencies_against_settings(self, temp_dir: Path):
+        """Test that concurrent dependencies share the configured budget."""
+        log = temp_dir / "log"
+        step = f"echo start >> {log}; sleep 0.2; echo end >> {log}"
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+cpus = 2
+history = false
+
+[tool.taskx.tasks]
+build = {{ cmd = "{step}", cwd = "{temp_dir}", cpus = 2 }}
+docs = {{ cmd = "{step}", cwd = "{temp_dir}", cpus = 2 }}
+all = {{ cmd = "true", cwd = "{temp_dir}", depends = ["build", "docs"] }}
+""")
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config, console=Console(quiet=True))
+
+        assert runner.limiter.capacity["cpus"] == 2.0
+        assert runner.run("all") is True
+        assert log.read_text().split() == ["start", "end"] * 2
+
+    def test_pool_serializes_across_depends_and_parallel(self, temp_dir: Path):
+        """Test that a pool is shared by dependencies and parallel commands."""
+        log = temp_dir / "log"
+        step = f"echo start >> {log}; sleep 0.2; echo end >> {log}"
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+history = false
+
+[tool.taskx.tasks]
+migrate = {{ cmd = "{step}", cwd = "{temp_dir}", pool = "db" }}
+seed = {{ cmd = "{step}", cwd = "{temp_dir}", pool = "db" }}
+lint = {{ cmd = "sleep 0.2", cwd = "{temp_dir}" }}
+itest = {{ parallel = ["seed", "lint"], cwd = "{temp_dir}" }}
+all = {{ cmd = "true", cwd = "{temp_dir}", depends = ["migrate", "itest"] }}
+""")
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config, console=Console(quiet=True))
+
+        assert runner.run("all") is True
+        assert log.read_text().split() == ["start", "end"] * 2
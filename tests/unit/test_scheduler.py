@@ -0,0 +1,249 @@
+"""
+Tests for the dependency graph scheduler.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+
+from taskx.core.config import Config
+from taskx.core.runner import TaskRunner
+from taskx.core.task import ExecutionResult
+from taskx.execution.scheduler import DagScheduler
+
+
+def _ok(name: str) -> ExecutionResult:
+    return ExecutionResult(task_name=name, success=True)
+
+
+class TestDagScheduler:
+    """Test ready-queue scheduling."""
+
+    def test_sequential_order_matches_topological_order(self):
+        """Test that one worker runs tasks in the given order."""
+        graph = {"lint": [], "test": [], "check": ["lint", "test"]}
+        ran = []
+
+        def execute(name):
+            ran.append(name)
+            return _ok(name)
+
+        scheduler = DagScheduler(graph, execute, max_workers=1, order=["lint", "test", "check"])
+
+        assert scheduler.run() is True
+        assert ran == ["lint", "test", "check"]
+
+    def test_independent_siblings_run_concurrently(self):
+        """Test that siblings overlap instead of running back-to-back."""
+        graph = {"lint": [], "test": [], "check": ["lint", "test"]}
+        barrier = threading.Barrier(2, timeout=5)
+        ran = []
+
+        def execute(name):
+            if name in ("lint", "test"):
+                # Both siblings must be in flight at once to pass the barrier
+                barrier.wait()
+            ran.append(name)
+            return _ok(name)
+
+        scheduler = DagScheduler(graph, execute, max_workers=4)
+
+        assert scheduler.run() is True
+        assert ran[-1] == "check"
+
+    def test_dependents_wait_for_dependencies(self):
+        """Test that a task starts only after all its dependencies finished."""
+        graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+        finished = set()
+        lock = threading.Lock()
+
+        def execute(name):
+            with lock:
+                assert set(graph[name]) <= finished
+            time.sleep(0.01)
+            with lock:
+                finished.add(name)
+            return _ok(name)
+
+        assert DagScheduler(graph, execute, max_workers=4).run() is True
+        assert finished == {"a", "b", "c", "d"}
+
+    def test_failure_stops_scheduling(self):
+        """Test fail-fast: dependents of a failed task never start."""
+        graph = {"fail": [], "deploy": ["fail"]}
+        ran = []
+
+        def execute(name):
+            ran.append(name)
+            return ExecutionResult(task_name=name, success=name != "fail", exit_code=1)
+
+        scheduler = DagScheduler(graph, execute, max_workers=4)
+
+        assert scheduler.run() is False
+        assert scheduler.failed_task == "fail"
+        assert scheduler.skipped == {"deploy"}
+        assert ran == ["fail"]
+
+    def test_ignored_failure_continues(self):
+        """Test that ignorable failures still release their dependents."""
+        graph = {"flaky": [], "deploy": ["flaky"]}
+
+        def execute(name):
+            return ExecutionResult(task_name=name, success=name != "flaky", exit_code=1)
+
+        scheduler = DagScheduler(
+            graph,
+            execute,
+            max_workers=4,
+            should_continue=lambda result: result.task_name == "flaky",
+        )
+
+        assert scheduler.run() is True
+        assert set(scheduler.results) == {"flaky", "deploy"}
+
+    def test_exclusive_tasks_run_on_calling_thread(self):
+        """Test that interactive tasks run alone on the caller's thread."""
+        graph = {"a": [], "b": [], "prompt": []}
+        threads = {}
+
+        def execute(name):
+            threads[name] = threading.current_thread()
+            return _ok(name)
+
+        scheduler = DagScheduler(
+            graph, execute, max_workers=4, is_exclusive=lambda name: name == "prompt"
+        )
+
+        assert scheduler.run() is True
+        assert threads["prompt"] is threading.current_thread()
+
+    def test_worker_exception_becomes_failed_result(self):
+        """Test that exceptions raised by a task are reported as failures."""
+
+        def execute(name):
+            raise RuntimeError("boom")
+
+        scheduler = DagScheduler({"a": [], "b": []}, execute, max_workers=2)
+
+        assert scheduler.run() is False
+        failed = scheduler.results[scheduler.failed_task]
+        assert isinstance(failed.error, RuntimeError)
+
+    def test_priority_launches_critical_path_first(self, monkeypatch):
+        """Test that the ready task with the heaviest priority starts first."""
+        graph = {"short": [], "long": [], "after_long": ["long"]}
+        submitted = []
+        submit = ThreadPoolExecutor.submit
+
+        def recording_submit(pool, fn, name):
+            submitted.append(name)
+            return submit(pool, fn, name)
+
+        monkeypatch.setattr(ThreadPoolExecutor, "submit", recording_submit)
+        scheduler = DagScheduler(
+            graph,
+            _ok,
+            max_workers=2,
+            order=["short", "long", "after_long"],
+            priority={"short": 1.0, "long": 2.0, "after_long": 1.0},
+        )
+
+        assert scheduler.run() is True
+        assert submitted[:2] == ["long", "short"]
+
+    def test_tasks_that_cant_start_are_passed_over(self):
+        """Test that a blocked task doesn't hold a worker others could use."""
+        graph = {"db1": [], "db2": [], "lint": []}
+        running = set()
+        overlapped = []
+        lock = threading.Lock()
+
+        def execute(name):
+            with lock:
+                running.add(name)
+                overlapped.append(set(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(name)
+            return _ok(name)
+
+        def can_start(name):
+            with lock:
+                return not (name.startswith("db") and any(r.startswith("db") for r in running))
+
+        scheduler = DagScheduler(
+            graph, execute, max_workers=2, order=["db1", "db2", "lint"], can_start=can_start
+        )
+
+        assert scheduler.run() is True
+        assert {"db1", "lint"} in overlapped
+        assert not any({"db1", "db2"} <= ran for ran in overlapped)
+
+
+class TestRunnerScheduling:
+    """Test TaskRunner integration with the scheduler."""
+
+    def test_run_executes_dependency_graph(self, temp_dir: Path):
+        """Test that sibling dependencies run in parallel through the runner."""
+        marker = temp_dir / "out.txt"
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+max_parallel_tasks = 4
+
+[tool.taskx.tasks]
+lint = {{ cmd = "echo lint >> {marker}", cwd = "{temp_dir}" }}
+test = {{ cmd = "echo test >> {marker}", cwd = "{temp_dir}" }}
+check = {{ depends = ["lint", "test"], cmd = "echo check >> {marker}", cwd = "{temp_dir}" }}
+""")
+        config = Config(config_path)
+        config.load()
+
+        assert TaskRunner(config).run("check") is True
+        lines = marker.read_text().split()
+        assert sorted(lines[:2]) == ["lint", "test"]
+        assert lines[2] == "check"
+
+    def test_run_fails_fast(self, temp_dir: Path):
+        """Test that a failing dependency stops the chain."""
+        marker = temp_dir / "deployed"
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.tasks]
+fail = {{ cmd = "exit 1", cwd = "{temp_dir}" }}
+deploy = {{ depends = ["fail"], cmd = "touch {marker}", cwd = "{temp_dir}" }}
+""")
+        config = Config(config_path)
+        config.load()
+
+        assert TaskRunner(config).run("deploy") is False
+        assert not marker.exists()
+
+    def test_run_tasks_without_dependencies(self, temp_dir: Path):
+        """Test running a selection of tasks, ordered among themselves only."""
+        marker = temp_dir / "out.txt"
+        config_path = temp_dir / "pyproject.toml"
+        config_path.write_text(f"""
+[tool.taskx.settings]
+history = false
+
+[tool.taskx.tasks]
+gen = {{ cmd = "echo gen >> {marker}", cwd = "{temp_dir}" }}
+lib = {{ depends = ["gen"], cmd = "echo lib >> {marker}", cwd = "{temp_dir}" }}
+app = {{ depends = ["lib"], cmd = "echo app >> {marker}", cwd = "{temp_dir}" }}
+docs = {{ cmd = "echo docs >> {marker}", cwd = "{temp_dir}" }}
+""")
+        config = Config(config_path)
+        config.load()
+        runner = TaskRunner(config, console=Console(quiet=True))
+
+        assert runner.run_tasks(["app", "lib"], with_dependencies=False) is True
+        assert marker.read_text().split() == ["lib", "app"]
+
+        marker.unlink()
+        assert runner.run_tasks(["app", "docs"]) is True
+        assert sorted(marker.read_text().split()) == ["app", "docs", "gen", "lib"]
+        assert runner.run_tasks(["nope"], with_dependencies=False) is False
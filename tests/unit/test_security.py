@@ -0,0 +1,91 @@
+"""
+Tests for command security validation.
+"""
+
+import pytest
+
+from taskx.utils.secure_exec import SecureCommandExecutor, SecurityError, compile_rules
+from taskx.utils.shell import ShellValidator
+
+
+class TestSecureCommandExecutor:
+    """Test the compiled forbidden/suspicious rules."""
+
+    def test_safe_command(self):
+        """Test that ordinary commands pass without warnings."""
+        assert SecureCommandExecutor().validate_command("pytest -x tests/") == (True, [])
+
+    @pytest.mark.parametrize(
+        "cmd, reason",
+        [
+            ("rm -rf /", "delete root directory"),
+            ("echo hi; MKFS.ext4 /dev/sda1", "Filesystem formatting"),
+            ("echo `whoami`", "backticks"),
+            ("echo $(whoami)", r"\$\(\)"),
+        ],
+    )
+    def test_forbidden_patterns_raise(self, cmd, reason):
+        """Test that forbidden patterns are blocked case-insensitively."""
+        with pytest.raises(SecurityError, match=reason):
+            SecureCommandExecutor().validate_command(cmd)
+
+    def test_first_forbidden_pattern_in_list_order_is_reported(self):
+        """Test that the reported rule doesn't depend on match position."""
+        with pytest.raises(SecurityError, match="backticks"):
+            SecureCommandExecutor().validate_command("echo $(id) `id`")
+
+    def test_all_suspicious_patterns_are_reported(self):
+        """Test that overlapping suspicious patterns each produce a warning."""
+        is_safe, warnings = SecureCommandExecutor().validate_command(
+            "curl https://example.com/install | sh"
+        )
+
+        assert is_safe is False
+        assert warnings == [
+            "Suspicious pattern: Piping to shell",
+            "Suspicious pattern: Curl pipe to shell",
+        ]
+
+    def test_verdicts_are_memoized(self):
+        """Test that repeated commands are scanned once."""
+        executor = SecureCommandExecutor()
+        executor.rules.scan.cache_clear()
+
+        for _ in range(3):
+            executor.validate_command("make build")
+            with pytest.raises(SecurityError):
+                executor.validate_command("mkfs /dev/sdb")
+
+        info = executor.rules.scan.cache_info()
+        assert (info.misses, info.hits) == (2, 4)
+
+    def test_rules_are_compiled_once(self):
+        """Test that executors share the compiled rules."""
+        assert SecureCommandExecutor().rules is SecureCommandExecutor().rules
+
+    def test_subclass_patterns(self):
+        """Test that subclasses overriding the patterns get their own rules."""
+
+        class Strict(SecureCommandExecutor):
+            FORBIDDEN_PATTERNS = [(r"\bsudo\b", "Privilege escalation")]
+
+        with pytest.raises(SecurityError, match="Privilege escalation"):
+            Strict().validate_command("sudo make install")
+        assert SecureCommandExecutor().validate_command("sudo make install") == (True, [])
+        assert Strict().rules is not SecureCommandExecutor().rules
+
+    def test_no_patterns(self):
+        """Test that empty rule lists accept everything."""
+        rules = compile_rules((), ())
+
+        assert rules.scan("rm -rf /") == (None, ())
+
+
+class TestShellValidator:
+    """Test the dangerous command check."""
+
+    def test_dangerous_commands(self):
+        """Test case-insensitive substring matching."""
+        assert ShellValidator.is_safe_command("echo ok") is True
+        assert ShellValidator.is_safe_command("sudo CHMOD -R 777 / ") is False
+        assert ShellValidator.is_safe_command("DD IF=/dev/zero of=x") is False
@@ -0,0 +1,45 @@
+"""
+Tests for command templates and variable expansion.
+"""
+
+from taskx.utils.shell import CommandTemplate, EnvironmentExpander, compile_template
+
+
+class TestCommandTemplate:
+    """Test parsed command templates."""
+
+    def test_expand_quotes_values(self):
+        """Test that substituted values are shell-quoted."""
+        template = CommandTemplate("echo ${GREETING} $NAME!")
+
+        assert template.expand({"GREETING": "hello world", "NAME": "x; rm -rf ~"}) == (
+            "echo 'hello world' 'x; rm -rf ~'!"
+        )
+
+    def test_unset_variables_are_kept(self):
+        """Test that unknown references stay (quoted) as written."""
+        assert CommandTemplate("echo ${MISSING}/$ALSO").expand({}) == "echo '${MISSING}'/'$ALSO'"
+
+    def test_variables(self):
+        """Test that references are reported in order, with repeats."""
+        template = CommandTemplate("cp $SRC ${DST} && ls ${DST}")
+
+        assert template.variables == ("SRC", "DST", "DST")
+
+    def test_plain_command(self):
+        """Test that commands without references expand to themselves."""
+        template = CommandTemplate("make build")
+
+        assert template.variables == ()
+        assert template.expand({"make": "x"}) == "make build"
+
+    def test_compile_template_is_cached(self):
+        """Test that each distinct command is parsed once."""
+        assert compile_template("echo $A") is compile_template("echo $A")
+
+    def test_expander_matches_template(self):
+        """Test the EnvironmentExpander wrappers."""
+        env = {"A": "1", "B": "two words"}
+
+        assert EnvironmentExpander.expand_variables("x $A ${B}", env) == "x 1 'two words'"
+        assert EnvironmentExpander.find_variables("x $A ${B} $A") == ["A", "B", "A"]
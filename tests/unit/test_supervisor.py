@@ -0,0 +1,138 @@
+"""
+Tests for supervised watch-mode processes.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from taskx.execution.supervisor import ProcessSupervisor, _group_alive, taskx_command
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX here")
+
+
+def python(code: str) -> list:
+    """Command running a Python snippet."""
+    return [sys.executable, "-c", code]
+
+
+def process_running(pid: int) -> bool:
+    """Whether a process exists and hasn't exited (orphaned zombies may never be reaped)."""
+    if Path("/proc").is_dir():
+        try:
+            return Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0] != "Z"
+        except OSError:
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def wait_for_file(path: Path, timeout: float = 10.0) -> None:
+    """Wait until a started process signals readiness by creating a file."""
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        assert time.monotonic() < deadline, f"{path} was never created"
+        await asyncio.sleep(0.02)
+
+
+class TestProcessSupervisor:
+    """Test stopping and restarting process groups."""
+
+    @pytest.mark.asyncio
+    async def test_graceful_stop(self, temp_dir: Path):
+        """Test that the process gets the stop signal and may exit cleanly."""
+        ready = temp_dir / "ready"
+        supervisor = ProcessSupervisor(
+            python(
+                "import signal, sys, time\n"
+                "signal.signal(signal.SIGINT, lambda *a: sys.exit(3))\n"
+                f"open({str(ready)!r}, 'w').close()\n"
+                "time.sleep(30)\n"
+            )
+        )
+
+        await supervisor.start()
+        await wait_for_file(ready)
+        assert supervisor.running
+
+        assert supervisor.process is not None
+        group = supervisor.process.pid
+        assert await supervisor.stop() == 3
+        assert not supervisor.running
+        assert not supervisor.killed
+        assert not _group_alive(group)
+
+    @pytest.mark.asyncio
+    async def test_kill_after_grace_period(self, temp_dir: Path):
+        """Test that a process ignoring the stop signal is killed."""
+        ready = temp_dir / "ready"
+        supervisor = ProcessSupervisor(
+            python(
+                "import signal, time\n"
+                "signal.signal(signal.SIGINT, signal.SIG_IGN)\n"
+                f"open({str(ready)!r}, 'w').close()\n"
+                "time.sleep(30)\n"
+            ),
+            grace_period=0.2,
+        )
+
+        await supervisor.start()
+        await wait_for_file(ready)
+        started = time.monotonic()
+
+        assert await supervisor.stop() == -signal.SIGKILL
+        assert supervisor.killed
+        assert time.monotonic() - started < 5
+
+    @pytest.mark.asyncio
+    async def test_stop_reaches_the_whole_group(self, temp_dir: Path):
+        """Test that processes started by the task are stopped with it."""
+        ready = temp_dir / "ready"
+        supervisor = ProcessSupervisor(
+            ["sh", "-c", f"sleep 30 & echo $! > {ready}.tmp && mv {ready}.tmp {ready}; wait"],
+            grace_period=0.5,
+        )
+
+        await supervisor.start()
+        await wait_for_file(ready)
+        background = int(ready.read_text())
+        assert process_running(background)
+        await supervisor.stop()
+
+        assert not process_running(background)
+
+    @pytest.mark.asyncio
+    async def test_restart(self, temp_dir: Path):
+        """Test that starting again replaces the running process."""
+        log = temp_dir / "log"
+        supervisor = ProcessSupervisor(
+            ["sh", "-c", f"echo start >> {log}; exec sleep 30"], grace_period=1
+        )
+
+        await supervisor.start()
+        await wait_for_file(log)
+        first = supervisor.process
+        await supervisor.start()
+
+        assert first is not None and first.returncode is not None
+        assert supervisor.running
+        deadline = time.monotonic() + 10
+        while log.read_text().split() != ["start", "start"]:
+            assert time.monotonic() < deadline, log.read_text()
+            await asyncio.sleep(0.02)
+        await supervisor.stop()
+
+    def test_taskx_command(self, temp_dir: Path):
+        """Test that taskx is re-run with this interpreter and an absolute config."""
+        argv = taskx_command(temp_dir / "pyproject.toml", "run", "dev")
+
+        assert argv[0] == sys.executable
+        assert argv[-4:] == ["--config", str((temp_dir / "pyproject.toml").resolve()), "run", "dev"]
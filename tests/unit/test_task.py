@@ -1,5 +1,7 @@
 """Tests for task module."""
 
+import pickle
+
 import pytest
 
 from taskx.core.task import ExecutionResult, Hook, Task
@@ -47,6 +49,26 @@ class TestTask:
         task = Task(name="test", cmd="echo 'test'", pre="echo 'before'")
         assert task.has_hooks
 
+    def test_commands_are_parsed_once(self):
+        """Test that templates and required variables are precomputed."""
+        task = Task(name="deploy", cmd="deploy --env ${STAGE} --tag $TAG", env={"X": "1"})
+
+        assert task.required_vars == {"STAGE", "TAG"}
+        assert task.template(task.cmd) is task.templates[task.cmd]
+        assert task.template(task.cmd).expand({"STAGE": "prod", "TAG": "v 1"}) == (
+            "deploy --env prod --tag 'v 1'"
+        )
+
+        parallel = Task(name="all", parallel=["lint $PKG", "unit"])
+        assert parallel.required_vars == {"PKG"}
+
+    def test_templates_survive_pickling(self):
+        """Test that the config cache keeps parsed templates."""
+        task = pickle.loads(pickle.dumps(Task(name="t", cmd="echo ${A}")))
+
+        assert task.template("echo ${A}").expand({"A": "x"}) == "echo x"
+        assert task.required_vars == {"A"}
+
 
 class TestExecutionResult:
     """Test ExecutionResult model."""
@@ -3,13 +3,22 @@ Tests for file watcher and watch mode functionality.
 """
 
 import asyncio
+import threading
 import time
 from pathlib import Path
 
 import pytest
+from rich.console import Console
 
 from taskx.core.task import Task
-from taskx.execution.watcher import FileWatcher, watch_task_sync
+from taskx.execution.supervisor import ProcessSupervisor
+from taskx.execution.watcher import (
+    FileWatcher,
+    WatchIndex,
+    WatchMatcher,
+    _watch_plan,
+    watch_task_sync,
+)
 
 
 class TestFileWatcher:
@@ -26,89 +35,54 @@ class TestFileWatcher:
         watcher = FileWatcher(patterns=["*.py"], debounce_ms=500)
         assert watcher.debounce_ms == 0.5  # Converted to seconds
 
-    def test_filter_changes_matches_pattern(self):
+    def test_matcher_matches_pattern(self):
         """Test filtering changes based on patterns."""
-        watcher = FileWatcher(patterns=["*.py"])
-
-        # Simulate changes from watchfiles
-        changes = {
-            ("modified", "/path/to/file.py"),
-            ("modified", "/path/to/file.txt"),
-            ("modified", "/path/to/another.py"),
-        }
-
-        filtered = watcher._filter_changes(changes)
+        matcher = FileWatcher(patterns=["*.py"]).matcher
 
         # Only .py files should be included
-        filtered_paths = {str(p) for p in filtered}
-        assert "/path/to/file.py" in filtered_paths
-        assert "/path/to/another.py" in filtered_paths
-        assert "/path/to/file.txt" not in filtered_paths
+        assert matcher.matches("/path/to/file.py")
+        assert matcher.matches("/path/to/another.py")
+        assert not matcher.matches("/path/to/file.txt")
 
-    def test_filter_changes_multiple_patterns(self):
+    def test_matcher_multiple_patterns(self):
         """Test filtering with multiple patterns."""
-        watcher = FileWatcher(patterns=["*.py", "*.toml"])
-
-        changes = {
-            ("modified", "/path/to/file.py"),
-            ("modified", "/path/to/config.toml"),
-            ("modified", "/path/to/file.txt"),
-        }
+        matcher = WatchMatcher(["*.py", "*.toml"])
 
-        filtered = watcher._filter_changes(changes)
-        filtered_paths = {str(p) for p in filtered}
+        assert matcher.matches("/path/to/file.py")
+        assert matcher.matches("/path/to/config.toml")
+        assert not matcher.matches("/path/to/file.txt")
 
-        assert "/path/to/file.py" in filtered_paths
-        assert "/path/to/config.toml" in filtered_paths
-        assert "/path/to/file.txt" not in filtered_paths
-
-    def test_filter_changes_ignores_hidden_files(self):
+    def test_matcher_ignores_hidden_files(self):
         """Test that hidden files are ignored."""
-        watcher = FileWatcher(patterns=["*"])
-
-        changes = {
-            ("modified", "/path/to/.hidden.py"),
-            ("modified", "/path/to/visible.py"),
-        }
+        matcher = WatchMatcher(["*"])
 
-        filtered = watcher._filter_changes(changes)
-        filtered_paths = {str(p) for p in filtered}
+        assert matcher.matches("/path/to/visible.py")
+        assert not matcher.matches("/path/to/.hidden.py")
 
-        assert "/path/to/visible.py" in filtered_paths
-        assert "/path/to/.hidden.py" not in filtered_paths
-
-    def test_filter_changes_ignores_cache_directories(self):
+    def test_matcher_ignores_cache_directories(self):
         """Test that cache/build directories are ignored."""
-        watcher = FileWatcher(patterns=["*.py"])
-
-        changes = {
-            ("modified", "/path/to/file.py"),
-            ("modified", "/path/to/__pycache__/file.pyc"),
-            ("modified", "/path/to/node_modules/package.py"),
-            ("modified", "/path/to/.pytest_cache/file.py"),
-        }
-
-        filtered = watcher._filter_changes(changes)
-        filtered_paths = {str(p) for p in filtered}
-
-        assert "/path/to/file.py" in filtered_paths
-        assert len(filtered_paths) == 1  # Only the non-cache file
-
-    def test_filter_changes_glob_patterns(self):
+        matcher = WatchMatcher(["*.py"])
+        changes = [
+            "/path/to/file.py",
+            "/path/to/__pycache__/file.pyc",
+            "/path/to/node_modules/package.py",
+            "/path/to/.pytest_cache/file.py",
+        ]
+
+        # Only the non-cache file
+        assert [path for path in changes if matcher.matches(path)] == ["/path/to/file.py"]
+        assert matcher.ignores_dir("node_modules")
+        assert matcher.ignores_dir(".venv")
+        assert not matcher.ignores_dir("src")
+
+    def test_matcher_glob_patterns(self):
         """Test glob pattern matching."""
-        watcher = FileWatcher(patterns=["**/*.py"])
-
-        changes = {
-            ("modified", "/project/src/main.py"),
-            ("modified", "/project/src/utils/helper.py"),
-            ("modified", "/project/tests/test.py"),
-        }
-
-        filtered = watcher._filter_changes(changes)
-        filtered_paths = {str(p) for p in filtered}
+        matcher = WatchMatcher(["**/*.py"])
 
         # All .py files should match the **/*.py pattern
-        assert len(filtered) == 3  # All Python files match
+        assert matcher.matches("/project/src/main.py")
+        assert matcher.matches("/project/src/utils/helper.py")
+        assert matcher.matches("/project/tests/test.py")
 
     def test_display_changes(self, capsys):
         """Test displaying changes."""
@@ -133,6 +107,153 @@ class TestFileWatcher:
         # Should not output anything for empty changes
 
 
+class TestWatchMatcher:
+    """Test compiled watch patterns and watch roots."""
+
+    def test_anchored_and_anywhere_patterns(self):
+        """Test that file name patterns match anywhere and paths from the base."""
+        matcher = WatchMatcher(["*.py", "src/**/*.ts", "docs/", "data?.[ct]sv"], base=Path("/p"))
+
+        assert matcher.matches("/p/app.py")
+        assert matcher.matches("/p/a/b/c/app.py")
+        assert matcher.matches("/p/src/index.ts")
+        assert matcher.matches("/p/src/a/b/index.ts")
+        assert not matcher.matches("/p/lib/src/index.ts")
+        assert matcher.matches("/p/docs/guide/intro.md")
+        assert matcher.matches("/p/data1.csv")
+        assert not matcher.matches("/p/data1.json")
+
+    def test_ignored_directories_are_relative_to_base(self):
+        """Test that only directories below the base are ignored."""
+        matcher = WatchMatcher(["**/*.py"], base=Path("/home/me/.projects/app"))
+
+        assert matcher.matches("/home/me/.projects/app/src/main.py")
+        assert not matcher.matches("/home/me/.projects/app/.venv/lib/site.py")
+        assert not matcher.matches("/home/me/.projects/app/pkg/__pycache__/m.py")
+
+    def test_roots_are_narrowed_to_literal_prefixes(self, temp_dir: Path):
+        """Test that only the directories patterns can match in are watched."""
+        for directory in ("src/app", "tests/unit", "node_modules"):
+            (temp_dir / directory).mkdir(parents=True)
+        base = temp_dir.resolve()
+
+        roots = WatchMatcher(["src/**/*.py", "src/app/*.html", "tests/*/test_*.py"]).roots(base)
+        assert roots == [base / "src", base / "tests"]
+
+        # A missing directory is watched for from its closest existing parent
+        assert WatchMatcher(["tests/e2e/*.py"]).roots(base) == [base / "tests"]
+        # A file name pattern can match anywhere
+        assert WatchMatcher(["src/**/*.py", "*.toml"]).roots(base) == [base]
+
+    @pytest.mark.asyncio
+    async def test_changes_outside_narrowed_roots_are_not_seen(self, temp_dir: Path):
+        """Test watching only the pattern roots, through the watchfiles filter."""
+        (temp_dir / "src").mkdir()
+        (temp_dir / "other").mkdir()
+        watcher = FileWatcher(patterns=["src/*.py"], console=Console(quiet=True))
+        collector = watcher._start_collecting(temp_dir)
+
+        try:
+            deadline = time.monotonic() + 10
+            while not watcher._pending_changes:
+                assert time.monotonic() < deadline, "change in src was not seen"
+                (temp_dir / "other" / "skip.py").write_text(str(time.monotonic()))
+                (temp_dir / "src" / "ignored.txt").write_text(str(time.monotonic()))
+                (temp_dir / "src" / "app.py").write_text(str(time.monotonic()))
+                await asyncio.sleep(0.1)
+        finally:
+            collector.cancel()
+
+        assert {path.name for path in watcher._pending_changes} == {"app.py"}
+
+    def test_ignored_directories_are_not_watched(self, temp_dir: Path):
+        """Test that only the trees without ignored directories are watched recursively."""
+        for directory in ("src/pkg", "web/node_modules/lib", "web/app", ".venv/lib", "docs"):
+            (temp_dir / directory).mkdir(parents=True)
+        matcher = WatchMatcher(["*.py"])
+
+        recursive, flat = _watch_plan([temp_dir], matcher.ignores_dir)
+
+        assert recursive == [temp_dir / "docs", temp_dir / "src", temp_dir / "web" / "app"]
+        assert flat == [temp_dir, temp_dir / "web"]
+
+    @pytest.mark.asyncio
+    async def test_new_directories_are_watched(self, temp_dir: Path):
+        """Test that directories created next to ignored ones are picked up."""
+        (temp_dir / "node_modules").mkdir()
+        watcher = FileWatcher(patterns=["*.py"], console=Console(quiet=True))
+        collector = watcher._start_collecting(temp_dir)
+
+        try:
+            await asyncio.sleep(0.3)
+            (temp_dir / "new" / "pkg").mkdir(parents=True)
+            (temp_dir / "new" / "pkg" / "early.py").write_text("")
+            deadline = time.monotonic() + 10
+            while len(watcher._pending_changes) < 2:
+                assert time.monotonic() < deadline, watcher._pending_changes
+                (temp_dir / "new" / "pkg" / "late.py").write_text(str(time.monotonic()))
+                await asyncio.sleep(0.1)
+        finally:
+            collector.cancel()
+
+        assert {path.name for path in watcher._pending_changes} == {"early.py", "late.py"}
+
+
+class TestWatchIndex:
+    """Test watching several tasks at once."""
+
+    def test_changes_map_to_watching_tasks(self, temp_dir: Path):
+        """Test that each task's patterns are relative to its own directory."""
+        tasks = [
+            Task(name="lib", cmd="make", watch=["src/**/*.py"], cwd=str(temp_dir / "lib")),
+            Task(name="app", cmd="make", watch=["src/**/*.py", "*.toml"]),
+            Task(name="lint", cmd="ruff"),
+        ]
+        index = WatchIndex.from_tasks(tasks, temp_dir)
+        base = temp_dir.resolve()
+
+        assert index.tasks == ["lib", "app"]
+        assert index.affected([base / "lib" / "src" / "a.py"]) == ["lib"]
+        assert index.affected([base / "src" / "a.py", base / "lib" / "x.toml"]) == ["app"]
+        assert index.affected([base / "README.md"]) == []
+        assert index.matches(str(base / "lib" / "src" / "a.py"))
+        assert index.roots() == [base]
+
+    @pytest.mark.asyncio
+    async def test_only_affected_tasks_are_rerun(self, temp_dir: Path):
+        """Test that a change re-runs the tasks watching it, not every task."""
+        for directory in ("lib", "docs"):
+            (temp_dir / directory).mkdir()
+        index = WatchIndex.from_tasks(
+            [
+                Task(name="lib", cmd="make", watch=["lib/*.py"]),
+                Task(name="docs", cmd="make", watch=["docs/*.md"]),
+            ],
+            temp_dir,
+        )
+        runs = []
+        watcher = FileWatcher(patterns=["*"], console=Console(quiet=True), debounce_ms=20)
+        watch_task = asyncio.ensure_future(
+            watcher.watch_affected(
+                index, lambda names, initial: runs.append((names, initial)) or True, str(temp_dir)
+            )
+        )
+
+        try:
+            deadline = time.monotonic() + 10
+            while len(runs) < 2:
+                assert time.monotonic() < deadline, "change was not run"
+                (temp_dir / "docs" / "index.md").write_text(str(time.monotonic()))
+                await asyncio.sleep(0.1)
+        finally:
+            watch_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await watch_task
+
+        assert runs[0] == (["lib", "docs"], True)
+        assert all(run == (["docs"], False) for run in runs[1:])
+
+
 class TestWatchTaskSync:
     """Test synchronous watch wrapper."""
 
@@ -200,6 +321,67 @@ class TestFileWatcherIntegration:
         # Initial execution should have happened
         assert len(execution_count) == 1
 
+    @pytest.mark.asyncio
+    async def test_long_running_task_is_restarted_on_change(self, temp_dir: Path):
+        """Test that a running server is stopped and started again on a change."""
+        log = temp_dir / "log"
+        task = Task(name="dev", cmd="serve", watch=["*.py"])
+        supervisor = ProcessSupervisor(
+            ["sh", "-c", f"echo start >> {log}; exec sleep 30"], grace_period=1
+        )
+        watcher = FileWatcher(patterns=["*.py"], console=Console(quiet=True), debounce_ms=20)
+        watch_task = asyncio.ensure_future(
+            watcher.watch_and_restart(task, supervisor, str(temp_dir))
+        )
+
+        try:
+            deadline = time.monotonic() + 10
+            while log.exists() is False or len(log.read_text().split()) < 2:
+                assert time.monotonic() < deadline, "task was not restarted"
+                # Keeps changing until the watcher (started in the background) sees it
+                (temp_dir / "app.py").write_text(str(time.monotonic()))
+                await asyncio.sleep(0.1)
+        finally:
+            watch_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await watch_task
+
+        # Stopping watch mode stops the task
+        assert not supervisor.running
+
+    @pytest.mark.asyncio
+    async def test_changes_are_collected_while_task_runs(self, temp_dir: Path):
+        """Test that a slow run doesn't block the event stream."""
+        runs = []
+        change_made = threading.Event()
+
+        def callback():
+            runs.append(1)
+            if len(runs) == 1:
+                # Changes during the first run must lead to one more run
+                change_made.wait(10)
+            return True
+
+        task = Task(name="build", cmd="make", watch=["*.py"])
+        watcher = FileWatcher(patterns=["*.py"], console=Console(quiet=True), debounce_ms=20)
+        watch_task = asyncio.ensure_future(watcher.watch_and_execute(task, callback, str(temp_dir)))
+
+        try:
+            deadline = time.monotonic() + 10
+            while not watcher._pending_changes:
+                assert time.monotonic() < deadline, "change was not collected during the run"
+                (temp_dir / "app.py").write_text(str(time.monotonic()))
+                await asyncio.sleep(0.1)
+            change_made.set()
+            while len(runs) < 2:
+                assert time.monotonic() < deadline, "change was not run"
+                await asyncio.sleep(0.02)
+        finally:
+            change_made.set()
+            watch_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await watch_task
+
     def test_pending_changes_cleared_after_execution(self):
         """Test that pending changes are cleared after execution."""
         watcher = FileWatcher(patterns=["*.py"])
@@ -213,21 +395,81 @@ class TestFileWatcherIntegration:
         assert len(watcher._pending_changes) == 0
 
     def test_debounce_tracking(self):
-        """Test debounce time tracking."""
+        """Test that the first and latest pending change times are tracked."""
         watcher = FileWatcher(patterns=["*.py"], debounce_ms=100)
+        watcher._changed = asyncio.Event()
+        assert watcher.debounce_ms == 0.1  # 100ms = 0.1s
 
-        # Set last execution time
-        current_time = time.time()
-        watcher._last_execution = current_time
+        watcher._add_changes([Path("/src/a.py")])
+        first = watcher._first_change
+        assert watcher._last_change == first
+        assert watcher._changed.is_set()
 
-        # Check that debounce period is respected
-        assert watcher.debounce_ms == 0.1  # 100ms = 0.1s
+        time.sleep(0.05)
+        watcher._add_changes([Path("/src/b.py")])
+
+        # A later change moves only the trailing edge, not the max-wait start
+        assert watcher._first_change == first
+        assert watcher._last_change > first
 
-        # Simulate waiting
-        time.sleep(0.15)
+    def test_max_wait_is_at_least_the_debounce(self):
+        """Test that max_wait never cuts the debounce period short."""
+        watcher = FileWatcher(patterns=["*.py"], debounce_ms=500, max_wait_ms=100)
+        assert watcher.max_wait == watcher.debounce_ms == 0.5
 
-        # Time should have passed debounce period
-        assert time.time() - watcher._last_execution > watcher.debounce_ms
+    @pytest.mark.asyncio
+    async def test_burst_of_changes_is_one_batch(self):
+        """Test that changes keep postponing the batch until they settle."""
+        watcher = FileWatcher(patterns=["*.py"], debounce_ms=200, max_wait_ms=5000)
+        watcher._changed = asyncio.Event()
+
+        async def save_burst():
+            for i in range(20):
+                watcher._add_changes([Path(f"/src/file{i}.py")])
+                await asyncio.sleep(0.02)
+
+        started = time.monotonic()
+        burst = asyncio.ensure_future(save_burst())
+        changes = await watcher._next_changes()
+        await burst
+
+        assert len(changes) == 20
+        # The last change came after 19 pauses, the batch a debounce later
+        assert time.monotonic() - started >= 0.3 + watcher.debounce_ms
+        assert not watcher._pending_changes
+
+    @pytest.mark.asyncio
+    async def test_max_wait_caps_the_debounce(self):
+        """Test that a steady stream of changes still produces batches."""
+        watcher = FileWatcher(patterns=["*.py"], debounce_ms=100, max_wait_ms=300)
+        watcher._changed = asyncio.Event()
+        stop = asyncio.Event()
+
+        async def keep_saving():
+            while not stop.is_set():
+                watcher._add_changes([Path("/src/app.py")])
+                await asyncio.sleep(0.02)
+
+        stream = asyncio.ensure_future(keep_saving())
+        try:
+            started = time.monotonic()
+            assert await watcher._next_changes() == {Path("/src/app.py")}
+            assert time.monotonic() - started < 1.0
+        finally:
+            stop.set()
+            await stream
+
+    @pytest.mark.asyncio
+    async def test_settled_changes_are_taken_immediately(self):
+        """Test that changes queued during a run don't wait another debounce."""
+        watcher = FileWatcher(patterns=["*.py"], debounce_ms=200)
+        watcher._changed = asyncio.Event()
+        watcher._add_changes([Path("/src/a.py"), Path("/src/b.py")])
+        await asyncio.sleep(0.25)  # The task was running meanwhile
+
+        started = time.monotonic()
+        assert await watcher._next_changes() == {Path("/src/a.py"), Path("/src/b.py")}
+        assert time.monotonic() - started < 0.1
 
 
 class TestWatcherEdgeCases:
@@ -237,31 +479,13 @@ class TestWatcherEdgeCases:
         """Test watcher with empty pattern list."""
         watcher = FileWatcher(patterns=[])
 
-        changes = {
-            ("modified", "/path/to/file.py"),
-        }
-
-        filtered = watcher._filter_changes(changes)
         # No patterns means no matches
-        assert len(filtered) == 0
+        assert not watcher.matcher.matches("/path/to/file.py")
 
     def test_watcher_with_wildcard_pattern(self):
         """Test watcher with wildcard pattern."""
-        watcher = FileWatcher(patterns=["*"])
-
-        changes = {
-            ("modified", "/path/to/file.py"),
-            ("modified", "/path/to/config.toml"),
-        }
+        matcher = WatchMatcher(["*"])
 
-        filtered = watcher._filter_changes(changes)
         # Should match all non-hidden, non-cache files
-        assert len(filtered) > 0
-
-    def test_filter_changes_handles_empty_set(self):
-        """Test that filtering empty changes set works."""
-        watcher = FileWatcher(patterns=["*.py"])
-
-        filtered = watcher._filter_changes(set())
-        assert len(filtered) == 0
-        assert isinstance(filtered, set)
+        assert matcher.matches("/path/to/file.py")
+        assert matcher.matches("/path/to/config.toml")